@@ -13,6 +13,7 @@ sys.path.append(stock_etf_path)
 
 import io
 import json
+import logging
 import threading
 import tkinter as tk
 from contextlib import redirect_stdout
@@ -1534,5 +1535,10 @@ def create_main_window():
     return window
 
 if __name__ == "__main__":
+    # 统一日志配置：默认WARNING级别，调试时可改为DEBUG
+    logging.basicConfig(
+        level=logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     main_window = create_main_window()
     main_window.root.mainloop()
\ No newline at end of file
@@ -150,6 +150,47 @@ def _wilder_smooth(data: np.ndarray, period: int) -> np.ndarray:
     return result
 
 
+def rolling_mean_std(values, window: int, min_periods: int = 1, with_std: bool = True):
+    """基于累计和的滚动均值/标准差（NumPy向量化，O(n)）
+    
+    与 pandas 的 rolling(window, min_periods).mean()/std() 语义一致：
+    NaN 不计入窗口有效个数，有效个数不足 min_periods 时结果为 NaN，标准差 ddof=1。
+    计算前减去首个有效值，降低平方和相减带来的数值误差。
+    
+    :param values: 一维数值序列（ndarray/Series/list）
+    :param window: 窗口大小
+    :param min_periods: 最少有效观测数
+    :param with_std: 是否同时计算标准差
+    :return: (mean, std) 两个 ndarray；with_std=False 时 std 为 None
+    """
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    if n == 0:
+        return np.empty(0), (np.empty(0) if with_std else None)
+    
+    valid = ~np.isnan(x)
+    shift = x[valid][0] if valid.any() else 0.0
+    xs = np.where(valid, x - shift, 0.0)
+    
+    end = np.arange(1, n + 1)
+    start = np.maximum(0, end - window)
+    c0 = np.concatenate(([0], np.cumsum(valid)))
+    c1 = np.concatenate(([0.0], np.cumsum(xs)))
+    cnt = (c0[end] - c0[start]).astype(np.float64)
+    s1 = c1[end] - c1[start]
+    enough = cnt >= max(min_periods, 1)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(enough, s1 / cnt + shift, np.nan)
+        if not with_std:
+            return mean, None
+        c2 = np.concatenate(([0.0], np.cumsum(xs * xs)))
+        s2 = c2[end] - c2[start]
+        var = (s2 - s1 * s1 / cnt) / (cnt - 1)
+        std = np.where(enough & (cnt > 1), np.sqrt(np.maximum(var, 0.0)), np.nan)
+    return mean, std
+
+
 def calculate_intraday_kdj(df: pd.DataFrame, n: int = 55, m1: int = 21, m2: int = 5, 
                           high_col: str = "high", low_col: str = "low", close_col: str = "close",
                           previous_close: Optional[float] = None) -> pd.DataFrame:
@@ -2,36 +2,282 @@
 
 # 新建文件: 实现分时窗口
 
+import bisect
+import functools
+import logging
 import os
+import queue
+import tempfile
 import threading
 import time as time_module
 import tkinter as tk
 from abc import ABC, abstractmethod
-from datetime import date, datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import (CancelledError, Future, ThreadPoolExecutor,
+                                as_completed)
+from datetime import date, datetime
+from datetime import time as dtime
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import akshare as ak
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from audio_notifier import (notify_bollinger_breakdown,
+                            notify_bollinger_breakthrough, notify_buy_signal,
+                            notify_sell_signal)
 from conditions import StockType
+from consecutive_plunge_signal import ConsecutivePlungeSellSignal
+from consecutive_signal_config import get_plunge_config, get_surge_config
 from consecutive_surge_signal import ConsecutiveSurgeBuySignal
+from indicators import (calculate_intraday_kdj, calculate_intraday_rsi,
+                        calculate_rsi, rolling_mean_std)
 # 导入分时信号系统
 from intraday_signals import (IntradaySignalBase, IntradaySignalManager,
                               LimitUpConsecutiveBuySignal, RSIBuySignal,
                               RSIPlungeSellSignal, RSISellSignal,
                               RSISurgeBuySignal, SupportBreakdownSellSignal)
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.text import Text
 from matplotlib.ticker import FuncFormatter
 # 新增：导入ETF分析引擎用于获取布林带数据
 from stock_analysis_engine import ETFAnalysisEngine
+from trading_utils import (PreviousHighDualPrices, PreviousLowDualPrices,
+                           PriceBand, calculate_bollinger_bands,
+                           calculate_bollinger_ratio,
+                           detect_bollinger_breakthrough_breakdown,
+                           get_previous_close, get_previous_high_dual_prices,
+                           get_previous_low_dual_prices)
 from window_manager import WindowManager  # 新增, 用于窗口置顶
 
+log = logging.getLogger(__name__)
+
+# 增强的峰值检测算法（可选依赖scipy），模块加载时检测一次
+try:
+    from enhanced_peak_detection import detect_enhanced_peaks, get_enhanced_high_low
+    _HAS_ENHANCED_PEAKS = True
+except ImportError:
+    _HAS_ENHANCED_PEAKS = False
+
+# akshare分时接口并发上限，避免触发后端限流
+_AK_FETCH_SEMAPHORE = threading.BoundedSemaphore(3)
+
+# A股连续竞价交易时段边界
+_MORNING_START = dtime(9, 30)
+_MORNING_END = dtime(11, 30)
+_AFTERNOON_START = dtime(13, 0)
+_AFTERNOON_END = dtime(15, 0)
+# 成本图强调的时间点
+_COST_MARKER_TIME = dtime(10, 15)
+
+
+# 筹码分布（平均成本）数据缓存的时间粒度（秒），与分时窗口刷新周期一致
+_CYQ_CACHE_SECONDS = 30
+
+
+# akshare分时接口的中文列名到统一英文列名的映射，以及时间列的格式
+_MIN_COLUMN_MAP = {
+    "时间": "datetime",
+    "开盘": "open",
+    "收盘": "close",
+    "最高": "high",
+    "最低": "low",
+    "成交量": "volume",
+}
+_MIN_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _normalize_min_df(df: pd.DataFrame, set_index: bool = True) -> pd.DataFrame:
+    """统一akshare分时数据的列名（原地修改并返回）
+    
+    :param set_index: 为True时把时间列按固定格式转换后设为索引；多日数据合并后再统一转换时传False
+    """
+    if '时间' in df.columns:
+        df.rename(columns=_MIN_COLUMN_MAP, inplace=True)
+    if set_index and 'datetime' in df.columns:
+        df['datetime'] = pd.to_datetime(df['datetime'], format=_MIN_TIME_FORMAT, errors='coerce', cache=True)
+        df.dropna(subset=['datetime'], inplace=True)
+        df.set_index('datetime', inplace=True)
+    return df
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_calendar_index(today_ordinal: int) -> pd.DatetimeIndex:
+    """获取排序后的交易日索引（按自然日缓存，参数仅用于跨日失效；获取失败时抛出异常，不会被缓存）
+    
+    日历下载、解析与开市日过滤每天只做一次，其余交易日计算都基于该索引。
+    """
+    cal_df = ak.tool_trade_date_hist_sina()
+    # sina交易日历为YYYYMMDD格式（新版akshare已转为date对象，同样可按该格式解析），无法解析的行直接丢弃
+    cal_df['trade_date'] = pd.to_datetime(cal_df['trade_date'], format='%Y%m%d', errors='coerce', cache=True)
+    cal_df = cal_df.dropna(subset=['trade_date'])
+    if 'is_trading_day' in cal_df.columns:
+        cal_df = cal_df[cal_df['is_trading_day'] == 1]
+    return pd.DatetimeIndex(cal_df['trade_date'].values).sort_values()
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_trade_calendar(today_ordinal: int) -> frozenset:
+    """交易日历集合（由交易日索引转换，按自然日缓存）"""
+    return frozenset(_cached_calendar_index(today_ordinal).date)
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_latest_trade_date(today_ordinal: int) -> date:
+    """最近一个交易日（含今天），按自然日缓存；日历获取失败或为空时抛出异常，不会被缓存"""
+    idx = _cached_calendar_index(today_ordinal)
+    # 二分定位今天之后的第一个交易日，其前一位即最近交易日（自动跳过周末与节假日）
+    pos = idx.searchsorted(pd.Timestamp(date.fromordinal(today_ordinal)), side='right')
+    if pos == 0:
+        raise ValueError("未找到交易日历数据")
+    return idx[pos - 1].date()
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_day_min_close(security_type: str, symbol: str, date_str: str) -> pd.Series:
+    """获取指定历史交易日的1分钟收盘价序列
+    
+    历史分时数据不再变化，按(证券类型, 代码, 日期)缓存，看涨线与看跌线共用一次请求；返回值不可修改。
+    返回空数据时抛出异常，不会被缓存，下次调用重新请求。
+    """
+    start_dt = f"{date_str} 09:30:00"
+    end_dt = f"{date_str} 15:00:00"
+    if security_type == "STOCK":
+        df = ak.stock_zh_a_hist_min_em(symbol=symbol, start_date=start_dt, end_date=end_dt, period="1", adjust="")
+    elif security_type == "ETF":
+        df = ak.fund_etf_hist_min_em(symbol=symbol, start_date=start_dt, end_date=end_dt, period="1", adjust="")
+    else:
+        raise ValueError(f"不支持的证券类型: {security_type}")
+    if df.empty:
+        raise ValueError(f"未获取到 {symbol} {date_str} 的分时数据")
+    # 只取时间和收盘价两列直接构造序列，不对整个DataFrame重命名、转换列和重建索引
+    if '时间' in df.columns:
+        # 与 _normalize_min_df 一致：按固定格式解析时间，无法解析的行直接丢弃
+        times = pd.to_datetime(df['时间'], format=_MIN_TIME_FORMAT, errors='coerce', cache=True)
+        valid = times.notna().to_numpy()
+        close = pd.Series(df['收盘'].to_numpy(dtype=np.float64)[valid],
+                          index=pd.DatetimeIndex(times[valid], name="datetime"), name="close")
+    else:
+        close = df['close'].astype(np.float64)
+    if close.empty:
+        raise ValueError(f"{symbol} {date_str} 的分时数据时间列无法解析")
+    return close
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_cyq(code: str, time_bucket: int) -> pd.DataFrame:
+    """获取筹码分布数据（同一时间段内多个窗口/多次调用共用一次请求，返回值不可修改）"""
+    return ak.stock_cyq_em(symbol=code, adjust="qfq")
+
+
+def _fetch_cyq(code: str) -> pd.DataFrame:
+    """获取筹码分布数据，按 _CYQ_CACHE_SECONDS 时间段缓存"""
+    return _cached_cyq(code, int(time_module.time() // _CYQ_CACHE_SECONDS))
+
+
+def _tail_ma(closes: np.ndarray, windows: Tuple[int, ...] = (5, 10, 20)) -> Tuple[Optional[float], ...]:
+    """计算收盘价序列末尾各窗口的均值（即最后一个交易日的均线值）
+    
+    数据不足窗口长度或窗口内含NaN时返回None，与 rolling(window).mean() 最后一行一致。
+    """
+    n = closes.size
+    result = []
+    for window in windows:
+        if n < window:
+            result.append(None)
+            continue
+        value = closes[n - window:].sum() / window
+        result.append(float(value) if np.isfinite(value) else None)
+    return tuple(result)
+
+
+def _signature_matches(sig: Tuple[tuple, tuple], last: Optional[Tuple[tuple, tuple]]) -> bool:
+    """比较(对象引用, 标量值)形式的签名：对象逐个按is比较，标量按==比较"""
+    if last is None:
+        return False
+    refs, values = sig
+    last_refs, last_values = last
+    return (len(refs) == len(last_refs) and all(a is b for a, b in zip(refs, last_refs))
+            and values == last_values)
+
+
+def _volume_bar_verts(closes: np.ndarray, volumes: np.ndarray, first_ref: float,
+                      width: float = 0.8) -> Tuple[np.ndarray, np.ndarray]:
+    """计算RSI面板成交量柱的顶点和红绿标记
+    
+    每根柱子与前一根柱子的收盘价比较（第一根与first_ref比较）决定红绿；
+    红柱绘制在RSI80-100区域（颠倒绘制，最小值在RSI100），绿柱绘制在RSI0-20区域，
+    高度按最大成交量缩放到20。只返回成交量大于0的柱子。
+    
+    :return: (顶点数组(柱数, 4, 2), 是否红柱的布尔数组)
+    """
+    ref_prices = np.concatenate(([first_ref], closes[:-1]))
+    is_red = closes >= ref_prices
+    has_volume = volumes > 0
+    xs = np.flatnonzero(has_volume)
+    heights = volumes[has_volume] / np.max(volumes) * 20  # 20是RSI80-100 / RSI0-20的区间
+    bar_red = is_red[has_volume]
+    # 红柱底部在RSI100减去高度，绿柱底部在RSI0
+    bottoms = np.where(bar_red, 100 - heights, 0.0)
+    half = width / 2
+    verts = np.empty((len(xs), 4, 2))
+    verts[:, 0, 0] = verts[:, 3, 0] = xs - half
+    verts[:, 1, 0] = verts[:, 2, 0] = xs + half
+    verts[:, :2, 1] = bottoms[:, np.newaxis]
+    verts[:, 2:, 1] = (bottoms + heights)[:, np.newaxis]
+    return verts, bar_red
+
 
 class IntradayWindow:
     """//! 分时窗口(接口锁定)"""
 
+    # 实例属性较多且多窗口并存，使用__slots__省去每个实例的__dict__；新增实例属性需在此登记
+    # __weakref__供matplotlib事件回调对绑定方法持有弱引用
+    __slots__ = (
+        'audio_enabled', 'audio_toggle_btn', 'ax_cost', '_ax_cost_pct', 'ax_price', '_ax_price_pct',
+        'ax_rsi', 'ax_volume', '_bb_last_sig', '_bearish_line_calculated', 'bearish_line_price',
+        '_blit_background', '_boll_inc_state', 'bollinger_5min_data', 'bollinger_5min_lower',
+        'bollinger_5min_middle', 'bollinger_5min_upper', '_bollinger_alert_queue',
+        '_bollinger_alert_thread', 'bollinger_breakdown_consecutive_count',
+        'bollinger_breakdown_signals', 'bollinger_breakthrough_consecutive_count',
+        'bollinger_breakthrough_signals', '_bollinger_calculated', 'bollinger_lower',
+        'bollinger_middle', '_bollinger_signals_processed', 'bollinger_upper', 'breakdown_count',
+        '_breakthrough_breakdown_calculated', 'breakthrough_count', '_bullish_line_calculated',
+        'bullish_line_price', '_busday_cal', 'buy_signal_last_check', 'buy_signal_pending',
+        'buy_signals', 'cache_dir', '_cache_key', '_cache_valid_duration', 'canvas', 'code',
+        '_cost_band_collection', 'cost_cache_file', 'cost_df', 'crosshair_lines', 'crosshair_text',
+        'current_panel', '_daily_df_cache', '_data_cache', 'date_label', '_draw_pending',
+        'etf_engine', 'fig', '_force_redraw', '_force_refresh', 'height_ratio_callback',
+        'height_ratio_mode', '_historical_cache', '_historical_cache_lock',
+        '_initialization_complete', '_io_pool', '_is_destroyed', 'is_embed', 'kdj_df',
+        'last_bollinger_signal_type', '_last_cache_key', '_last_data_fetch_time',
+        '_last_draw_signature', '_last_redraw_time', 'last_signal_type', '_last_trade_date',
+        '_load_future', '_load_generation', '_load_pool', '_load_resubmit_pending', 'ma10_price',
+        'ma20_price', 'ma25_values', 'ma50_values', 'ma5_price', 'ma_base_values', 'ma_mid_values',
+        'ma_short_values', 'max_consecutive_audio', '_mouse_events_bound', 'name', 'next_btn',
+        'on_date_change_callback', 'parent', '_pct_zone_cache', 'plunge_signal_consecutive_count',
+        'position_status', '_pr_down', '_pr_up', '_prev_bands_cache', 'prev_btn',
+        '_prev_close_cache', '_prev_date_str_cache', '_prev_day_5min_cache', '_prev_day_boll_cache',
+        '_prev_day_boll_lock', '_prev_trade_cost_cache', '_preview_signature',
+        '_previous_high_calculated', 'previous_high_dual_prices', 'previous_high_price',
+        '_previous_low_calculated', 'previous_low_dual_prices', 'previous_low_price', 'price_df',
+        'ratio_btn', '_redraw_timer', 'resistance_level', 'resistance_type', 'rsi_df',
+        'rsi_df_display', '_rsi_dynamic_artists', '_rsi_panel_artists', '_sec_type_cache',
+        'sell_signal_last_check', 'sell_signal_pending', 'sell_signals', 'show_toolbar',
+        'signal_manager', '_sorted_cal', '_sr_future', '_sr_future_ctx', '_sr_lock',
+        'support_level', '_support_resistance_calculated', 'support_type',
+        'surge_signal_consecutive_count', '_text_artists', '_tight_layout_done', '_time_grid_cache',
+        '_today_check_ts', '_today_date', '_trade_calendar_set', 'trade_date', 'trade_date_str',
+        '_ui_event_redraw', 'volume_display_btn', 'volume_display_enabled', 'volume_display_lines',
+        'window',
+        '__weakref__',
+    )
+
     UPDATE_INTERVAL = 30  # 秒
     
     @staticmethod
@@ -48,6 +294,12 @@ class IntradayWindow:
         else:
             return "STOCK", code
     
+    def _sec(self) -> tuple:
+        """获取当前代码的(security_type, symbol)，按代码缓存，代码变化时自动失效"""
+        if self._sec_type_cache[0] != self.code:
+            self._sec_type_cache = (self.code, self._get_security_type(self.code))
+        return self._sec_type_cache[1]
+    
     # 移动平均线周期配置（可调试修改）
     MA_SHORT_PERIOD = 25      # 短期均线周期
     MA_MID_PERIOD = 50        # 中期均线周期
@@ -55,6 +307,22 @@ class IntradayWindow:
     
     # 全局变量：控制是否显示上一个交易日最后1小时数据
     SHOW_PREVIOUS_DAY_DATA = False  # 默认打开，显示上一个交易日数据
+    
+    # 计算MA/RSI/布林带时回补的前几个交易日分时数据天数，以及并发获取的线程数上限
+    PREV_INTRADAY_DAYS = 3
+    PREV_INTRADAY_FETCH_WORKERS = 4
+    
+    # 绘制时在后台补算支撑位压力位：失败后的首次重试延迟（毫秒，之后每次翻倍）及最大重试次数
+    SR_RETRY_DELAY_MS = 2000
+    SR_MAX_RETRIES = 3
+    
+    # UI事件触发重绘的合并延迟（毫秒）
+    UI_REDRAW_DELAY_MS = 50
+    # 距上次重绘不足该时间（秒）时忽略焦点事件触发的重绘
+    FOCUS_REDRAW_MIN_INTERVAL = 0.05
+    
+    # 历史指标缓存最多保留的(代码, 交易日)键数量，超出时淘汰最久未使用的键
+    HISTORICAL_CACHE_CAPACITY = 8
 
     def __init__(self, parent: tk.Widget, code: str, name: str, trade_date: Optional[date] = None, embed: bool = False, show_toolbar: bool = True, on_date_change_callback=None):
         """创建分时窗口
@@ -69,10 +337,11 @@ class IntradayWindow:
         self.parent = parent
         self.code = code
         self.name = name
+        self._sec_type_cache: tuple = (None, None)  # (code, (security_type, symbol))
 
         # 目标交易日 (若未指定则取最近交易日)
         self.trade_date: date = trade_date or self._get_latest_trade_date()
-        self.trade_date_str: str = self.trade_date.strftime("%Y-%m-%d")
+        self.trade_date_str: str = self.trade_date.isoformat()
 
         # ------------------------- 窗口/容器 -------------------------
         self.is_embed = embed  # 标记是否嵌入模式
@@ -144,7 +413,7 @@ class IntradayWindow:
                 root_window.bind("<Command-Left>", lambda e: self._on_prev_day())
                 root_window.bind("<Command-Right>", lambda e: self._on_next_day())
                 # 注意：不绑定Command+B到分时窗口，避免与主窗口的截图功能冲突
-                print(f"[DEBUG] 嵌入模式：键盘快捷键已绑定到根窗口: {root_window}")
+                log.debug("嵌入模式：键盘快捷键已绑定到根窗口: %s", root_window)
                 
                 # 额外绑定到当前容器，作为备用方案
                 self.window.bind("<Command-Left>", lambda e: self._on_prev_day())
@@ -152,7 +421,7 @@ class IntradayWindow:
                 # 添加音效开关快捷键 Command+Shift+A
                 self.window.bind("<Command-Shift-A>", lambda e: self._toggle_audio())                
                 # 注意：不绑定Command+B到分时窗口，避免与主窗口的截图功能冲突
-                print(f"[DEBUG] 嵌入模式：键盘快捷键也已绑定到当前容器: {self.window}")
+                log.debug("嵌入模式：键盘快捷键也已绑定到当前容器: %s", self.window)
             else:
                 # 独立窗口模式下，直接绑定到当前窗口
                 self.window.bind("<Command-Left>", lambda e: self._on_prev_day())
@@ -160,7 +429,7 @@ class IntradayWindow:
                 # 添加音效开关快捷键 Command+Shift+A
                 self.window.bind("<Command-Shift-A>", lambda e: self._toggle_audio())
                 # 注意：不绑定Command+B到分时窗口，避免与主窗口的截图功能冲突
-                print(f"[DEBUG] 独立模式：键盘快捷键已绑定到当前窗口: {self.window}")
+                log.debug("独立模式：键盘快捷键已绑定到当前窗口: %s", self.window)
 
         # 图表
         # 嵌入模式下使用紧凑的图形尺寸，减少顶部和底部空白
@@ -240,19 +509,33 @@ class IntradayWindow:
         self.resistance_type: Optional[str] = None
         self.position_status: Optional[str] = None
         self._support_resistance_calculated = False  # 新增：标记是否已计算
+        # 后台IO线程池：绘制路径上补算支撑位压力位时不阻塞Tk主线程
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="intraday-io")
+        self._sr_future: Optional[Future] = None  # 正在后台执行的支撑位压力位计算
+        self._sr_future_ctx: Optional[Tuple[str, date]] = None  # _sr_future 对应的(代码, 交易日)
+        self._sr_lock = threading.Lock()  # 保护 _sr_future 的提交与取消（主线程与加载线程都会提交）
+        # 分时数据加载线程池：加载串行执行，切换交易日/股票时递增加载代数，过期代数的加载结果丢弃
+        self._load_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="intraday-load")
+        self._load_future: Optional[Future] = None
+        self._load_generation = 0  # 当前(代码, 交易日)对应的加载代数
+        self._load_resubmit_pending = False  # 等待过期加载结束后在主线程作废残留并重新提交
 
         # 新增：前高价格相关属性
         self.previous_high_price: Optional[float] = None
-        self.previous_high_dual_prices: Optional[Dict] = None  # 双价格信息
+        self.previous_high_dual_prices: Optional[PreviousHighDualPrices] = None  # 双价格信息
         self._previous_high_calculated = False
 
         # 新增：前低价格相关属性
         self.previous_low_price: Optional[float] = None
-        self.previous_low_dual_prices: Optional[Dict] = None  # 双价格信息
+        self.previous_low_dual_prices: Optional[PreviousLowDualPrices] = None  # 双价格信息
         self._previous_low_calculated = False
 
         # 新增：5分钟级别布林带相关属性
         self.bollinger_5min_data: Optional[pd.DataFrame] = None  # 5分钟布林带数据
+        self._boll_inc_state: Dict[str, Dict[str, Any]] = {}  # 5分钟布林带增量计算状态（按数据流区分）
+        self._prev_day_5min_cache: Optional[tuple] = None  # ((code, trade_date), 前几个交易日5分钟K线)
+        self._prev_day_boll_cache: Optional[tuple] = None  # ((code, trade_date, window), 前一交易日1分钟布林带)
+        self._prev_day_boll_lock = threading.Lock()  # 看涨线与看跌线并发计算时共用一次前一交易日布林带计算
         self.bollinger_upper: Optional[pd.Series] = None  # 布林带上轨
         self.bollinger_middle: Optional[pd.Series] = None  # 布林带中轨
         self.bollinger_lower: Optional[pd.Series] = None  # 布林带下轨
@@ -270,6 +553,7 @@ class IntradayWindow:
         self.breakthrough_count: int = 0  # 突破次数（实体最高价在布林上轨之上）
         self.breakdown_count: int = 0     # 跌破次数（实体最低价在布林下轨之下）
         self._breakthrough_breakdown_calculated = False  # 标记是否已计算突破跌破次数
+        self._bb_last_sig: Optional[tuple] = None  # 上次计算突破跌破次数时的输入数据签名
         
         # 布林带音效相关属性
         self.bollinger_breakthrough_signals: List[Dict[str, Any]] = []  # 布林带突破信号列表
@@ -278,10 +562,11 @@ class IntradayWindow:
         self.bollinger_breakdown_consecutive_count = 0     # 布林带跌破连续次数
         self.last_bollinger_signal_type = None  # 上一个布林带信号类型
         self._bollinger_signals_processed = False  # 标记布林带信号是否已处理
+        self._initialization_complete = False  # 首次加载完成前不播放布林带音效
         
         # 新增：价格范围历史记录，用于防止阻力带和支撑带被裁切
-        self._price_range_history: Optional[Dict[str, float]] = None  # 保存历史价格范围
-        self._price_range_initialized = False  # 标记价格范围是否已初始化
+        self._pr_down: Optional[float] = None  # 历史价格范围下限
+        self._pr_up: Optional[float] = None    # 历史价格范围上限
 
         # 数据缓存和智能刷新机制
         self._data_cache = {}  # 数据缓存字典
@@ -291,13 +576,26 @@ class IntradayWindow:
         self._force_refresh = False  # 强制刷新标志
         
         # 历史数据指标缓存机制
-        self._historical_cache = {}  # 历史数据缓存字典
+        self._historical_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # 历史数据缓存（按缓存键LRU）
+        self._historical_cache_lock = threading.RLock()  # 并发计算任务读写历史缓存时加锁
         self._cache_key = f"{self.code}_{self.trade_date_str}"  # 当前缓存键
         self._last_cache_key = None  # 上次缓存键，用于检测变更
         
         # UI事件重绘控制
         self._force_redraw = False  # 强制重绘标志
         self._ui_event_redraw = False  # UI事件触发重绘标志
+        self._redraw_timer: Optional[str] = None  # UI事件合并重绘的after定时器
+        self._draw_pending = False  # 是否已有排队等待执行的整图重绘
+        self._last_redraw_time: Optional[datetime] = None  # 上次完整重绘时间
+        self._mouse_events_bound = False  # 鼠标事件是否已绑定（首次绘制时绑定）
+        self._last_draw_signature: Optional[tuple] = None  # 上次完整重绘时的数据签名(对象引用, 标量值)
+        self._preview_signature: Optional[tuple] = None  # 上次支撑带压力带预览图的内容签名
+        self._time_grid_cache: Optional[tuple] = None  # (时间索引键, 时间轴刻度及显示范围)
+        self._prev_bands_cache: Optional[tuple] = None  # (前高双价格, 前低双价格, 阻力带, 支撑带)
+        self._pct_zone_cache: Optional[tuple] = None  # (前收盘价, 百分比区域边界, 区域颜色)
+        self._text_artists: Dict[str, Text] = {}  # 副图固定位置的文字标签，跨重绘复用
+        self._rsi_panel_artists: Optional[Dict[str, Any]] = None  # RSI面板常驻的曲线与背景/参考线
+        self._rsi_dynamic_artists: List[Any] = []  # RSI面板每次重绘新建的图元（起始点、成交量柱、分割线）
 
         # 分时信号管理器 - 移到_update_data调用之前
         self.signal_manager = IntradaySignalManager()
@@ -310,6 +608,9 @@ class IntradayWindow:
         
         # 音效开关状态
         self.audio_enabled = True  # 默认开启音效
+        # 布林带突破/跌破提醒队列，由单个常驻线程顺序执行震动和音效（首次提醒时启动）
+        self._bollinger_alert_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._bollinger_alert_thread: Optional[threading.Thread] = None
         
         # 总成交量显示状态
         self.volume_display_enabled = False  # 默认关闭总成交量显示
@@ -318,9 +619,21 @@ class IntradayWindow:
         # 窗口状态控制
         self._is_destroyed = False  # 标记窗口是否已销毁
         
-        # 前一交易日收盘价缓存
-        self._cached_previous_close = None
-        self._cached_previous_close_date = None
+        # 前一交易日收盘价缓存: {(symbol, trade_date_str, security_type): close}
+        self._prev_close_cache: Dict[tuple, float] = {}
+        
+        # 日线原始数据缓存: {(security_type, symbol, start, end): (df, 过期时间)}，收盘后(15:30)失效
+        self._daily_df_cache: Dict[tuple, Tuple[pd.DataFrame, datetime]] = {}
+        self._prev_trade_cost_cache: Dict[Tuple[str, date], float] = {}
+        
+        # "今日"日期缓存，定时刷新时避免每次都构造date对象
+        self._today_date: Optional[date] = None
+        self._today_check_ts = float('-inf')
+        
+        # 存储价格图右侧百分比轴引用，跨重绘复用（需在首次绘制前初始化）
+        self._ax_price_pct = None
+        self._ax_cost_pct = None
+        self._cost_band_collection: Optional[PolyCollection] = None  # 成本涨幅轴背景色带，跨重绘复用
         
         # 配置默认分时信号 - 移到_update_data调用之前
         self._setup_default_signals()
@@ -329,11 +642,9 @@ class IntradayWindow:
         self._update_data()
 
         # 仅在今日交易日时启动定时刷新
-        if self.trade_date == date.today():
+        if self._is_today_cached():
             self._schedule_update()
 
-        # 存储价格图右侧百分比轴引用，避免重复绘制
-        self._ax_price_pct = None
         # 布局标记: 避免tight_layout多次调用导致子图被不断压缩
         self._tight_layout_done = False
         
@@ -341,6 +652,9 @@ class IntradayWindow:
         self.crosshair_lines: Optional[list] = None  # 存储十字定位线
         self.crosshair_text: Optional[list] = None   # 存储坐标文本
         self.current_panel: Optional[str] = None     # 当前鼠标所在面板
+        self._blit_background = None                 # 不含十字线的画布背景缓存，用于blit快速刷新
+        # 整图绘制完成回调：缓存不含十字线的blit背景
+        self.canvas.mpl_connect('draw_event', self._on_canvas_draw)
         
         # 高度比例相关变量
         self.height_ratio_mode: str = "7:3"  # 当前高度比例模式: "3:7" 或 "7:3"
@@ -421,7 +735,7 @@ class IntradayWindow:
             return time_diff.total_seconds() <= threshold_minutes * 60
             
         except Exception as e:
-            print(f"[ERROR] 判断布林带信号实时性失败: {e}")
+            log.exception("判断布林带信号实时性失败: %s", e)
             return False
     
     def _update_bollinger_signal_counters(self, signal_type: str):
@@ -481,7 +795,7 @@ class IntradayWindow:
                 for signal in self.signal_manager.sell_signals:
                     if hasattr(signal, 'mark_buy_signal_appeared') and '连跌' in signal.name:
                         signal.mark_buy_signal_appeared()
-                        print(f"[DEBUG] 已通知连跌信号买入信号出现: {signal.name}")
+                        log.debug("已通知连跌信号买入信号出现: %s", signal.name)
     
     def _notify_surge_signals_sell_signal_appeared(self):
         """通知连涨信号卖出信号已出现"""
@@ -500,7 +814,7 @@ class IntradayWindow:
                 for signal in self.signal_manager.buy_signals:
                     if hasattr(signal, 'mark_sell_signal_appeared') and '连涨' in signal.name:
                         signal.mark_sell_signal_appeared()
-                        print(f"[DEBUG] 已通知连涨信号卖出信号出现: {signal.name}")
+                        log.debug("已通知连涨信号卖出信号出现: %s", signal.name)
 
     # ------------------------------------------------------------------
     # 数据获取与缓存
@@ -541,15 +855,84 @@ class IntradayWindow:
         """
         try:
             # 使用trading_utils中的通用布林带计算函数
-            from trading_utils import calculate_bollinger_bands
             return calculate_bollinger_bands(data, window, num_std)
             
         except Exception as e:
-            print(f"计算5分钟布林带失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("计算5分钟布林带失败: %s", e)
             return data
 
+    @staticmethod
+    def _rolling_ma(close: pd.Series, window: int) -> pd.Series:
+        """滚动均线（min_periods=1），NumPy累计和实现，保留Series索引便于绘图"""
+        mean, _ = rolling_mean_std(close.to_numpy(dtype=np.float64), window, with_std=False)
+        return pd.Series(mean, index=close.index)
+
+    def _incremental_bollinger_bands(self, data: pd.DataFrame, stream: str, window: int = 20, num_std: float = 2) -> pd.DataFrame:
+        """增量计算5分钟布林带
+        
+        上一次结果中已完成的K线（除最后一根可能尚未走完的K线外）直接复用，
+        只对新增K线按滑动窗口的累计和/平方和计算均值与标准差；
+        切换股票、交易日或数据不连续时自动退化为全量计算。结果与
+        calculate_bollinger_bands(min_periods=1, ddof=1) 一致。
+        
+        :param data: 5分钟K线数据
+        :param stream: 数据流名称（不同数据源分别维护状态）
+        :param window: 移动平均窗口期，默认20
+        :param num_std: 标准差倍数，默认2
+        :return: 包含布林带指标的DataFrame
+        """
+        if data is None or data.empty or 'close' not in data.columns:
+            return self._calculate_5min_bollinger_bands(data, window, num_std)
+        
+        try:
+            closes = data['close'].to_numpy(dtype=np.float64)
+            n = len(closes)
+            key = (self.code, self.trade_date, window, num_std)
+            state = self._boll_inc_state.get(stream)
+            
+            # 计算可复用的已完成K线数量
+            reuse = 0
+            if state is not None and state['key'] == key:
+                k = min(len(state['closes']) - 1, n)
+                if (k > 0 and state['index'][0] == data.index[0]
+                        and state['index'][k - 1] == data.index[k - 1]
+                        and state['closes'][k - 1] == closes[k - 1]):
+                    reuse = k
+            
+            ma = np.empty(n, dtype=np.float64)
+            std = np.empty(n, dtype=np.float64)
+            if reuse:
+                ma[:reuse] = state['ma'][:reuse]
+                std[:reuse] = state['std'][:reuse]
+            
+            if reuse < n:
+                # 只取覆盖新增K线窗口的一段计算滚动统计量（窗口完整，结果与全量计算一致）
+                lo = max(0, reuse - window + 1)
+                seg_ma, seg_std = rolling_mean_std(closes[lo:], window)
+                ma[reuse:] = seg_ma[reuse - lo:]
+                std[reuse:] = seg_std[reuse - lo:]
+            
+            self._boll_inc_state[stream] = {
+                'key': key,
+                'index': data.index,
+                'closes': closes,
+                'ma': ma,
+                'std': std,
+            }
+            
+            result = data.copy()
+            result['MA20'] = ma
+            result['BOLL_STD'] = std
+            result['BOLL_UPPER'] = ma + num_std * std
+            result['BOLL_LOWER'] = ma - num_std * std
+            log.debug("布林带增量计算完成(%s): 复用%s根, 新计算%s根", stream, reuse, n - reuse)
+            return result
+            
+        except Exception as e:
+            log.debug("布林带增量计算失败，改为全量计算: %s", e)
+            self._boll_inc_state.pop(stream, None)
+            return self._calculate_5min_bollinger_bands(data, window, num_std)
+
     def _get_cached_bollinger_data(self, data: pd.DataFrame, window: int = 20, num_std: float = 2) -> pd.DataFrame:
         """获取布林带数据（带缓存机制）
         
@@ -560,21 +943,21 @@ class IntradayWindow:
         """
         try:
             # 检查缓存键是否变化
-            self._check_cache_key_change()
+            hist_key = self._check_cache_key_change()
             
             # 生成数据指纹用于缓存键
             data_fingerprint = f"{len(data)}_{data.index[0]}_{data.index[-1]}" if not data.empty else "empty"
             cache_key = f"bollinger_{data_fingerprint}_{window}_{num_std}"
             
             # 尝试从缓存获取
-            cached_bollinger = self._get_cached_data('bollinger_data')
+            cached_bollinger = self._get_cached_data('bollinger_data', hist_key)
             if cached_bollinger is not None and 'data_fingerprint' in cached_bollinger:
                 if cached_bollinger['data_fingerprint'] == data_fingerprint:
-                    print(f"[DEBUG] 从缓存获取布林带数据: 数据长度={len(cached_bollinger['data'])}")
+                    log.debug("从缓存获取布林带数据: 数据长度=%s", len(cached_bollinger['data']))
                     return cached_bollinger['data']
             
-            # 计算布林带
-            bollinger_data = self._calculate_5min_bollinger_bands(data, window, num_std)
+            # 计算布林带（已完成的K线复用上次结果，只计算新增部分）
+            bollinger_data = self._incremental_bollinger_bands(data, 'history', window, num_std)
             
             # 缓存结果
             if bollinger_data is not None and not bollinger_data.empty:
@@ -584,13 +967,13 @@ class IntradayWindow:
                     'window': window,
                     'num_std': num_std
                 }
-                self._set_cached_data('bollinger_data', cache_data)
-                print(f"[DEBUG] 布林带数据已缓存: 数据长度={len(bollinger_data)}")
+                self._set_cached_data('bollinger_data', cache_data, hist_key)
+                log.debug("布林带数据已缓存: 数据长度=%s", len(bollinger_data))
             
             return bollinger_data
             
         except Exception as e:
-            print(f"获取缓存布林带数据失败: {e}")
+            log.exception("获取缓存布林带数据失败: %s", e)
             # 降级到直接计算
             return self._calculate_5min_bollinger_bands(data, window, num_std)
 
@@ -601,82 +984,66 @@ class IntradayWindow:
     def _is_trading_time(self):
         """检查当前是否为交易时间"""
         try:
-            from datetime import datetime
-            
             now = datetime.now()
             
             # 检查是否为工作日
             if now.weekday() >= 5:  # 周六(5)和周日(6)不是交易日
                 return False
             
-            # 获取当前时间的小时和分钟
-            current_time = (now.hour, now.minute)
-            
-            # 定义交易时间：上午9:30-11:30，下午13:00-15:00
-            morning_start = (9, 30)
-            morning_end = (11, 30)
-            afternoon_start = (13, 0)
-            afternoon_end = (15, 0)
-            
-            # 检查是否在上午交易时间
-            if (current_time >= morning_start and current_time <= morning_end):
-                return True
-            
-            # 检查是否在下午交易时间
-            if (current_time >= afternoon_start and current_time <= afternoon_end):
-                return True
+            # 获取当前时间（精确到分钟，与交易时段边界按分钟比较）
+            current_time = dtime(now.hour, now.minute)
             
-            return False
+            # 交易时间：上午9:30-11:30，下午13:00-15:00
+            return (_MORNING_START <= current_time <= _MORNING_END or
+                    _AFTERNOON_START <= current_time <= _AFTERNOON_END)
         except Exception as e:
-            print(f"[DEBUG] 检查交易时间失败: {e}")
+            log.debug("检查交易时间失败: %s", e)
             return True  # 如果检查出错，默认允许更新
 
     def _should_fetch_data(self):
         """判断是否需要获取新数据"""
         try:
-            from datetime import datetime
             
             now = datetime.now()
             current_trade_date = self.trade_date_str
             
             # 如果强制刷新，直接返回True
             if self._force_refresh:
-                print("[DEBUG] 强制刷新，需要获取新数据")
+                log.debug("强制刷新，需要获取新数据")
                 return True
             
             # 如果交易日期发生变化，需要获取新数据
             if self._last_trade_date != current_trade_date:
-                print(f"[DEBUG] 交易日期变化: {self._last_trade_date} -> {current_trade_date}，需要获取新数据")
+                log.debug("交易日期变化: %s -> %s，需要获取新数据", self._last_trade_date, current_trade_date)
                 return True
             
             # 如果从未获取过数据，需要获取
             if self._last_data_fetch_time is None:
-                print("[DEBUG] 首次获取数据")
+                log.debug("首次获取数据")
                 return True
             
             # 检查缓存是否过期
             time_since_last_fetch = (now - self._last_data_fetch_time).total_seconds()
             if time_since_last_fetch > self._cache_valid_duration:
-                print(f"[DEBUG] 缓存过期({time_since_last_fetch:.1f}秒)，需要获取新数据")
+                log.debug("缓存过期(%.1f秒)，需要获取新数据", time_since_last_fetch)
                 return True
             
             # 在交易时间内，需要更频繁更新
             if self._is_trading_time():
                 # 交易时间内，每30秒更新一次
                 if time_since_last_fetch > 30:
-                    print(f"[DEBUG] 交易时间内，需要更新数据({time_since_last_fetch:.1f}秒)")
+                    log.debug("交易时间内，需要更新数据(%.1f秒)", time_since_last_fetch)
                     return True
             
-            print(f"[DEBUG] 使用缓存数据，距离上次获取: {time_since_last_fetch:.1f}秒")
+            log.debug("使用缓存数据，距离上次获取: %.1f秒", time_since_last_fetch)
             return False
             
         except Exception as e:
-            print(f"[DEBUG] 判断是否需要获取数据失败: {e}")
+            log.debug("判断是否需要获取数据失败: %s", e)
             return True  # 如果判断出错，默认获取数据
 
     def _update_cache_timestamp(self):
         """更新缓存时间戳"""
-        from datetime import datetime
         self._last_data_fetch_time = datetime.now()
         self._last_trade_date = self.trade_date_str
         self._force_refresh = False
@@ -697,24 +1064,20 @@ class IntradayWindow:
         :param data_type: 数据类型
         :return: 缓存是否有效
         """
-        if cache_key not in self._historical_cache:
+        with self._historical_cache_lock:
+            cache_data = self._historical_cache.get(cache_key, {}).get(data_type)
+        if cache_data is None:
             return False
-        
-        if data_type not in self._historical_cache[cache_key]:
-            return False
-        
-        cache_data = self._historical_cache[cache_key][data_type]
         if 'timestamp' not in cache_data:
             return False
         
         # 检查缓存是否过期（历史数据缓存时间更长）
-        from datetime import datetime, timedelta
         cache_time = cache_data['timestamp']
         if isinstance(cache_time, str):
             cache_time = datetime.fromisoformat(cache_time)
         
         # 根据数据类型设置不同的缓存策略
-        if data_type in ['previous_close', 'support_resistance', 'previous_high', 'previous_low', 'bullish_line', 'bearish_line']:
+        if data_type in ['support_resistance', 'previous_high', 'previous_low', 'bullish_line', 'bearish_line']:
             # 完全静态的历史数据指标：当天不会变化，缓存1小时
             cache_duration = 3600  # 1小时
         elif data_type in ['ma_prices']:
@@ -737,55 +1100,62 @@ class IntradayWindow:
         """
         cache_key = cache_key or self._cache_key
         
-        if not self._is_cache_valid(cache_key, data_type):
-            return None
-        
-        return self._historical_cache[cache_key][data_type]['data']
+        with self._historical_cache_lock:
+            if not self._is_cache_valid(cache_key, data_type):
+                return None
+            self._historical_cache.move_to_end(cache_key)
+            return self._historical_cache[cache_key][data_type]['data']
 
     def _set_cached_data(self, data_type: str, data: Any, cache_key: str = None):
         """设置缓存数据
         :param data_type: 数据类型
         :param data: 要缓存的数据
-        :param cache_key: 缓存键，默认使用当前缓存键
+        :param cache_key: 缓存键，默认使用当前缓存键；后台计算应传入计算开始时取得的键，
+            避免计算期间切换交易日后写入新交易日的键
         """
-        from datetime import datetime
-        
         cache_key = cache_key or self._cache_key
         
-        if cache_key not in self._historical_cache:
-            self._historical_cache[cache_key] = {}
-        
-        self._historical_cache[cache_key][data_type] = {
-            'data': data,
-            'timestamp': datetime.now().isoformat()
-        }
+        # 独立计算任务会并发写入，插入、LRU调整和淘汰须整体加锁
+        with self._historical_cache_lock:
+            entry = self._historical_cache.setdefault(cache_key, {})
+            self._historical_cache.move_to_end(cache_key)
+            entry[data_type] = {
+                'data': data,
+                'timestamp': datetime.now().isoformat()
+            }
+            while len(self._historical_cache) > self.HISTORICAL_CACHE_CAPACITY:
+                self._historical_cache.popitem(last=False)
 
     def _invalidate_cache(self, cache_key: str = None):
         """使缓存失效
         :param cache_key: 缓存键，默认使用当前缓存键
         """
         cache_key = cache_key or self._cache_key
-        if cache_key in self._historical_cache:
-            del self._historical_cache[cache_key]
+        with self._historical_cache_lock:
+            self._historical_cache.pop(cache_key, None)
 
-    def _check_cache_key_change(self):
-        """检查缓存键是否发生变化，如果变化则清理旧缓存"""
+    def _check_cache_key_change(self) -> str:
+        """检查缓存键是否发生变化，返回当前缓存键
+        
+        旧键的缓存不再立即清理：缓存值按(代码, 交易日)区分，在相邻交易日间来回切换时可直接命中，
+        总量由 HISTORICAL_CACHE_CAPACITY 按LRU限制。调用方应保存返回的键，读写缓存时显式传入。
+        """
         current_key = self._get_cache_key()
         if self._last_cache_key and self._last_cache_key != current_key:
-            print(f"[DEBUG] 缓存键变化: {self._last_cache_key} -> {current_key}，清理旧缓存")
-            self._invalidate_cache(self._last_cache_key)
+            log.debug("缓存键变化: %s -> %s", self._last_cache_key, current_key)
         self._last_cache_key = current_key
         self._cache_key = current_key
+        return current_key
 
     def _clear_all_caches(self):
         """清理所有缓存数据"""
         try:
             # 清理历史数据缓存
-            self._historical_cache.clear()
+            with self._historical_cache_lock:
+                self._historical_cache.clear()
             
-            # 清理旧缓存
-            self._cached_previous_close = None
-            self._cached_previous_close_date = None
+            # 清理前一交易日收盘价缓存
+            self._prev_close_cache.clear()
             
             # 重置计算标记
             self._support_resistance_calculated = False
@@ -795,16 +1165,22 @@ class IntradayWindow:
             self._bullish_line_calculated = False
             self._bearish_line_calculated = False
             self._breakthrough_breakdown_calculated = False
+            self._bb_last_sig = None
             self._bollinger_signals_processed = False
             
+            # 重置布林带增量计算状态和前几个交易日5分钟K线缓存
+            self._boll_inc_state = {}
+            self._prev_day_5min_cache = None
+            self._prev_day_boll_cache = None
+            
             # 重置价格范围历史
-            self._price_range_history = None
-            self._price_range_initialized = False
+            self._pr_down = None
+            self._pr_up = None
             
-            print("[DEBUG] 所有缓存已清理")
+            log.debug("所有缓存已清理")
             
         except Exception as e:
-            print(f"[ERROR] 清理缓存失败: {e}")
+            log.exception("清理缓存失败: %s", e)
 
     def _update_trade_date(self, new_trade_date: date):
         """更新交易日（带缓存清理）"""
@@ -814,11 +1190,11 @@ class IntradayWindow:
             
             # 更新交易日
             self.trade_date = new_trade_date
-            self.trade_date_str = new_trade_date.strftime("%Y-%m-%d")
+            self.trade_date_str = new_trade_date.isoformat()
             
             # 清理缓存（交易日变更时）
             self._clear_all_caches()
-            print(f"[DEBUG] 交易日变更，清理所有缓存: {old_trade_date_str} -> {self.trade_date_str}")
+            log.debug("交易日变更，清理所有缓存: %s -> %s", old_trade_date_str, self.trade_date_str)
             
             # 更新缓存键
             self._cache_key = self._get_cache_key()
@@ -833,15 +1209,13 @@ class IntradayWindow:
                 try:
                     self.on_date_change_callback(self.trade_date_str)
                 except Exception as e:
-                    print(f"调用日期变化回调函数失败: {e}")
+                    log.exception("调用日期变化回调函数失败: %s", e)
             
             # 重新加载数据
-            self._update_data()
+            self._submit_update(new_context=True)
             
         except Exception as e:
-            print(f"[ERROR] 更新交易日失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("更新交易日失败: %s", e)
 
     def get_cache_status(self) -> dict:
         """获取缓存状态信息"""
@@ -851,35 +1225,34 @@ class IntradayWindow:
                 'last_cache_key': self._last_cache_key,
                 'historical_cache_size': len(self._historical_cache),
                 'cached_data_types': list(self._historical_cache.get(self._cache_key, {}).keys()) if self._cache_key in self._historical_cache else [],
-                'previous_close_cached': self._cached_previous_close is not None,
+                'previous_close_cached': bool(self._prev_close_cache),
                 'support_resistance_calculated': self._support_resistance_calculated,
                 'bollinger_calculated': self._bollinger_calculated,
                 'cache_valid_duration': self._cache_valid_duration
             }
             return status
         except Exception as e:
-            print(f"[ERROR] 获取缓存状态失败: {e}")
+            log.exception("获取缓存状态失败: %s", e)
             return {}
 
     def test_cache_performance(self) -> dict:
         """测试缓存性能"""
         try:
-            import time
 
             # 测试移动平均线缓存
-            start_time = time.time()
+            start_time = time_module.time()
             ma_result = self._get_ma_prices()
-            ma_time = time.time() - start_time
+            ma_time = time_module.time() - start_time
             
             # 测试前一交易日收盘价缓存
-            start_time = time.time()
+            start_time = time_module.time()
             prev_close = self._get_previous_close()
-            prev_close_time = time.time() - start_time
+            prev_close_time = time_module.time() - start_time
             
             # 测试支撑位压力位缓存
-            start_time = time.time()
+            start_time = time_module.time()
             self._calculate_support_resistance()
-            sr_time = time.time() - start_time
+            sr_time = time_module.time() - start_time
             
             performance = {
                 'ma_calculation_time': ma_time,
@@ -889,11 +1262,11 @@ class IntradayWindow:
                 'cache_hit_ratio': self._calculate_cache_hit_ratio()
             }
             
-            print(f"[DEBUG] 缓存性能测试结果: {performance}")
+            log.debug("缓存性能测试结果: %s", performance)
             return performance
             
         except Exception as e:
-            print(f"[ERROR] 缓存性能测试失败: {e}")
+            log.exception("缓存性能测试失败: %s", e)
             return {}
 
     def _calculate_cache_hit_ratio(self) -> float:
@@ -905,8 +1278,10 @@ class IntradayWindow:
             total_requests = 0
             cache_hits = 0
             
-            for cache_key, cache_data in self._historical_cache.items():
-                for data_type, data_info in cache_data.items():
+            with self._historical_cache_lock:
+                entries = [list(cache_data.values()) for cache_data in self._historical_cache.values()]
+            for data_infos in entries:
+                for data_info in data_infos:
                     total_requests += 1
                     if 'timestamp' in data_info:
                         cache_hits += 1
@@ -914,9 +1289,17 @@ class IntradayWindow:
             return cache_hits / total_requests if total_requests > 0 else 0.0
             
         except Exception as e:
-            print(f"[ERROR] 计算缓存命中率失败: {e}")
+            log.exception("计算缓存命中率失败: %s", e)
             return 0.0
 
+    def _is_today_cached(self) -> bool:
+        """当前交易日是否为今日（今日日期每30秒刷新一次）"""
+        now_ts = time_module.monotonic()
+        if now_ts - self._today_check_ts > 30:
+            self._today_date = date.today()
+            self._today_check_ts = now_ts
+        return self.trade_date == self._today_date
+
     def _schedule_update(self):
         """智能定时刷新，根据交易时间和数据变化情况优化调用频率"""
         # 检查窗口是否已销毁
@@ -932,14 +1315,14 @@ class IntradayWindow:
         is_trading_time = self._is_trading_time()
         
         if need_update:
-            threading.Thread(target=self._update_data, daemon=True).start()
+            self._submit_update()
         elif is_trading_time:
             # 交易时间内，即使使用缓存数据也需要重绘（价格可能变化）
-            threading.Thread(target=self._update_display_from_cache, daemon=True).start()
+            self._submit_display_from_cache()
         else:
             # 非交易时间，检查是否有必要重绘
             if self._should_redraw():
-                threading.Thread(target=self._update_display_from_cache, daemon=True).start()
+                self._submit_display_from_cache()
         
         # 根据交易时间调整下次更新间隔
         next_interval = self._get_next_update_interval()
@@ -948,17 +1331,16 @@ class IntradayWindow:
     def _should_redraw(self) -> bool:
         """判断是否需要重绘（非交易时间优化）"""
         try:
-            from datetime import datetime
 
             # 强制重绘标志（用于UI事件）
             if self._force_redraw or self._ui_event_redraw:
                 self._force_redraw = False
                 self._ui_event_redraw = False
-                print("[DEBUG] 强制重绘：UI事件触发")
+                log.debug("强制重绘：UI事件触发")
                 return True
             
             # 如果窗口刚创建或数据刚更新，需要重绘
-            if not hasattr(self, '_last_redraw_time'):
+            if self._last_redraw_time is None:
                 self._last_redraw_time = datetime.now()
                 return True
             
@@ -978,7 +1360,7 @@ class IntradayWindow:
             return True
             
         except Exception as e:
-            print(f"[DEBUG] 判断是否需要重绘失败: {e}")
+            log.debug("判断是否需要重绘失败: %s", e)
             return True  # 出错时默认重绘
 
     def _get_next_update_interval(self) -> int:
@@ -994,12 +1376,16 @@ class IntradayWindow:
                 return 300
                 
         except Exception as e:
-            print(f"[DEBUG] 获取更新间隔失败: {e}")
+            log.debug("获取更新间隔失败: %s", e)
             return 30  # 默认30秒
 
     def destroy(self):
         """销毁窗口并停止所有定时任务"""
         self._is_destroyed = True
+        if self._bollinger_alert_thread is not None:
+            self._bollinger_alert_queue.put(None)  # 通知提醒线程退出
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self._load_pool.shutdown(wait=False, cancel_futures=True)
         if hasattr(self, 'window') and self.window.winfo_exists():
             self.window.destroy()
 
@@ -1010,11 +1396,11 @@ class IntradayWindow:
             return
             
         try:
-            print("[DEBUG] 使用缓存数据更新显示")
+            log.debug("使用缓存数据更新显示")
             
             # 检查是否有缓存数据
             if not hasattr(self, 'price_df') or self.price_df is None or self.price_df.empty:
-                print("[DEBUG] 无缓存数据可用，跳过显示更新")
+                log.debug("无缓存数据可用，跳过显示更新")
                 return
             
             # 只进行必要的计算，不进行网络请求
@@ -1025,56 +1411,100 @@ class IntradayWindow:
                 self.window.after(0, self._draw)
                 
         except Exception as e:
-            print(f"[DEBUG] 使用缓存数据更新显示失败: {e}")
+            log.debug("使用缓存数据更新显示失败: %s", e)
 
     def _calculate_indicators_from_cache(self):
         """从缓存数据计算指标，避免网络请求"""
         try:
-            print("[DEBUG] 从缓存数据计算指标")
+            log.debug("从缓存数据计算指标")
             
             # 只计算必要的指标，跳过需要网络请求的部分
             if hasattr(self, 'price_df') and self.price_df is not None and not self.price_df.empty:
                 # 计算基础均线（如果有数据）
                 if len(self.price_df) >= self.MA_BASE_PERIOD:
-                    self.ma_base_values = self.price_df['close'].rolling(window=self.MA_BASE_PERIOD, min_periods=1).mean()
+                    self.ma_base_values = self._rolling_ma(self.price_df['close'], self.MA_BASE_PERIOD)
                 else:
                     self.ma_base_values = None
                 
                 # 跳过需要网络请求的指标计算
-                print("[DEBUG] 缓存模式：跳过需要网络请求的指标计算")
+                log.debug("缓存模式：跳过需要网络请求的指标计算")
                 
         except Exception as e:
-            print(f"[DEBUG] 从缓存计算指标失败: {e}")
+            log.debug("从缓存计算指标失败: %s", e)
 
-    def _update_data(self):
-        """拉取分时价格与平均成本数据"""
-        # 检查窗口是否已销毁
+    def _submit_update(self, new_context: bool = False):
+        """提交一次分时数据加载到加载线程池（主线程调用）
+        
+        :param new_context: 代码或交易日已切换；递增加载代数并取消尚未开始的旧加载
+        """
+        if self._is_destroyed or self._load_resubmit_pending:
+            # 已在等待过期加载结束，届时会按最新代数重新提交
+            return
+        if new_context:
+            self._load_generation += 1
+            old = self._load_future
+            if old is not None and not old.cancel() and not old.done():
+                # 旧加载仍在执行，结束前可能继续写入交易日相关属性：等其结束后回到主线程作废残留再提交
+                self._load_resubmit_pending = True
+                old.add_done_callback(self._on_stale_load_done)
+                return
+        self._load_future = self._load_pool.submit(self._update_data, self._load_generation)
+
+    def _submit_display_from_cache(self):
+        """提交一次缓存数据重绘到加载线程池，与数据加载串行执行（主线程调用）"""
+        if self._is_destroyed or self._load_resubmit_pending:
+            return
+        self._load_pool.submit(self._update_display_from_cache)
+
+    def _on_stale_load_done(self, _future: Future):
+        """过期加载结束（加载线程池回调），通过after切回Tk主线程"""
+        if not self._is_destroyed:
+            self.window.after(0, self._resubmit_after_stale_load)
+
+    def _resubmit_after_stale_load(self):
+        """作废过期加载残留的交易日相关状态，并按最新代数提交加载（Tk主线程）"""
+        self._load_resubmit_pending = False
         if self._is_destroyed:
             return
+        self._invalidate_day_caches()
+        self._submit_update()
+
+    def _is_stale_load(self, generation: Optional[int]) -> bool:
+        """加载开始后是否已切换代码或交易日（generation为None表示同步加载，不做校验）"""
+        return generation is not None and generation != self._load_generation
+
+    def _update_data(self, generation: Optional[int] = None):
+        """拉取分时价格与平均成本数据
+        
+        :param generation: 提交时的加载代数；执行过程中代码或交易日被切换时不再写入价格数据和重绘
+        """
+        # 检查窗口是否已销毁
+        if self._is_destroyed or self._is_stale_load(generation):
+            return
             
         try:
-            print("[DEBUG] 开始获取新数据")
+            log.debug("开始获取新数据")
             start_dt = f"{self.trade_date_str} 09:30:00"
             end_dt = f"{self.trade_date_str} 15:00:00"
             
             # 获取证券类型和对应的数据接口代码
-            security_type, symbol = self._get_security_type(self.code)
+            security_type, symbol = self._sec()
             
             if security_type == "INDEX":
                 # 使用指数分时数据接口
-                print(f"[DEBUG] 获取指数分时数据: {self.code} -> {symbol}, 时间: {start_dt} 到 {end_dt}, 周期: {self.period}")
+                log.debug("获取指数分时数据: %s -> %s, 时间: %s 到 %s, 周期: %s", self.code, symbol, start_dt, end_dt, self.period)
                 price_df = ak.index_zh_a_hist_min_em(
                     symbol=symbol,
                     start_date=start_dt,
                     end_date=end_dt,
                     period=str(self.period),
                 )
-                print(f"[DEBUG] 指数分时数据获取结果: {len(price_df)} 条记录")
+                log.debug("指数分时数据获取结果: %s 条记录", len(price_df))
                 if not price_df.empty:
-                    print(f"[DEBUG] 指数分时数据列名: {list(price_df.columns)}")
+                    log.debug("指数分时数据列名: %s", list(price_df.columns))
             elif security_type == "ETF":
                 # 使用ETF分时数据接口
-                print(f"[DEBUG] 获取ETF分时数据: {self.code}, 时间: {start_dt} 到 {end_dt}, 周期: {self.period}")
+                log.debug("获取ETF分时数据: %s, 时间: %s 到 %s, 周期: %s", self.code, start_dt, end_dt, self.period)
                 price_df = ak.fund_etf_hist_min_em(
                     symbol=symbol,
                     start_date=start_dt,
@@ -1082,12 +1512,12 @@ class IntradayWindow:
                     period=str(self.period),
                     adjust="",
                 )
-                print(f"[DEBUG] ETF分时数据获取结果: {len(price_df)} 条记录")
+                log.debug("ETF分时数据获取结果: %s 条记录", len(price_df))
                 if not price_df.empty:
-                    print(f"[DEBUG] ETF分时数据列名: {list(price_df.columns)}")
+                    log.debug("ETF分时数据列名: %s", list(price_df.columns))
             else:
                 # 使用股票分时数据接口
-                print(f"[DEBUG] 获取股票分时数据: {self.code}, 时间: {start_dt} 到 {end_dt}, 周期: {self.period}")
+                log.debug("获取股票分时数据: %s, 时间: %s 到 %s, 周期: %s", self.code, start_dt, end_dt, self.period)
                 price_df = ak.stock_zh_a_hist_min_em(
                     symbol=symbol,
                     start_date=start_dt,
@@ -1095,28 +1525,31 @@ class IntradayWindow:
                     period=str(self.period),  # 改为5分钟采样
                     adjust="",
                 )
-                print(f"[DEBUG] 股票分时数据获取结果: {len(price_df)} 条记录")
+                log.debug("股票分时数据获取结果: %s 条记录", len(price_df))
                 if not price_df.empty:
-                    print(f"[DEBUG] 股票分时数据列名: {list(price_df.columns)}")
-                    print(f"[DEBUG] 股票分时数据前5行:")
-                    print(price_df.head())
+                    log.debug("股票分时数据列名: %s", list(price_df.columns))
+                    log.debug("股票分时数据前5行:")
+                    log.debug("%s", price_df.head())
             
             # 如果分时数据为空（如9:25前），仍然需要计算支撑带和压力带
             if price_df.empty:
-                print(f"[DEBUG] 分时数据为空，但继续计算支撑带和压力带")
+                log.debug("分时数据为空，但继续计算支撑带和压力带")
                 # 创建一个空的数据框，但继续执行后续的支撑带和压力带计算
                 price_df = pd.DataFrame(columns=['datetime', 'open', 'close', 'high', 'low', 'volume'])
                 price_df['datetime'] = pd.to_datetime(price_df['datetime'])
                 price_df.set_index('datetime', inplace=True)
+                if self._is_stale_load(generation):
+                    log.debug("加载期间已切换代码或交易日，丢弃本次分时数据")
+                    return
                 self.price_df = price_df
                 
                 # 即使没有分时数据，也要计算支撑带和压力带
                 if not self._support_resistance_calculated:
                     try:
-                        print("[DEBUG] 分时数据为空，但仍计算支撑位和压力位")
+                        log.debug("分时数据为空，但仍计算支撑位和压力位")
                         self._calculate_support_resistance()
                     except Exception as e:
-                        print(f"[DEBUG] 计算支撑位和压力位失败: {e}")
+                        log.debug("计算支撑位和压力位失败: %s", e)
                 
                 # 计算前高前低价格
                 self._calculate_previous_high_low_prices()
@@ -1124,30 +1557,31 @@ class IntradayWindow:
                 # 即使没有分时数据，也要计算看涨线和看跌线
                 if not self._bullish_line_calculated:
                     try:
-                        print("[DEBUG] 分时数据为空，但仍计算看涨线")
+                        log.debug("分时数据为空，但仍计算看涨线")
                         self._calculate_bullish_line()
                     except Exception as e:
-                        print(f"[DEBUG] 计算看涨线失败: {e}")
+                        log.debug("计算看涨线失败: %s", e)
                 
                 if not self._bearish_line_calculated:
                     try:
-                        print("[DEBUG] 分时数据为空，但仍计算看跌线")
+                        log.debug("分时数据为空，但仍计算看跌线")
                         self._calculate_bearish_line()
                     except Exception as e:
-                        print(f"[DEBUG] 计算看跌线失败: {e}")
+                        log.debug("计算看跌线失败: %s", e)
                 
                 # 绘图（显示支撑带和压力带，即使没有分时数据）
-                self.window.after(0, self._draw)
+                if not self._is_stale_load(generation):
+                    self.window.after(0, self._draw)
                 return
             # 调试：检查原始数据列名
-            print(f"[DEBUG] 原始数据列名: {list(price_df.columns)}")
-            print(f"[DEBUG] 原始数据前5行:")
-            print(price_df.head())
+            log.debug("原始数据列名: %s", list(price_df.columns))
+            log.debug("原始数据前5行:")
+            log.debug("%s", price_df.head())
             
             # 统一列 - 包含所有必要的列
             # 根据AKShare文档，不同证券类型的分时数据列名可能不同
             # 先检查实际的列名，然后进行映射
-            print(f"[DEBUG] 实际列名: {list(price_df.columns)}")
+            log.debug("实际列名: %s", list(price_df.columns))
             
             # 根据实际列名进行映射
             column_mapping = {}
@@ -1173,7 +1607,7 @@ class IntradayWindow:
                         column_mapping[possible_name] = target_col
                         break
             
-            print(f"[DEBUG] 列名映射: {column_mapping}")
+            log.debug("列名映射: %s", column_mapping)
             
             # 应用列名映射
             if column_mapping:
@@ -1183,8 +1617,8 @@ class IntradayWindow:
             required_columns = ['open', 'close', 'high', 'low', 'volume']
             missing_columns = [col for col in required_columns if col not in price_df.columns]
             if missing_columns:
-                print(f"[ERROR] 映射后仍缺少必要的列: {missing_columns}")
-                print(f"[ERROR] 当前列名: {list(price_df.columns)}")
+                log.error("映射后仍缺少必要的列: %s", missing_columns)
+                log.error("当前列名: %s", list(price_df.columns))
                 # 尝试使用收盘价填充缺失的列
                 if 'close' in price_df.columns:
                     for col in missing_columns:
@@ -1192,44 +1626,48 @@ class IntradayWindow:
                             price_df[col] = price_df['close']
                         else:
                             price_df[col] = 0
-                    print(f"[WARNING] 使用收盘价填充缺失的列: {missing_columns}")
+                    log.warning("使用收盘价填充缺失的列: %s", missing_columns)
                 else:
-                    print(f"[ERROR] 无法修复缺失的列，跳过数据处理")
+                    log.error("无法修复缺失的列，跳过数据处理")
                     return
             
             # 调试：检查映射后的数据
-            print(f"[DEBUG] 映射后数据列名: {list(price_df.columns)}")
-            print(f"[DEBUG] 映射后数据前5行:")
-            print(price_df.head())
-            print(f"[DEBUG] 映射后数据类型:")
-            print(price_df.dtypes)
+            log.debug("映射后数据列名: %s", list(price_df.columns))
+            log.debug("映射后数据前5行:")
+            log.debug("%s", price_df.head())
+            log.debug("映射后数据类型:")
+            log.debug("%s", price_df.dtypes)
             
             # 最终验证：确保所有必要的列都存在且有效
             final_validation_passed = True
             for col in ['open', 'close', 'high', 'low', 'volume']:
                 if col not in price_df.columns:
-                    print(f"[ERROR] 最终验证失败：缺少列 {col}")
+                    log.error("最终验证失败：缺少列 %s", col)
                     final_validation_passed = False
                 elif price_df[col].isna().all():
-                    print(f"[ERROR] 最终验证失败：列 {col} 全部为NaN")
+                    log.error("最终验证失败：列 %s 全部为NaN", col)
                     final_validation_passed = False
                 elif (price_df[col] == 0).all():
-                    print(f"[WARNING] 列 {col} 全部为0，可能需要特殊处理")
+                    log.warning("列 %s 全部为0，可能需要特殊处理", col)
             
             # 特殊处理：对于分时数据，akshare通常只提供收盘价，其他价格字段为0
             # 我们需要使用收盘价来填充开盘价、最高价和最低价
             if (price_df['open'] == 0).all() and (price_df['close'] != 0).any():
-                print(f"[INFO] 检测到分时数据开盘价为0，使用收盘价填充开盘价、最高价和最低价")
+                log.info("检测到分时数据开盘价为0，使用收盘价填充开盘价、最高价和最低价")
                 price_df['open'] = price_df['close']
                 price_df['high'] = price_df['close']
                 price_df['low'] = price_df['close']
-                print(f"[INFO] 价格字段填充完成，收盘价范围: {price_df['close'].min():.4f} - {price_df['close'].max():.4f}")
+                log.info("价格字段填充完成，收盘价范围: %.4f - %.4f", price_df['close'].min(), price_df['close'].max())
             
             if not final_validation_passed:
-                print(f"[ERROR] 数据验证失败，跳过后续处理")
+                log.error("数据验证失败，跳过后续处理")
+                return
+            price_df["datetime"] = pd.to_datetime(
+                price_df["datetime"], format=_MIN_TIME_FORMAT, errors='coerce', cache=True)
+            price_df = price_df.dropna(subset=["datetime"]).set_index("datetime")
+            if self._is_stale_load(generation):
+                log.debug("加载期间已切换代码或交易日，丢弃本次分时数据")
                 return
-            price_df["datetime"] = pd.to_datetime(price_df["datetime"])
-            price_df.set_index("datetime", inplace=True)
             
             # 如果启用显示上一个交易日数据，则合并上一个交易日最后1小时数据
             if self.SHOW_PREVIOUS_DAY_DATA:
@@ -1238,20 +1676,16 @@ class IntradayWindow:
                     # 将上一个交易日最后1小时数据添加到当前数据前面
                     combined_df = pd.concat([prev_day_last_hour, price_df])
                     self.price_df = combined_df
-                    print(f"[DEBUG] 合并上一个交易日最后1小时数据，总数据长度: {len(combined_df)}")
+                    log.debug("合并上一个交易日最后1小时数据，总数据长度: %s", len(combined_df))
                 else:
                     self.price_df = price_df
-                    print(f"[DEBUG] 未获取到上一个交易日最后1小时数据，使用当日数据")
+                    log.debug("未获取到上一个交易日最后1小时数据，使用当日数据")
             else:
                 self.price_df = price_df
-                print(f"[DEBUG] 未启用显示上一个交易日数据，使用当日数据")
+                log.debug("未启用显示上一个交易日数据，使用当日数据")
             
             # 计算RSI指标
             try:
-                from audio_notifier import (notify_buy_signal,
-                                            notify_sell_signal)
-                from indicators import (calculate_intraday_kdj,
-                                        calculate_intraday_rsi, calculate_rsi)
 
                 # 获取多个前一交易日的分时数据，确保有足够的历史数据计算RSI
                 multiple_prev_data = self._get_multiple_previous_trading_days_intraday()
@@ -1260,12 +1694,12 @@ class IntradayWindow:
                     # 使用多个前一交易日的分时数据，确保有足够的历史数据
                     # 将多个前一交易日数据与当日数据合并
                     price_df_with_prev = pd.concat([multiple_prev_data, price_df])
-                    print(f"[DEBUG] 成功合并多个前一交易日分时数据用于RSI计算")
-                    print(f"[DEBUG] 多个前一交易日数据长度: {len(multiple_prev_data)}")
-                    print(f"[DEBUG] 当日数据长度: {len(price_df)}")
-                    print(f"[DEBUG] 合并后总长度: {len(price_df_with_prev)}")
-                    print(f"[DEBUG] 多个前一交易日最后几个价格: {multiple_prev_data['close'].tail(3).values}")
-                    print(f"[DEBUG] 当日开盘几个价格: {price_df['close'].head(3).values}")
+                    log.debug("成功合并多个前一交易日分时数据用于RSI计算")
+                    log.debug("多个前一交易日数据长度: %s", len(multiple_prev_data))
+                    log.debug("当日数据长度: %s", len(price_df))
+                    log.debug("合并后总长度: %s", len(price_df_with_prev))
+                    log.debug("多个前一交易日最后几个价格: %s", multiple_prev_data['close'].tail(3).values)
+                    log.debug("当日开盘几个价格: %s", price_df['close'].head(3).values)
                 else:
                     # 如果无法获取多个前一交易日分时数据，尝试获取单个前一交易日数据
                     prev_intraday_df = self._get_previous_trading_day_intraday()
@@ -1274,12 +1708,12 @@ class IntradayWindow:
                         # 使用前一交易日的分时数据，确保有足够的历史数据
                         # 将前一交易日数据与当日数据合并
                         price_df_with_prev = pd.concat([prev_intraday_df, price_df])
-                        print(f"[DEBUG] 成功合并前一交易日分时数据用于RSI计算")
-                        print(f"[DEBUG] 前一交易日数据长度: {len(prev_intraday_df)}")
-                        print(f"[DEBUG] 当日数据长度: {len(price_df)}")
-                        print(f"[DEBUG] 合并后总长度: {len(price_df_with_prev)}")
-                        print(f"[DEBUG] 前一交易日最后几个价格: {prev_intraday_df['close'].tail(3).values}")
-                        print(f"[DEBUG] 当日开盘几个价格: {price_df['close'].head(3).values}")
+                        log.debug("成功合并前一交易日分时数据用于RSI计算")
+                        log.debug("前一交易日数据长度: %s", len(prev_intraday_df))
+                        log.debug("当日数据长度: %s", len(price_df))
+                        log.debug("合并后总长度: %s", len(price_df_with_prev))
+                        log.debug("前一交易日最后几个价格: %s", prev_intraday_df['close'].tail(3).values)
+                        log.debug("当日开盘几个价格: %s", price_df['close'].head(3).values)
                     else:
                         # 如果无法获取前一交易日分时数据，回退到使用收盘价
                         prev_close = self._get_previous_close()
@@ -1294,11 +1728,11 @@ class IntradayWindow:
                             
                             # 将前一日数据与当日数据合并
                             price_df_with_prev = pd.concat([prev_row, price_df])
-                            print(f"[DEBUG] 使用前一交易日收盘价用于RSI计算，总数据点: {len(price_df_with_prev)}")
-                            print(f"[DEBUG] 前一交易日收盘价: {prev_close}")
+                            log.debug("使用前一交易日收盘价用于RSI计算，总数据点: %s", len(price_df_with_prev))
+                            log.debug("前一交易日收盘价: %s", prev_close)
                         else:
                             price_df_with_prev = price_df
-                            print(f"[DEBUG] 无法获取前一交易日数据，使用当日数据用于RSI计算，总数据点: {len(price_df_with_prev)}")
+                            log.debug("无法获取前一交易日数据，使用当日数据用于RSI计算，总数据点: %s", len(price_df_with_prev))
 
                 # 修复：每日RSI独立计算，为每个交易日单独计算RSI
                 # 计算当日RSI数据（使用Wilder平滑法，与5分钟RSI6保持一致）
@@ -1327,7 +1761,7 @@ class IntradayWindow:
                 if historical_5min_data is not None and not historical_5min_data.empty:
                     # 合并历史数据和当日数据
                     combined_5min_data = pd.concat([historical_5min_data, price_df_5min_today])
-                    print(f"[DEBUG] 合并历史5分钟数据用于RSI计算，总长度: {len(combined_5min_data)}")
+                    log.debug("合并历史5分钟数据用于RSI计算，总长度: %s", len(combined_5min_data))
                     
                     # 使用合并后的数据计算5分钟RSI6
                     rsi_5min_6_combined = calculate_intraday_rsi(combined_5min_data, period=6, price_col="close", 
@@ -1335,7 +1769,7 @@ class IntradayWindow:
                     
                     # 只保留当日部分的RSI数据
                     rsi_5min_6_today = rsi_5min_6_combined.iloc[len(historical_5min_data):]
-                    print(f"[DEBUG] 使用历史数据计算5分钟RSI6，当日数据长度: {len(rsi_5min_6_today)}")
+                    log.debug("使用历史数据计算5分钟RSI6，当日数据长度: %s", len(rsi_5min_6_today))
                 else:
                     # 没有历史数据时，使用前一交易日收盘价
                     prev_close = self._get_previous_close()
@@ -1349,14 +1783,15 @@ class IntradayWindow:
                 
                 # 为信号计算保持数学准确性：使用前向填充
                 rsi_5min_6_1min_today_signal = self._interpolate_5min_rsi_to_1min(rsi_5min_6_today, price_df.index, for_display_only=False)
-                # 为显示效果：使用线性插值
-                rsi_5min_6_1min_today_display = self._interpolate_5min_rsi_to_1min(rsi_5min_6_today, price_df.index, for_display_only=True)
+                # 为显示效果：使用线性插值（只进入rsi_df_display，降为float32减半内存占用）
+                rsi_5min_6_1min_today_display = self._interpolate_5min_rsi_to_1min(
+                    rsi_5min_6_today, price_df.index, for_display_only=True).astype(np.float32)
                 
-                print(f"[DEBUG] 5分钟RSI6计算完成，数据长度: {len(price_df_5min_today)}")
-                print(f"[DEBUG] 5分钟RSI6前5个值: {rsi_5min_6_today.head().values}")
-                print(f"[DEBUG] 5分钟RSI6后5个值: {rsi_5min_6_today.tail().values}")
+                log.debug("5分钟RSI6计算完成，数据长度: %s", len(price_df_5min_today))
+                log.debug("5分钟RSI6前5个值: %s", rsi_5min_6_today.head().values)
+                log.debug("5分钟RSI6后5个值: %s", rsi_5min_6_today.tail().values)
                 
-                print(f"[DEBUG] 当日RSI计算完成，数据长度: {len(price_df)}")
+                log.debug("当日RSI计算完成，数据长度: %s", len(price_df))
                 
                 # 计算上一个交易日的RSI数据（如果存在）
                 prev_rsi_1min_6 = None
@@ -1367,8 +1802,8 @@ class IntradayWindow:
                 if len(price_df_with_prev) > len(price_df):
                     # 有上一个交易日数据，独立计算其RSI
                     prev_day_data = price_df_with_prev.iloc[:len(price_df_with_prev) - len(price_df)]
-                    print(f"[DEBUG] 上一个交易日数据长度: {len(prev_day_data)}")
-                    print(f"[DEBUG] 上一个交易日价格范围: [{prev_day_data['close'].min():.2f}, {prev_day_data['close'].max():.2f}]")
+                    log.debug("上一个交易日数据长度: %s", len(prev_day_data))
+                    log.debug("上一个交易日价格范围: [%.2f, %.2f]", prev_day_data['close'].min(), prev_day_data['close'].max())
                     
                     # 检查数据长度是否足够计算RSI
                     if len(prev_day_data) >= 6:
@@ -1380,8 +1815,8 @@ class IntradayWindow:
                         else:
                             prev_rsi_1min_6 = calculate_intraday_rsi(prev_day_data, period=6, price_col="close", 
                                                                    session_start_time="09:30")
-                        print(f"[DEBUG] 上一个交易日RSI6前5个值: {prev_rsi_1min_6.head().values}")
-                        print(f"[DEBUG] 上一个交易日RSI6后5个值: {prev_rsi_1min_6.tail().values}")
+                        log.debug("上一个交易日RSI6前5个值: %s", prev_rsi_1min_6.head().values)
+                        log.debug("上一个交易日RSI6后5个值: %s", prev_rsi_1min_6.tail().values)
                         
                         if len(prev_day_data) >= 12:
                             prev_rsi_12 = calculate_rsi(prev_day_data, period=12, price_col="close")
@@ -1417,15 +1852,15 @@ class IntradayWindow:
                                                                        session_start_time="09:30")
                             # 使用线性插值实现平滑过渡，与主流软件保持一致
                             prev_rsi_5min_6_1min = self._interpolate_5min_rsi_to_1min(prev_rsi_5min_6, prev_day_data.index)
-                            print(f"[DEBUG] 上一个交易日5分钟RSI6计算完成，数据长度: {len(prev_day_5min)}")
+                            log.debug("上一个交易日5分钟RSI6计算完成，数据长度: %s", len(prev_day_5min))
                         else:
                             # 上一个交易日5分钟数据为空时，使用中性值
-                            print(f"[DEBUG] 上一个交易日5分钟数据为空，使用中性值")
+                            log.debug("上一个交易日5分钟数据为空，使用中性值")
                             prev_rsi_5min_6_1min = pd.Series([50.0] * len(prev_day_data), index=prev_day_data.index)
                         
-                        print(f"[DEBUG] 上一个交易日RSI计算完成")
+                        log.debug("上一个交易日RSI计算完成")
                     else:
-                        print(f"[DEBUG] 上一个交易日数据长度不足，无法计算RSI")
+                        log.debug("上一个交易日数据长度不足，无法计算RSI")
                         prev_rsi_1min_6 = pd.Series([np.nan] * len(prev_day_data), index=prev_day_data.index)
                         prev_rsi_12 = pd.Series([np.nan] * len(prev_day_data), index=prev_day_data.index)
                         prev_rsi_24 = pd.Series([np.nan] * len(prev_day_data), index=prev_day_data.index)
@@ -1435,24 +1870,24 @@ class IntradayWindow:
                 rsi_1min_6_display = rsi_1min_6_today
                 rsi_12_display = rsi_12_today
                 rsi_24_display = rsi_24_today
-                print(f"[DEBUG] RSI计算完成，每日独立计算，互不影响")
+                log.debug("RSI计算完成，每日独立计算，互不影响")
                 
                 # 创建RSI数据框
                 if self.SHOW_PREVIOUS_DAY_DATA and len(self.price_df) > len(price_df) and prev_rsi_1min_6 is not None:
                     # 有上一个交易日数据且已计算其RSI，创建包含两个交易日RSI的数据框
-                    print(f"[DEBUG] 创建包含两个交易日RSI的数据框")
-                    print(f"[DEBUG] 显示数据长度: {len(self.price_df)}, 当日数据长度: {len(price_df)}")
+                    log.debug("创建包含两个交易日RSI的数据框")
+                    log.debug("显示数据长度: %s, 当日数据长度: %s", len(self.price_df), len(price_df))
                     
                     # 检查数据长度匹配
                     prev_day_length = len(self.price_df) - len(price_df)
-                    print(f"[DEBUG] 上一个交易日数据长度: {prev_day_length}")
-                    print(f"[DEBUG] prev_rsi_1min_6长度: {len(prev_rsi_1min_6)}")
-                    print(f"[DEBUG] rsi_1min_6_display长度: {len(rsi_1min_6_display)}")
-                    print(f"[DEBUG] 总长度应该为: {len(prev_rsi_1min_6) + len(rsi_1min_6_display)}")
+                    log.debug("上一个交易日数据长度: %s", prev_day_length)
+                    log.debug("prev_rsi_1min_6长度: %s", len(prev_rsi_1min_6))
+                    log.debug("rsi_1min_6_display长度: %s", len(rsi_1min_6_display))
+                    log.debug("总长度应该为: %s", len(prev_rsi_1min_6) + len(rsi_1min_6_display))
                     
                     # 确保数据长度匹配
                     if len(prev_rsi_1min_6) != prev_day_length:
-                        print(f"[DEBUG] 警告：上一个交易日RSI长度不匹配，调整数据")
+                        log.debug("警告：上一个交易日RSI长度不匹配，调整数据")
                         # 截取或填充数据以匹配长度
                         if len(prev_rsi_1min_6) > prev_day_length:
                             prev_rsi_1min_6 = prev_rsi_1min_6.iloc[-prev_day_length:]
@@ -1506,9 +1941,9 @@ class IntradayWindow:
                         'RSI24': list(prev_rsi_24.values if prev_rsi_24 is not None else [np.nan] * prev_day_length) + list(rsi_24_display.values)
                     }, index=self.price_df.index)
                     
-                    print(f"[DEBUG] RSI数据已扩展，总长度: {len(self.rsi_df)}")
-                    print(f"[DEBUG] 上一个交易日RSI6_1min值范围: [{prev_rsi_1min_6.min():.2f}, {prev_rsi_1min_6.max():.2f}]")
-                    print(f"[DEBUG] 当日RSI6_1min值范围: [{rsi_1min_6_display.min():.2f}, {rsi_1min_6_display.max():.2f}]")
+                    log.debug("RSI数据已扩展，总长度: %s", len(self.rsi_df))
+                    log.debug("上一个交易日RSI6_1min值范围: [%.2f, %.2f]", prev_rsi_1min_6.min(), prev_rsi_1min_6.max())
+                    log.debug("当日RSI6_1min值范围: [%.2f, %.2f]", rsi_1min_6_display.min(), rsi_1min_6_display.max())
                 else:
                     # 只有当日数据，创建仅包含当日RSI的数据框
                     # 注意：RSI6_5min使用信号计算用的数据（前向填充），保持数学准确性
@@ -1527,16 +1962,16 @@ class IntradayWindow:
                         'RSI24': rsi_24_display
                     }, index=price_df.index)
                     
-                    print(f"[DEBUG] 创建仅包含当日RSI的数据框，长度: {len(self.rsi_df)}")
+                    log.debug("创建仅包含当日RSI的数据框，长度: %s", len(self.rsi_df))
             except Exception as e:
-                print(f"计算RSI指标失败: {e}")
+                log.exception("计算RSI指标失败: %s", e)
                 self.rsi_df = None
                 self.kdj_df = None
             
             # 计算5分钟级别布林带（异步执行，避免阻塞）
             def calculate_bollinger_async():
                 try:
-                    print("[DEBUG] 开始计算5分钟级别布林带")
+                    log.debug("开始计算5分钟级别布林带")
                     
                     # 获取历史5分钟数据用于布林带计算
                     historical_5min_data = self._get_historical_5min_data_for_bollinger()
@@ -1553,11 +1988,11 @@ class IntradayWindow:
                     if historical_5min_data is not None and not historical_5min_data.empty:
                         # 合并历史数据和当日数据
                         combined_5min_data = pd.concat([historical_5min_data, today_5min_data])
-                        print(f"[DEBUG] 合并历史5分钟数据用于布林带计算，总长度: {len(combined_5min_data)}")
+                        log.debug("合并历史5分钟数据用于布林带计算，总长度: %s", len(combined_5min_data))
                     else:
                         # 如果无法获取历史数据，使用当日数据
                         combined_5min_data = today_5min_data
-                        print(f"[DEBUG] 使用当日5分钟数据计算布林带，长度: {len(combined_5min_data)}")
+                        log.debug("使用当日5分钟数据计算布林带，长度: %s", len(combined_5min_data))
                     
                     # 计算布林带（带缓存机制）
                     bollinger_data = self._get_cached_bollinger_data(combined_5min_data)
@@ -1574,18 +2009,20 @@ class IntradayWindow:
                         
                         # 在主线程中更新布林带数据
                         if self.window and self.window.winfo_exists():
-                            self.window.after(0, lambda: self._update_bollinger_data(bollinger_upper, bollinger_middle, bollinger_lower))
+                            def apply_bollinger():
+                                # 计算期间已切换代码或交易日时丢弃，避免旧交易日布林带覆盖新数据
+                                if not self._is_stale_load(generation):
+                                    self._update_bollinger_data(bollinger_upper, bollinger_middle, bollinger_lower)
+                            self.window.after(0, apply_bollinger)
                         
-                        print(f"[DEBUG] 5分钟布林带计算完成，数据长度: {len(bollinger_upper)}")
+                        log.debug("5分钟布林带计算完成，数据长度: %s", len(bollinger_upper))
                     else:
-                        print("[DEBUG] 布林带计算失败，数据为空")
+                        log.debug("布林带计算失败，数据为空")
                         if self.window and self.window.winfo_exists():
                             self.window.after(0, lambda: setattr(self, '_bollinger_calculated', False))
                         
                 except Exception as e:
-                    print(f"计算5分钟布林带失败: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    log.exception("计算5分钟布林带失败: %s", e)
                     if self.window and self.window.winfo_exists():
                         self.window.after(0, lambda: setattr(self, '_bollinger_calculated', False))
             
@@ -1594,7 +2031,7 @@ class IntradayWindow:
             
             # 计算KDJ指标
             try:
-                print(f"[DEBUG] 开始计算KDJ指标")
+                log.debug("开始计算KDJ指标")
                 
                 # 使用当日数据计算KDJ (针对日内高低点捕捉优化参数)
                 kdj_today = calculate_intraday_kdj(price_df, n=55, m1=21, m2=5, 
@@ -1611,30 +2048,30 @@ class IntradayWindow:
                         
                         # 合并上一个交易日和当日的KDJ数据
                         self.kdj_df = pd.concat([prev_kdj, kdj_today], ignore_index=False)
-                        print(f"[DEBUG] KDJ数据已扩展，总长度: {len(self.kdj_df)}")
+                        log.debug("KDJ数据已扩展，总长度: %s", len(self.kdj_df))
                     else:
                         self.kdj_df = kdj_today
-                        print(f"[DEBUG] 创建仅包含当日KDJ的数据框，长度: {len(self.kdj_df)}")
+                        log.debug("创建仅包含当日KDJ的数据框，长度: %s", len(self.kdj_df))
                 else:
                     self.kdj_df = kdj_today
-                    print(f"[DEBUG] 创建仅包含当日KDJ的数据框，长度: {len(self.kdj_df)}")
+                    log.debug("创建仅包含当日KDJ的数据框，长度: %s", len(self.kdj_df))
                     
             except Exception as e:
-                print(f"计算KDJ指标失败: {e}")
+                log.exception("计算KDJ指标失败: %s", e)
                 self.kdj_df = None
             
             # 计算移动平均线
             try:
                 # 使用包含多个前一交易日数据的价格数据框计算MA指标，确保开盘阶段有足够的历史数据
-                print(f"[DEBUG] 计算MA指标，合并后数据总长度: {len(price_df_with_prev)}")
-                print(f"[DEBUG] 多个前一交易日数据长度: {len(price_df_with_prev) - len(price_df) if len(price_df_with_prev) > len(price_df) else 0}")
+                log.debug("计算MA指标，合并后数据总长度: %s", len(price_df_with_prev))
+                log.debug("多个前一交易日数据长度: %s", len(price_df_with_prev) - len(price_df) if len(price_df_with_prev) > len(price_df) else 0)
                 
                 # 短期均线: 25个1分钟周期的移动平均线
-                ma_short_values = price_df_with_prev['close'].rolling(window=self.MA_SHORT_PERIOD, min_periods=1).mean()
+                ma_short_values = self._rolling_ma(price_df_with_prev['close'], self.MA_SHORT_PERIOD)
                 # 中期均线: 50个1分钟周期的移动平均线
-                ma_mid_values = price_df_with_prev['close'].rolling(window=self.MA_MID_PERIOD, min_periods=1).mean()
+                ma_mid_values = self._rolling_ma(price_df_with_prev['close'], self.MA_MID_PERIOD)
                 # 基础均线: 1250个1分钟周期的移动平均线（约等于日线MA5，可调试修改为其他值）
-                ma_base_values = price_df_with_prev['close'].rolling(window=self.MA_BASE_PERIOD, min_periods=1).mean()
+                ma_base_values = self._rolling_ma(price_df_with_prev['close'], self.MA_BASE_PERIOD)
                 
                 # 关键修复：只取当日数据对应的MA值，但保持前一交易日数据的影响
                 # 找到当日数据在合并数据中的起始位置
@@ -1644,22 +2081,22 @@ class IntradayWindow:
                     self.ma_short_values = ma_short_values.iloc[start_idx:]
                     self.ma_mid_values = ma_mid_values.iloc[start_idx:]
                     self.ma_base_values = ma_base_values.iloc[start_idx:]
-                    print(f"[DEBUG] 从合并数据中提取当日MA值，起始索引: {start_idx}")
+                    log.debug("从合并数据中提取当日MA值，起始索引: %s", start_idx)
                 else:
                     # 没有前一交易日数据，直接使用
                     self.ma_short_values = ma_short_values
                     self.ma_mid_values = ma_mid_values
                     self.ma_base_values = ma_base_values
-                    print(f"[DEBUG] 直接使用当日MA值")
+                    log.debug("直接使用当日MA值")
                 
-                print(f"[DEBUG] MA指标计算完成，数据长度: {len(self.ma_short_values)}")
-                print(f"[DEBUG] 短期MA起始值: {self.ma_short_values.iloc[0]:.4f}")
-                print(f"[DEBUG] 中期MA起始值: {self.ma_mid_values.iloc[0]:.4f}")
+                log.debug("MA指标计算完成，数据长度: %s", len(self.ma_short_values))
+                log.debug("短期MA起始值: %.4f", self.ma_short_values.iloc[0])
+                log.debug("中期MA起始值: %.4f", self.ma_mid_values.iloc[0])
                 
                 # 如果显示数据包含上一个交易日数据，需要扩展MA数据以匹配显示数据
                 if self.SHOW_PREVIOUS_DAY_DATA and len(self.price_df) > len(price_df):
-                    print(f"[DEBUG] 显示数据包含上一个交易日数据，扩展MA数据以匹配显示数据")
-                    print(f"[DEBUG] 显示数据长度: {len(self.price_df)}, 当日数据长度: {len(price_df)}")
+                    log.debug("显示数据包含上一个交易日数据，扩展MA数据以匹配显示数据")
+                    log.debug("显示数据长度: %s, 当日数据长度: %s", len(self.price_df), len(price_df))
                     
                     # 为上一个交易日数据计算MA值，而不是填充NaN
                     prev_day_length = len(self.price_df) - len(price_df)
@@ -1677,21 +2114,21 @@ class IntradayWindow:
                             prev_ma_mid = ma_mid_values.iloc[display_start_idx:calc_start_idx]
                             prev_ma_base = ma_base_values.iloc[display_start_idx:calc_start_idx]
                             
-                            print(f"[DEBUG] 提取显示用的上一个交易日MA数据，长度: {len(prev_ma_short)}")
+                            log.debug("提取显示用的上一个交易日MA数据，长度: %s", len(prev_ma_short))
                         else:
                             # 显示数据长度超过计算数据，用NaN填充
                             prev_day_index = self.price_df.index[:prev_day_length]
                             prev_ma_short = pd.Series([np.nan] * prev_day_length, index=prev_day_index)
                             prev_ma_mid = pd.Series([np.nan] * prev_day_length, index=prev_day_index)
                             prev_ma_base = pd.Series([np.nan] * prev_day_length, index=prev_day_index)
-                            print(f"[DEBUG] 显示数据长度超过计算数据，创建NaN值")
+                            log.debug("显示数据长度超过计算数据，创建NaN值")
                     else:
                         # 没有前一交易日数据，创建NaN值
                         prev_day_index = self.price_df.index[:prev_day_length]
                         prev_ma_short = pd.Series([np.nan] * prev_day_length, index=prev_day_index)
                         prev_ma_mid = pd.Series([np.nan] * prev_day_length, index=prev_day_index)
                         prev_ma_base = pd.Series([np.nan] * prev_day_length, index=prev_day_index)
-                        print(f"[DEBUG] 没有前一交易日MA数据，创建NaN值")
+                        log.debug("没有前一交易日MA数据，创建NaN值")
                     
                     # 扩展MA数据，包含上一个交易日的MA数据
                     extended_ma_short = pd.Series(list(prev_ma_short.values) + list(self.ma_short_values.values), 
@@ -1704,13 +2141,13 @@ class IntradayWindow:
                     self.ma_short_values = extended_ma_short
                     self.ma_mid_values = extended_ma_mid
                     self.ma_base_values = extended_ma_base
-                    print(f"[DEBUG] MA数据已扩展，总长度: {len(self.ma_short_values)}")
-                    print(f"[DEBUG] 上一个交易日MA25值: {prev_ma_short.values}")
-                    print(f"[DEBUG] 当日MA25值: {self.ma_short_values.iloc[prev_day_length:].values}")
+                    log.debug("MA数据已扩展，总长度: %s", len(self.ma_short_values))
+                    log.debug("上一个交易日MA25值: %s", prev_ma_short.values)
+                    log.debug("当日MA25值: %s", self.ma_short_values.iloc[prev_day_length:].values)
                 
                 # 计算5分钟级别布林带
                 try:
-                    print("[DEBUG] 开始计算5分钟级别布林带")
+                    log.debug("开始计算5分钟级别布林带")
                     # 先将1分钟数据重采样为5分钟数据
                     price_5min = price_df.resample('5T', offset='1min').agg({
                         'open': 'first',
@@ -1721,13 +2158,13 @@ class IntradayWindow:
                     }).dropna()
                     
                     if len(price_5min) < 20:  # 需要至少20个5分钟周期来计算布林带
-                        print(f"[DEBUG] 5分钟数据不足({len(price_5min)}个周期)，无法计算布林带")
+                        log.debug("5分钟数据不足(%s个周期)，无法计算布林带", len(price_5min))
                         self.bollinger_5min_upper = None
                         self.bollinger_5min_lower = None
                         self.bollinger_5min_middle = None
                     else:
                         # 计算5分钟布林带
-                        self.bollinger_5min_data = self._calculate_5min_bollinger_bands(price_5min)
+                        self.bollinger_5min_data = self._incremental_bollinger_bands(price_5min, 'today')
                         
                         # 将5分钟布林带数据插值到1分钟级别（用于突破跌破计算）
                         self.bollinger_5min_upper = self._interpolate_5min_to_1min(self.bollinger_5min_data['BOLL_UPPER'], price_df.index)
@@ -1735,14 +2172,14 @@ class IntradayWindow:
                         self.bollinger_5min_middle = self._interpolate_5min_to_1min(self.bollinger_5min_data['MA20'], price_df.index)
                         
                         if self.bollinger_5min_data is not None:
-                            print(f"[DEBUG] 5分钟布林带计算完成，原始数据长度: {len(self.bollinger_5min_data)}")
-                            print(f"[DEBUG] 插值后数据长度: {len(self.bollinger_5min_upper) if self.bollinger_5min_upper is not None else 0}")
-                            print(f"[DEBUG] 布林带上轨范围: [{self.bollinger_5min_data['BOLL_UPPER'].min():.3f}, {self.bollinger_5min_data['BOLL_UPPER'].max():.3f}]")
-                            print(f"[DEBUG] 布林带下轨范围: [{self.bollinger_5min_data['BOLL_LOWER'].min():.3f}, {self.bollinger_5min_data['BOLL_LOWER'].max():.3f}]")
+                            log.debug("5分钟布林带计算完成，原始数据长度: %s", len(self.bollinger_5min_data))
+                            log.debug("插值后数据长度: %s", len(self.bollinger_5min_upper) if self.bollinger_5min_upper is not None else 0)
+                            log.debug("布林带上轨范围: [%.3f, %.3f]", self.bollinger_5min_data['BOLL_UPPER'].min(), self.bollinger_5min_data['BOLL_UPPER'].max())
+                            log.debug("布林带下轨范围: [%.3f, %.3f]", self.bollinger_5min_data['BOLL_LOWER'].min(), self.bollinger_5min_data['BOLL_LOWER'].max())
                         else:
-                            print("[DEBUG] 5分钟布林带计算失败")
+                            log.debug("5分钟布林带计算失败")
                 except Exception as e:
-                    print(f"[DEBUG] 计算5分钟布林带失败: {e}")
+                    log.debug("计算5分钟布林带失败: %s", e)
                     self.bollinger_5min_upper = None
                     self.bollinger_5min_lower = None
                     self.bollinger_5min_middle = None
@@ -1750,18 +2187,17 @@ class IntradayWindow:
                 # 先计算支撑位和压力位（确保信号检测时有数据可用）
                 if not self._support_resistance_calculated:
                     try:
-                        print("[DEBUG] 在_update_data方法中计算支撑位和压力位")
+                        log.debug("在_update_data方法中计算支撑位和压力位")
                         self._calculate_support_resistance()
                     except Exception as e:
-                        print(f"[DEBUG] 在_update_data方法中计算支撑位和压力位失败: {e}")
+                        log.debug("在_update_data方法中计算支撑位和压力位失败: %s", e)
                         # 如果第一次计算失败，尝试再次计算（可能是网络延迟问题）
                         try:
-                            print("[DEBUG] 第一次计算失败，尝试重新计算支撑位和压力位")
-                            import time
-                            time.sleep(1)  # 等待1秒后重试
+                            log.debug("第一次计算失败，尝试重新计算支撑位和压力位")
+                            time_module.sleep(1)  # 等待1秒后重试
                             self._calculate_support_resistance()
                         except Exception as e2:
-                            print(f"[DEBUG] 重试计算支撑位和压力位仍然失败: {e2}")
+                            log.debug("重试计算支撑位和压力位仍然失败: %s", e2)
                 
                 # 使用分时信号管理器检测买入和卖出信号
                 data = {
@@ -1780,13 +2216,13 @@ class IntradayWindow:
                     'code': self.code  # 添加股票代码
                 }
                 
-                print(f"[DEBUG] 准备检测信号，数据准备完成:")
-                print(f"[DEBUG] - ma_short_values长度: {len(self.ma_short_values) if self.ma_short_values is not None else 'None'}")
-                print(f"[DEBUG] - ma_mid_values长度: {len(self.ma_mid_values) if self.ma_mid_values is not None else 'None'}")
-                print(f"[DEBUG] - close_prices长度: {len(price_df['close'])}")
-                print(f"[DEBUG] - prev_close: {data['prev_close']}")
-                print(f"[DEBUG] - support_level: {self.support_level}")
-                print(f"[DEBUG] - resistance_level: {self.resistance_level}")
+                log.debug("准备检测信号，数据准备完成:")
+                log.debug("- ma_short_values长度: %s", len(self.ma_short_values) if self.ma_short_values is not None else 'None')
+                log.debug("- ma_mid_values长度: %s", len(self.ma_mid_values) if self.ma_mid_values is not None else 'None')
+                log.debug("- close_prices长度: %s", len(price_df['close']))
+                log.debug("- prev_close: %s", data['prev_close'])
+                log.debug("- support_level: %s", self.support_level)
+                log.debug("- resistance_level: %s", self.resistance_level)
                 # 检查布林带数据是否可用
                 if self.bollinger_5min_upper is not None and self.bollinger_5min_middle is not None and self.bollinger_5min_lower is not None:
                     # 布林带数据可用，进行完整信号检测
@@ -1794,7 +2230,7 @@ class IntradayWindow:
                     basic_sell_signals = self.signal_manager.detect_sell_signals(data, price_df['close'])
                 else:
                     # 布林带数据不可用，但连板信号、连涨信号和连跌信号不依赖当前交易日的布林带数据，可以先检测
-                    print("[DEBUG] 布林带数据不可用，但检测连板信号、连涨信号和连跌信号（不依赖当前交易日布林带）")
+                    log.debug("布林带数据不可用，但检测连板信号、连涨信号和连跌信号（不依赖当前交易日布林带）")
                     # 检测不依赖布林带的信号
                     basic_buy_signals = []
                     for signal in self.signal_manager.buy_signals:
@@ -1804,7 +2240,7 @@ class IntradayWindow:
                                 if signal.check_condition(data, i):
                                     signal_data = signal.create_signal_data(data, i)
                                     basic_buy_signals.append(signal_data)
-                                    print(f"[DEBUG] 检测到买入信号: {signal_data.get('signal_type', 'Unknown')}")
+                                    log.debug("检测到买入信号: %s", signal_data.get('signal_type', 'Unknown'))
                     
                     basic_sell_signals = []
                     for signal in self.signal_manager.sell_signals:
@@ -1814,7 +2250,7 @@ class IntradayWindow:
                                 if signal.check_condition(data, i):
                                     signal_data = signal.create_signal_data(data, i)
                                     basic_sell_signals.append(signal_data)
-                                    print(f"[DEBUG] 检测到卖出信号: {signal_data.get('signal_type', 'Unknown')}")
+                                    log.debug("检测到卖出信号: %s", signal_data.get('signal_type', 'Unknown'))
                 
                 # 检测支撑位跌破卖出信号和压力位突破买入信号（如果支撑位和压力位数据可用）
                 if self.support_level is not None and self.resistance_level is not None:
@@ -1823,10 +2259,10 @@ class IntradayWindow:
                     data['resistance_level'] = self.resistance_level
                     data['price_df'] = price_df  # 添加price_df用于5分钟价格计算
                     
-                    print(f"[DEBUG] 开始检测支撑位和压力位信号:")
-                    print(f"[DEBUG]  支撑位: {self.support_level:.3f} ({self.support_type})")
-                    print(f"[DEBUG]  压力位: {self.resistance_level:.3f} ({self.resistance_type})")
-                    print(f"[DEBUG]  位置状态: {self.position_status}")
+                    log.debug("开始检测支撑位和压力位信号:")
+                    log.debug("支撑位: %.3f (%s)", self.support_level, self.support_type)
+                    log.debug("压力位: %.3f (%s)", self.resistance_level, self.resistance_type)
+                    log.debug("位置状态: %s", self.position_status)
                     
                     # 检测支撑位跌破卖出信号
                     support_breakdown_signals = self.signal_manager.detect_support_breakdown_signals(data, price_df['close'])
@@ -1840,29 +2276,29 @@ class IntradayWindow:
                     # 合并所有买入信号（延迟验证通过后才显示）
                     self.buy_signals = basic_buy_signals + resistance_breakthrough_signals
                     
-                    print(f"[DEBUG] 支撑位跌破信号检测完成，检测到 {len(support_breakdown_signals)} 个信号")
-                    print(f"[DEBUG] 压力位突破信号检测完成，检测到 {len(resistance_breakthrough_signals)} 个信号")
+                    log.debug("支撑位跌破信号检测完成，检测到 %s 个信号", len(support_breakdown_signals))
+                    log.debug("压力位突破信号检测完成，检测到 %s 个信号", len(resistance_breakthrough_signals))
                 elif self.support_level is not None:
                     # 只有支撑位数据，检测支撑位跌破卖出信号
                     data['support_level'] = self.support_level
-                    print(f"[DEBUG] 开始检测支撑位跌破信号，支撑位: {self.support_level:.3f} ({self.support_type})")
+                    log.debug("开始检测支撑位跌破信号，支撑位: %.3f (%s)", self.support_level, self.support_type)
                     support_breakdown_signals = self.signal_manager.detect_support_breakdown_signals(data, price_df['close'])
                     self.sell_signals = basic_sell_signals + support_breakdown_signals
                     self.buy_signals = basic_buy_signals
-                    print(f"[DEBUG] 支撑位跌破信号检测完成，检测到 {len(support_breakdown_signals)} 个信号")
+                    log.debug("支撑位跌破信号检测完成，检测到 %s 个信号", len(support_breakdown_signals))
                 elif self.resistance_level is not None:
                     # 只有压力位数据，检测压力位突破买入信号
                     data['resistance_level'] = self.resistance_level
-                    print(f"[DEBUG] 开始检测压力位突破信号，压力位: {self.resistance_level:.3f} ({self.resistance_type})")
+                    log.debug("开始检测压力位突破信号，压力位: %.3f (%s)", self.resistance_level, self.resistance_type)
                     resistance_breakthrough_signals = self.signal_manager.detect_resistance_breakthrough_signals(data, price_df['close'])
                     self.buy_signals = basic_buy_signals + resistance_breakthrough_signals
                     self.sell_signals = basic_sell_signals
-                    print(f"[DEBUG] 压力位突破信号检测完成，检测到 {len(resistance_breakthrough_signals)} 个信号")
+                    log.debug("压力位突破信号检测完成，检测到 %s 个信号", len(resistance_breakthrough_signals))
                 else:
                     # 如果没有支撑位和压力位数据，只使用基本信号
                     self.sell_signals = basic_sell_signals
                     self.buy_signals = basic_buy_signals
-                    print(f"[DEBUG] 支撑位和压力位数据不可用，仅使用基本信号")
+                    log.debug("支撑位和压力位数据不可用，仅使用基本信号")
                 
                 # 通知连跌信号买入信号已出现
                 self._notify_plunge_signals_buy_signal_appeared()
@@ -1876,21 +2312,21 @@ class IntradayWindow:
                 if self.sell_signals:
                     self.sell_signals = self.signal_manager.validate_wait_confirm_signals(data, self.sell_signals)
                 
-                print(f"[DEBUG] 最终信号检测完成:")
-                print(f"[DEBUG] - 买入信号数量: {len(self.buy_signals) if self.buy_signals else 0}")
-                print(f"[DEBUG] - 卖出信号数量: {len(self.sell_signals) if self.sell_signals else 0}")
+                log.debug("最终信号检测完成:")
+                log.debug("- 买入信号数量: %s", len(self.buy_signals) if self.buy_signals else 0)
+                log.debug("- 卖出信号数量: %s", len(self.sell_signals) if self.sell_signals else 0)
                 
                 # 检查连涨信号
                 if self.buy_signals:
                     consecutive_signals = [sig for sig in self.buy_signals if '连涨' in sig.get('signal_type', '')]
-                    print(f"[DEBUG] - 连涨信号数量: {len(consecutive_signals)}")
+                    log.debug("- 连涨信号数量: %s", len(consecutive_signals))
                     for i, sig in enumerate(consecutive_signals):
-                        print(f"[DEBUG] - 连涨信号{i+1}: 索引={sig['index']}, 价格={sig['price']:.3f}, is_fake={sig['is_fake']}, wait_validate={sig['wait_validate']}")
+                        log.debug("- 连涨信号%s: 索引=%s, 价格=%.3f, is_fake=%s, wait_validate=%s", i + 1, sig['index'], sig['price'], sig['is_fake'], sig['wait_validate'])
                 
                 # 播放音频通知（仅在实时信号时）
                 self._play_signal_audio_notifications()
             except Exception as e:
-                print(f"计算移动平均线失败: {e}")
+                log.exception("计算移动平均线失败: %s", e)
                 self.ma25_values = None
                 self.ma50_values = None
                 self.buy_signals = []  # 设置为空列表而不是None
@@ -1911,193 +2347,25 @@ class IntradayWindow:
             if self.ma5_price is None or self.ma10_price is None or self.ma20_price is None:
                 self.ma5_price, self.ma10_price, self.ma20_price = self._get_ma_prices()
 
-            # 新增：计算支撑位和压力位（确保第一次加载时就能显示）
-            if not self._support_resistance_calculated:
-                try:
-                    print("[DEBUG] 在_update_data方法中计算支撑位和压力位")
-                    self._calculate_support_resistance()
-                except Exception as e:
-                    print(f"[DEBUG] 在_update_data方法中计算支撑位和压力位失败: {e}")
-            
-            # 计算看涨线（上个交易日布林带最高点）
-            if not self._bullish_line_calculated:
-                try:
-                    print("[DEBUG] 在_update_data方法中计算看涨线")
-                    self._calculate_bullish_line()
-                except Exception as e:
-                    print(f"[DEBUG] 在_update_data方法中计算看涨线失败: {e}")
-            
-            # 计算看跌线（上个交易日布林带最低点）
-            if not self._bearish_line_calculated:
-                try:
-                    print("[DEBUG] 在_update_data方法中计算看跌线")
-                    self._calculate_bearish_line()
-                except Exception as e:
-                    print(f"[DEBUG] 在_update_data方法中计算看跌线失败: {e}")
-
-            # 计算5分钟K线突破和跌破布林带次数
-            # 在实时更新时重新计算，确保文字框显示最新数据
-            try:
-                print("[DEBUG] 在_update_data方法中计算突破跌破次数")
-                # 重置计算标志，允许重新计算
-                self._breakthrough_breakdown_calculated = False
-                self._calculate_breakthrough_breakdown_count()
-            except Exception as e:
-                print(f"[DEBUG] 在_update_data方法中计算突破跌破次数失败: {e}")
+            # 以下计算相互独立（各自写入不同属性），主要耗时在网络I/O，并发执行
+            self._run_independent_calculations()
 
             # 重新加载成本数据（当股票代码更新后）
             if self.cost_df is None:
                 self._load_cached_cost()
 
             # 仅在今日才追加实时成本
-            if self.trade_date == date.today():
+            if self._is_today_cached():
                 cost_val = self._get_latest_cost()
                 if cost_val is not None:
-                    self._append_cost_cache(datetime.now().replace(second=0, microsecond=0), cost_val)
-
-            # 新增：计算前高价格（双价格）- 只使用前一个交易日的日级数据
-            if not hasattr(self, '_previous_high_calculated') or not self._previous_high_calculated:
-                try:
-                    from trading_utils import (calculate_previous_high_price,
-                                               get_previous_high_dual_prices)
-
-                    # 导入增强的峰值检测算法
-                    try:
-                        from enhanced_peak_detection import (
-                            detect_enhanced_peaks, get_enhanced_high_low)
-                        use_enhanced_detection = True
-                    except ImportError:
-                        use_enhanced_detection = False
-                        print(f"[DEBUG] 增强峰值检测模块未找到，使用原有算法")
-                    
-                    print(f"[DEBUG] 分时窗口 - 开始计算前高双价格: {self.code}")
-                    
-                    # 分时窗口只使用前一个交易日的日级前高前低数据
-                    # 不检测当日分时数据中的临时高点/低点
-                    print(f"[DEBUG] 分时窗口 - 只使用前一个交易日的日级前高前低数据")
-                    
-                    # 计算前高双价格（历史数据）
-                    security_type, symbol = self._get_security_type(self.code)
-                    
-                    dual_prices = get_previous_high_dual_prices(
-                        symbol=symbol,
-                        current_date=self.trade_date_str,
-                        months_back=12,  # 改为1年（12个月）
-                        security_type=security_type
-                    )
-                    
-                    if "error" not in dual_prices:
-                        self.previous_high_dual_prices = dual_prices
-                        self.previous_high_price = dual_prices['shadow_high_price']  # 保持兼容性
-                        
-                        print(f"[DEBUG] 分时窗口 - 前高双价格:")
-                        print(f"[DEBUG]   当前价格: {dual_prices['current_price']:.3f}")
-                        print(f"[DEBUG]   上影线最高价: {dual_prices['shadow_high_price']:.3f}")
-                        print(f"[DEBUG]   实体最高价: {dual_prices['entity_high_price']:.3f}")
-                        
-                        if dual_prices['resistance_band']:
-                            band = dual_prices['resistance_band']
-                            print(f"[DEBUG]   阻力带: {band['lower']:.3f} - {band['upper']:.3f}")
-                            print(f"[DEBUG]   阻力带日期: {band['date']}")
-                            
-                            # 计算阻力带宽度
-                            band_width = band['upper'] - band['lower']
-                            band_width_pct = (band_width / band['lower']) * 100
-                            print(f"[DEBUG]   阻力带宽度: {band_width:.3f} ({band_width_pct:.2f}%)")
-                    else:
-                        print(f"[DEBUG] 分时窗口 - 前高双价格计算失败: {dual_prices['error']}")
-                        self.previous_high_dual_prices = None
-                        self.previous_high_price = None
-                    
-                    self._previous_high_calculated = True
-                    
-                except Exception as e:
-                    print(f"[DEBUG] 分时窗口 - 计算前高双价格失败: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    self.previous_high_dual_prices = None
-                    self.previous_high_price = None
-                    self._previous_high_calculated = True
-
-            # 新增：计算前低价格（双价格）- 只使用前一个交易日的日级数据
-            if not hasattr(self, '_previous_low_calculated') or not self._previous_low_calculated:
-                try:
-                    from trading_utils import get_previous_low_dual_prices
-                    
-                    print(f"[DEBUG] 分时窗口 - 开始计算前低双价格: {self.code}")
-                    
-                    # 计算前低双价格
-                    security_type, symbol = self._get_security_type(self.code)
-                    
-                    dual_prices = get_previous_low_dual_prices(
-                        symbol=symbol,
-                        current_date=self.trade_date_str,
-                        months_back=12,  # 1年（12个月）
-                        security_type=security_type
-                    )
-                    
-                    if "error" not in dual_prices:
-                        # 获取上个交易日收盘价进行验证
-                        prev_close = self._get_previous_close()
-                        
-                        # 验证前低不能高于上个交易日收盘价
-                        entity_low_price = dual_prices['entity_low_price']
-                        shadow_low_price = dual_prices['shadow_low_price']
-                        
-                        if prev_close is not None:
-                            if entity_low_price > prev_close:
-                                print(f"[WARNING] 前低实体最低价({entity_low_price:.3f})高于上个交易日收盘价({prev_close:.3f})，跳过前低计算")
-                                self.previous_low_dual_prices = None
-                                self.previous_low_price = None
-                            elif shadow_low_price > prev_close:
-                                print(f"[WARNING] 前低下影线最低价({shadow_low_price:.3f})高于上个交易日收盘价({prev_close:.3f})，跳过前低计算")
-                                self.previous_low_dual_prices = None
-                                self.previous_low_price = None
-                            else:
-                                # 前低验证通过，保存数据
-                                self.previous_low_dual_prices = dual_prices
-                                self.previous_low_price = dual_prices['shadow_low_price']  # 保持兼容性
-                                
-                                print(f"[DEBUG] 分时窗口 - 前低双价格验证通过:")
-                                print(f"[DEBUG]   上个交易日收盘价: {prev_close:.3f}")
-                                print(f"[DEBUG]   当前价格: {dual_prices['current_price']:.3f}")
-                                print(f"[DEBUG]   下影线最低价: {dual_prices['shadow_low_price']:.3f}")
-                                print(f"[DEBUG]   实体最低价: {dual_prices['entity_low_price']:.3f}")
-                                
-                                if dual_prices['support_band']:
-                                    band = dual_prices['support_band']
-                                    print(f"[DEBUG]   支撑带: {band['lower']:.3f} - {band['upper']:.3f}")
-                                    print(f"[DEBUG]   支撑带日期: {band['date']}")
-                                    
-                                    # 计算支撑带宽度
-                                    band_width = band['upper'] - band['lower']
-                                    band_width_pct = (band_width / band['lower']) * 100
-                                    print(f"[DEBUG]   支撑带宽度: {band_width:.3f} ({band_width_pct:.2f}%)")
-                        else:
-                            print(f"[WARNING] 无法获取上个交易日收盘价，跳过前低验证")
-                            # 无法验证时，仍然保存数据但给出警告
-                            self.previous_low_dual_prices = dual_prices
-                            self.previous_low_price = dual_prices['shadow_low_price']
-                            
-                            print(f"[DEBUG] 分时窗口 - 前低双价格（未验证）:")
-                            print(f"[DEBUG]   当前价格: {dual_prices['current_price']:.3f}")
-                            print(f"[DEBUG]   下影线最低价: {dual_prices['shadow_low_price']:.3f}")
-                            print(f"[DEBUG]   实体最低价: {dual_prices['entity_low_price']:.3f}")
-                    else:
-                        print(f"[DEBUG] 分时窗口 - 前低双价格计算失败: {dual_prices['error']}")
-                        self.previous_low_dual_prices = None
-                        self.previous_low_price = None
-                    
-                    self._previous_low_calculated = True
-                    
-                except Exception as e:
-                    print(f"[DEBUG] 分时窗口 - 计算前低双价格失败: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    self.previous_low_dual_prices = None
-                    self.previous_low_price = None
-                    self._previous_low_calculated = True
+                    # 按纪元秒整数向下取整到分钟，fromtimestamp 与 datetime.now() 一样返回本地无时区时间
+                    minute_ts = datetime.fromtimestamp((int(time_module.time()) // 60) * 60)
+                    self._append_cost_cache(minute_ts, cost_val)
 
+            if self._is_stale_load(generation):
+                log.debug("加载期间已切换代码或交易日，不再重绘")
+                return
+            
             # 更新缓存时间戳
             self._update_cache_timestamp()
             
@@ -2108,110 +2376,196 @@ class IntradayWindow:
             self._initialization_complete = True
 
         except Exception as e:
-            print(f"[IntradayWindow] 更新数据失败: {e}")
+            log.exception("更新数据失败: %s", e)
             # 即使出错也要标记初始化完成
             self._initialization_complete = True
 
+    def _run_independent_calculations(self):
+        """并发计算支撑压力位、看涨/看跌线、突破跌破次数和前高/前低双价格
+        
+        各计算写入互不相同的属性并各自维护计算标记，耗时取决于最慢的一项而非总和。
+        """
+        tasks = []
+        if not self._support_resistance_calculated:
+            tasks.append(("支撑位和压力位", self._calculate_support_resistance))
+        if not self._bullish_line_calculated:
+            tasks.append(("看涨线", self._calculate_bullish_line))
+        if not self._bearish_line_calculated:
+            tasks.append(("看跌线", self._calculate_bearish_line))
+        # 在实时更新时重新计算突破跌破次数，确保文字框显示最新数据
+        self._breakthrough_breakdown_calculated = False
+        tasks.append(("突破跌破次数", self._calculate_breakthrough_breakdown_count))
+        if not self._previous_high_calculated:
+            tasks.append(("前高双价格", lambda: self._compute_prev_extreme('high')))
+        if not self._previous_low_calculated:
+            tasks.append(("前低双价格", lambda: self._compute_prev_extreme('low')))
+        
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = {executor.submit(func): label for label, func in tasks}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    log.debug("在_update_data方法中计算%s失败: %s", futures[future], e)
+
+    def _compute_prev_extreme(self, side: str):
+        """计算前高/前低双价格（只使用前一个交易日的日级数据）
+        
+        分时窗口不检测当日分时数据中的临时高点/低点。已计算过的(代码, 交易日)直接从历史指标缓存读取。
+        
+        :param side: 'high' 计算前高阻力带；'low' 计算前低支撑带，并用上个交易日收盘价校验
+        """
+        if getattr(self, f'_previous_{side}_calculated'):
+            return
+        
+        is_high = side == 'high'
+        label = '前高' if is_high else '前低'
+        cache_type = f'previous_{side}'
+        cache_key = self._check_cache_key_change()
+        cached = self._get_cached_data(cache_type, cache_key)
+        if cached is not None:
+            log.debug("从缓存获取%s价格: %s", label, cached)
+            setattr(self, f'previous_{side}_price', cached.get('price'))
+            setattr(self, f'previous_{side}_dual_prices', cached.get('dual_prices'))
+            setattr(self, f'_previous_{side}_calculated', True)
+            return
+        
+        dual_prices = None
+        try:
+            if is_high and not _HAS_ENHANCED_PEAKS:
+                log.debug("增强峰值检测模块未找到，使用原有算法")
+            log.debug("分时窗口 - 开始计算%s双价格: %s", label, self.code)
+
+            security_type, symbol = self._sec()
+            get_dual_prices = get_previous_high_dual_prices if is_high else get_previous_low_dual_prices
+            result = get_dual_prices(
+                symbol=symbol,
+                current_date=self.trade_date_str,
+                months_back=12,  # 1年（12个月）
+                security_type=security_type
+            )
+
+            if result.error is not None:
+                log.debug("分时窗口 - %s双价格计算失败: %s", label, result.error)
+            elif is_high:
+                dual_prices = result
+                self._log_dual_prices(label, result.current_price, result.shadow_high_price,
+                                      result.entity_high_price, result.resistance_band)
+            else:
+                dual_prices = self._validate_prev_low(result)
+        except Exception as e:
+            log.exception("分时窗口 - 计算%s双价格失败: %s", label, e)
+            dual_prices = None
+
+        setattr(self, f'previous_{side}_dual_prices', dual_prices)
+        # 单一前高/前低价格取影线极值，保持兼容性
+        if dual_prices is None:
+            shadow_price = None
+        elif is_high:
+            shadow_price = dual_prices.shadow_high_price
+        else:
+            shadow_price = dual_prices.shadow_low_price
+        setattr(self, f'previous_{side}_price', shadow_price)
+        if shadow_price is not None:
+            self._set_cached_data(cache_type, {'price': shadow_price, 'dual_prices': dual_prices}, cache_key)
+        setattr(self, f'_previous_{side}_calculated', True)
+
+    def _validate_prev_low(self, dual_prices: PreviousLowDualPrices) -> Optional[PreviousLowDualPrices]:
+        """前低不能高于上个交易日收盘价；无法获取收盘价时保留数据但给出警告"""
+        prev_close = self._get_previous_close()
+        if prev_close is None:
+            log.warning("无法获取上个交易日收盘价，跳过前低验证")
+        elif dual_prices.entity_low_price > prev_close:
+            log.warning("前低实体最低价(%.3f)高于上个交易日收盘价(%.3f)，跳过前低计算", dual_prices.entity_low_price, prev_close)
+            return None
+        elif dual_prices.shadow_low_price > prev_close:
+            log.warning("前低下影线最低价(%.3f)高于上个交易日收盘价(%.3f)，跳过前低计算", dual_prices.shadow_low_price, prev_close)
+            return None
+        else:
+            log.debug("上个交易日收盘价: %.3f，前低验证通过", prev_close)
+        self._log_dual_prices('前低', dual_prices.current_price, dual_prices.shadow_low_price,
+                              dual_prices.entity_low_price, dual_prices.support_band)
+        return dual_prices
+
+    @staticmethod
+    def _log_dual_prices(label: str, current_price: float, shadow_price: float,
+                         entity_price: float, band: Optional[PriceBand]):
+        """输出前高/前低双价格及价格带的调试信息"""
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+        band_name = '阻力带' if label == '前高' else '支撑带'
+        log.debug("分时窗口 - %s双价格: 当前价格 %.3f, 影线价 %.3f, 实体价 %.3f",
+                  label, current_price, shadow_price, entity_price)
+        if band:
+            band_width = band.upper - band.lower
+            log.debug("%s: %.3f - %.3f (日期 %s, 宽度 %.3f, %.2f%%)", band_name, band.lower, band.upper,
+                      band.date, band_width, band_width / band.lower * 100)
+
     def _get_latest_cost(self) -> Optional[float]:
         try:
-            cyq_df = ak.stock_cyq_em(symbol=self.code, adjust="qfq")
-            if cyq_df.empty or "平均成本" not in cyq_df.columns:
+            cyq_df = _fetch_cyq(self.code)
+            if "平均成本" not in cyq_df.columns:
                 return None
-            cost_val = float(cyq_df.iloc[-1]["平均成本"])
-            return cost_val
+            # 按列取ndarray后按位置取最后一个值，避免构造中间行Series
+            cost_col = cyq_df["平均成本"].to_numpy()
+            return float(cost_col[-1]) if cost_col.size else None
         except Exception as e:
-            print(f"获取平均成本失败: {e}")
+            log.warning("获取平均成本失败: %s", e)
             return None
 
+    def _cached_prev_close(self, symbol: str, trade_date_str: str, security_type: str) -> Optional[float]:
+        """获取前一交易日收盘价（按(证券代码, 交易日, 证券类型)缓存，获取失败不缓存）"""
+        key = (symbol, trade_date_str, security_type)
+        prev_close = self._prev_close_cache.get(key)
+        if prev_close is not None:
+            log.debug("从缓存获取前一交易日收盘价: %s %s", key, prev_close)
+            return prev_close
+        
+        prev_close = get_previous_close(
+            symbol=symbol,
+            trade_date=trade_date_str,
+            security_type=security_type
+        )
+        if prev_close is not None:
+            self._prev_close_cache[key] = prev_close
+            log.debug("前一交易日收盘价已缓存: %s %s", key, prev_close)
+        return prev_close
+
     def _get_previous_close(self) -> Optional[float]:
         """获取前一交易日的收盘价（带缓存优化）"""
         try:
-            # 检查缓存键是否变化
-            self._check_cache_key_change()
-            
-            # 尝试从统一缓存获取
-            cached_prev_close = self._get_cached_data('previous_close')
-            if cached_prev_close is not None:
-                print(f"[DEBUG] 从缓存获取前一交易日收盘价: {cached_prev_close}")
-                return cached_prev_close
-            
-            # 检查旧缓存是否有效
-            if (self._cached_previous_close is not None and 
-                self._cached_previous_close_date == self.trade_date_str):
-                print(f"[DEBUG] 从旧缓存获取前一交易日收盘价: {self._cached_previous_close}")
-                return self._cached_previous_close
-            
-            from trading_utils import get_previous_close
-
             # 获取证券类型和对应的数据接口代码
-            security_type, symbol = self._get_security_type(self.code)
-
-            # 调用trading_utils中的通用函数
-            prev_close = get_previous_close(
-                symbol=symbol,
-                trade_date=self.trade_date_str,
-                security_type=security_type
-            )
-            
-            # 缓存结果到统一缓存
-            if prev_close is not None:
-                self._set_cached_data('previous_close', prev_close)
-                print(f"[DEBUG] 前一交易日收盘价已缓存: {prev_close}")
-            
-            # 保持旧缓存兼容性
-            self._cached_previous_close = prev_close
-            self._cached_previous_close_date = self.trade_date_str
-            
-            return prev_close
+            security_type, symbol = self._sec()
+            return self._cached_prev_close(symbol, self.trade_date_str, security_type)
                 
         except Exception as e:
-            print(f"获取前一交易日收盘价失败: {e}")
+            log.warning("获取前一交易日收盘价失败: %s", e)
             return None
     
     def _get_previous_close_for_volume_colors(self) -> Optional[float]:
         """获取相对于当前显示日期的前一交易日收盘价，用于成交量颜色判断"""
         try:
-            from trading_utils import get_previous_close
-
             # 获取证券类型和对应的数据接口代码
-            security_type, symbol = self._get_security_type(self.code)
-
-            print(f"[DEBUG] 成交量颜色判断 - 调用get_previous_close: 证券={symbol}, 类型={security_type}, 交易日={self.trade_date_str}")
-            
-            # 调用trading_utils中的通用函数，使用当前显示的交易日
-            prev_close = get_previous_close(
-                symbol=symbol,
-                trade_date=self.trade_date_str,
-                security_type=security_type
-            )
+            security_type, symbol = self._sec()
             
-            print(f"[DEBUG] 成交量颜色判断 - get_previous_close返回: {prev_close}")
+            # 使用当前显示的交易日（与_get_previous_close共享缓存）
+            prev_close = self._cached_prev_close(symbol, self.trade_date_str, security_type)
+            log.debug("成交量颜色判断 - 前一交易日收盘价: %s", prev_close)
             return prev_close
                 
         except Exception as e:
-            print(f"获取前一交易日收盘价失败(成交量颜色): {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("获取前一交易日收盘价失败(成交量颜色): %s", e)
             return None
     
     def _get_previous_close_for_prev_day(self) -> Optional[float]:
         """获取前两个交易日收盘价（用于计算上一个交易日的RSI）"""
         try:
-            from datetime import timedelta
-
-            from trading_utils import get_previous_close
-
-            # 计算前两个交易日
-            prev_prev_date = self.trade_date - timedelta(days=2)
-            # 跳过周末
-            while prev_prev_date.weekday() >= 5:  # 5=Saturday, 6=Sunday
-                prev_prev_date -= timedelta(days=1)
-            
-            prev_prev_date_str = prev_prev_date.strftime('%Y-%m-%d')
-            security_type, symbol = self._get_security_type(self.code)
-            return get_previous_close(symbol, prev_prev_date_str, security_type)
+            # 上一个交易日的前收盘价即前两个交易日收盘价（按交易日历跳过周末和节假日）
+            prev_date_str = self._prev_trade_date_str()
+            security_type, symbol = self._sec()
+            return self._cached_prev_close(symbol, prev_date_str, security_type)
         except Exception as e:
-            print(f"获取前两个交易日收盘价失败: {e}")
+            log.exception("获取前两个交易日收盘价失败: %s", e)
             return None
     
     def _interpolate_5min_rsi_to_1min(self, rsi_5min: pd.Series, target_index: pd.Index, for_display_only: bool = True) -> pd.Series:
@@ -2225,16 +2579,13 @@ class IntradayWindow:
         try:
             if for_display_only:
                 # 仅用于显示：使用线性插值实现平滑过渡
-                rsi_1min = rsi_5min.reindex(target_index)
-                rsi_1min_interpolated = rsi_1min.interpolate(method='linear')
-                rsi_1min_interpolated = rsi_1min_interpolated.ffill().bfill()
-                return rsi_1min_interpolated
+                return self._linear_interp_to_index(rsi_5min, target_index)
             else:
                 # 用于信号计算：使用前向填充保持数学准确性
                 return rsi_5min.reindex(target_index, method='ffill')
             
         except Exception as e:
-            print(f"5分钟RSI插值失败: {e}")
+            log.exception("5分钟RSI插值失败: %s", e)
             # 降级到前向填充
             return rsi_5min.reindex(target_index, method='ffill')
 
@@ -2248,20 +2599,162 @@ class IntradayWindow:
         """
         try:
             if data_5min.empty:
-                return pd.Series(index=target_index, dtype=float)
+                return pd.Series(index=target_index, dtype=np.float64)
             
             # 使用线性插值实现平滑过渡，避免锯齿形效果
-            interpolated = data_5min.reindex(target_index)
-            interpolated = interpolated.interpolate(method='linear')
-            # 对首尾缺失值进行前向和后向填充
-            interpolated = interpolated.ffill().bfill()
-            return interpolated
+            return self._linear_interp_to_index(data_5min, target_index)
             
         except Exception as e:
-            print(f"5分钟数据插值失败: {e}")
+            log.exception("5分钟数据插值失败: %s", e)
             # 降级到前向填充
             return data_5min.reindex(target_index, method='ffill')
 
+    @staticmethod
+    def _linear_interp_to_index(series: pd.Series, target_index: pd.Index) -> pd.Series:
+        """按时间线性插值到目标时间轴（单次np.interp，首尾自动按端点值延伸）
+        
+        插值结果会用于布林带突破/跌破判断、信号检测和比值计算，保持float64精度；
+        仅用于显示的副本由调用方自行降精度。
+        
+        :param series: 源数据（DatetimeIndex）
+        :param target_index: 目标时间索引
+        :return: 插值后的数据（float64）
+        """
+        src = series.dropna()
+        if src.empty:
+            return pd.Series(np.nan, index=target_index, dtype=np.float64)
+        if not src.index.is_monotonic_increasing:
+            src = src.sort_index()
+        xp = pd.DatetimeIndex(src.index).asi8.astype(np.float64)
+        fp = src.to_numpy(dtype=np.float64)
+        x = pd.DatetimeIndex(target_index).asi8.astype(np.float64)
+        return pd.Series(np.interp(x, xp, fp), index=target_index)
+
+    def _prev_bands(self) -> tuple[Optional[tuple[float, float]], Optional[tuple[float, float]]]:
+        """前高阻力带与前低支撑带的(下沿, 上沿)
+        
+        价格带只在重新计算前高/前低双价格时变化，按双价格对象缓存展开后的元组，
+        重绘时无需逐次访问价格带字段。
+        """
+        high = self.previous_high_dual_prices
+        low = self.previous_low_dual_prices
+        cached = self._prev_bands_cache
+        if cached is None or cached[0] is not high or cached[1] is not low:
+            high_band = high.resistance_band if high is not None else None
+            low_band = low.support_band if low is not None else None
+            cached = (high, low,
+                      (high_band.lower, high_band.upper) if high_band else None,
+                      (low_band.lower, low_band.upper) if low_band else None)
+            self._prev_bands_cache = cached
+        return cached[2], cached[3]
+
+    def _extend_price_range(self, prev_close: float, base_down_price: float, base_up_price: float,
+                            current_cost: Optional[float]) -> tuple[float, float]:
+        """按关键价位扩展显示价格区间
+        
+        支撑位和压力位使用5%范围；平均成本和前高/前低价格带使用10%范围，
+        平均成本只有偏离当前区间超过2%时才参与扩展，避免频繁切换。
+        所有候选价位一次取最小/最大值，超出区间时扩展并留出0.5%的缓冲。
+        
+        :param current_cost: 当前平均成本，None表示无成本数据
+        :return: 扩展后的(下限价格, 上限价格)
+        """
+        nan = np.nan
+        five_point_down, five_point_up = prev_close * 0.95, prev_close * 1.05
+        ten_point_down, ten_point_up = prev_close * 0.90, prev_close * 1.10
+        
+        # 支撑位和压力位
+        levels = np.array([nan if v is None else v for v in (self.support_level, self.resistance_level)], dtype=np.float64)
+        lower = [np.where(levels >= five_point_down, levels, nan)]
+        upper = [np.where(levels <= five_point_up, levels, nan)]
+        
+        # 当前平均成本（偏离超过2%才调整）
+        if current_cost is not None:
+            if ten_point_down <= current_cost < base_down_price * 0.98:
+                lower.append([current_cost])
+            elif base_up_price * 1.02 < current_cost <= ten_point_up:
+                upper.append([current_cost])
+        
+        # 前高价格带以最低点（实体最高价）、前低价格带以最高点（实体最低价）是否在10%范围内为准，
+        # 满足时显示完整的价格带
+        high_band, low_band = self._prev_bands()
+        for band, anchor in ((high_band, 0), (low_band, 1)):
+            if band is not None and ten_point_down <= band[anchor] <= ten_point_up:
+                lower.append([band[0]])
+                upper.append([band[1]])
+        
+        with np.errstate(invalid='ignore'):
+            lowest = float(np.nanmin(np.concatenate(lower + [[base_down_price]])))
+            highest = float(np.nanmax(np.concatenate(upper + [[base_up_price]])))
+        if lowest < base_down_price:
+            base_down_price = lowest * 0.995  # 留出0.5%的缓冲
+        if highest > base_up_price:
+            base_up_price = highest * 1.005  # 留出0.5%的缓冲
+        log.debug("按关键价位扩展后的价格区间: %.3f - %.3f", base_down_price, base_up_price)
+        return base_down_price, base_up_price
+
+    def _add_level_lines(self, levels: list, down_price: Optional[float] = None,
+                         up_price: Optional[float] = None) -> List[Line2D]:
+        """将多条整宽水平参考线合并为一个LineCollection添加到主图
+        
+        x方向按轴坐标铺满（与axhline一致）。传入显示范围时忽略价格为None或不在范围内的参考线；
+        不传时表示调用方已筛选过，全部绘制。
+        
+        :param levels: [(价格, 颜色, 线型, 线宽, 透明度[, 图例标签]), ...]
+        :return: 带图例标签的可见参考线对应的图例代理线条
+        """
+        if down_price is None or up_price is None:
+            visible = levels
+        else:
+            visible = [lv for lv in levels if lv[0] is not None and down_price <= lv[0] <= up_price]
+        if not visible:
+            return []
+        self.ax_price.add_collection(LineCollection(
+            [[(0, lv[0]), (1, lv[0])] for lv in visible],
+            colors=[to_rgba(lv[1], lv[4]) for lv in visible],
+            linestyles=[lv[2] for lv in visible],
+            linewidths=[lv[3] for lv in visible],
+            zorder=2, transform=self.ax_price.get_yaxis_transform(),
+        ), autolim=False)
+        return [Line2D([], [], color=lv[1], linestyle=lv[2], linewidth=lv[3], alpha=lv[4], label=lv[5])
+                for lv in visible if len(lv) > 5]
+
+    # 百分比背景填充区域：(起始涨跌幅%, 结束涨跌幅%, 颜色)
+    _PCT_ZONES = (
+        (3, 6, "#FE9999"),     # 浅红色 3%~6% (最浅)
+        (6, 9, "#FF4C4C"),     # 深红色 6%~9% (中等)
+        (9, 30, "#FF0000"),    # 全红色 9%~10% (降低亮度)
+        (-6, -3, "#99FE99"),   # 浅绿色 -6%~-3% (最浅)
+        (-9, -6, "#4CFF4C"),   # 深绿色 -9%~-6% (中等)
+        (-30, -9, "#00CC00"),  # 全绿色 -10%~-9% (降低亮度)
+    )
+
+    def _pct_zone_collection(self, prev_close: float, down_price: float, up_price: float) -> PolyCollection:
+        """构造百分比背景填充区域的PolyCollection
+        
+        区域边界只取决于前收盘价，按前收盘价缓存；每次重绘坐标轴被清空，
+        按当前Y轴范围裁剪后只为可见（高度大于0）的区域新建一个集合对象。
+        """
+        cached = self._pct_zone_cache
+        if cached is None or cached[0] != prev_close:
+            # 所有区域的上下边界一次向量化计算
+            pct = np.array([(low_pct, high_pct) for low_pct, high_pct, _ in self._PCT_ZONES], dtype=np.float64)
+            edges = prev_close * (1 + pct / 100)
+            colors = np.array([color for _, _, color in self._PCT_ZONES])
+            cached = (prev_close, edges, colors)
+            self._pct_zone_cache = cached
+        _, edges, colors = cached
+        lo = np.maximum(edges[:, 0], down_price)
+        hi = np.minimum(edges[:, 1], up_price)
+        mask = hi > lo
+        # 顶点数组形状为(可见区域数, 4, 2)，x方向按轴坐标铺满
+        verts = np.empty((int(mask.sum()), 4, 2))
+        verts[:, :, 0] = (0, 1, 1, 0)
+        verts[:, :2, 1] = lo[mask, np.newaxis]
+        verts[:, 2:, 1] = hi[mask, np.newaxis]
+        return PolyCollection(verts, facecolors=colors[mask], edgecolors='none', alpha=0.2,
+                              zorder=0, transform=self.ax_price.get_yaxis_transform())
+
     def _merge_price_range(self, new_down_price: float, new_up_price: float) -> tuple[float, float]:
         """合并价格范围，确保新范围只能扩展不能缩小
         
@@ -2269,53 +2762,53 @@ class IntradayWindow:
         :param new_up_price: 新计算的上限价格
         :return: 合并后的(下限价格, 上限价格)
         """
-        try:
-            # 如果没有历史记录，直接使用新范围
-            if not self._price_range_initialized or self._price_range_history is None:
-                self._price_range_history = {
-                    'down_price': new_down_price,
-                    'up_price': new_up_price
-                }
-                self._price_range_initialized = True
-                print(f"[DEBUG] 价格范围初始化: {new_down_price:.3f} - {new_up_price:.3f}")
-                return new_down_price, new_up_price
-            
-            # 获取历史范围
-            hist_down = self._price_range_history['down_price']
-            hist_up = self._price_range_history['up_price']
-            
-            # 合并范围：只能扩展，不能缩小
-            merged_down = min(hist_down, new_down_price)  # 取更小的下限
-            merged_up = max(hist_up, new_up_price)        # 取更大的上限
-            
-            # 更新历史记录
-            self._price_range_history = {
-                'down_price': merged_down,
-                'up_price': merged_up
-            }
-            
-            # 检查是否有变化
-            if merged_down != hist_down or merged_up != hist_up:
-                print(f"[DEBUG] 价格范围扩展:")
-                print(f"[DEBUG]   历史范围: {hist_down:.3f} - {hist_up:.3f}")
-                print(f"[DEBUG]   新计算范围: {new_down_price:.3f} - {new_up_price:.3f}")
-                print(f"[DEBUG]   合并后范围: {merged_down:.3f} - {merged_up:.3f}")
-            else:
-                print(f"[DEBUG] 价格范围保持不变: {merged_down:.3f} - {merged_up:.3f}")
-            
-            return merged_down, merged_up
-            
-        except Exception as e:
-            print(f"价格范围合并失败: {e}")
-            import traceback
-            traceback.print_exc()
+        # 如果没有历史记录，直接使用新范围
+        if self._pr_down is None or self._pr_up is None:
+            self._pr_down, self._pr_up = new_down_price, new_up_price
+            log.debug("价格范围初始化: %.3f - %.3f", new_down_price, new_up_price)
             return new_down_price, new_up_price
+        
+        # 合并范围：只能扩展，不能缩小
+        merged_down = new_down_price if new_down_price < self._pr_down else self._pr_down
+        merged_up = new_up_price if new_up_price > self._pr_up else self._pr_up
+        
+        # 仅在范围变化时更新
+        if merged_down != self._pr_down or merged_up != self._pr_up:
+            log.debug("价格范围扩展: %.3f - %.3f -> %.3f - %.3f", self._pr_down, self._pr_up, merged_down, merged_up)
+            self._pr_down, self._pr_up = merged_down, merged_up
+        
+        return merged_down, merged_up
 
     def _reset_price_range_history(self):
         """重置价格范围历史记录（在切换股票或交易日时调用）"""
-        self._price_range_history = None
-        self._price_range_initialized = False
-        print("[DEBUG] 价格范围历史记录已重置")
+        self._pr_down = None
+        self._pr_up = None
+        log.debug("价格范围历史记录已重置")
+
+    def _resampled_prev_5min(self) -> Optional[pd.DataFrame]:
+        """获取前几个交易日的5分钟K线（open/close/high/low/volume全集）
+        
+        前几个交易日的数据在当日内不会变化，按(代码, 交易日)缓存，
+        RSI和布林带的历史数据共用同一次重采样结果。
+        """
+        key = (self.code, self.trade_date)
+        cached = self._prev_day_5min_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        multiple_prev_data = self._get_multiple_previous_trading_days_intraday()
+        if multiple_prev_data is None or multiple_prev_data.empty:
+            return None
+        
+        prev_days_5min = multiple_prev_data.resample('5T', offset='1T').agg({
+            'open': 'first',
+            'close': 'last',
+            'high': 'max',
+            'low': 'min',
+            'volume': 'sum'
+        }).dropna()
+        self._prev_day_5min_cache = (key, prev_days_5min)
+        return prev_days_5min
 
     def _get_historical_5min_data_for_rsi(self) -> Optional[pd.DataFrame]:
         """获取历史5分钟数据用于RSI计算
@@ -2326,39 +2819,22 @@ class IntradayWindow:
         :return: 历史5分钟数据DataFrame，包含open, close, volume列
         """
         try:
-            # 获取前一交易日的分时数据
-            prev_day_data = self._get_previous_trading_day_intraday()
-            
-            if prev_day_data is None or prev_day_data.empty:
-                print("[DEBUG] 无法获取前一交易日数据用于5分钟RSI计算")
-                return None
-            
-            # 转换为5分钟K线数据
-            prev_day_5min = prev_day_data.resample('5T', offset='1T').agg({
-                'open': 'first',
-                'close': 'last',
-                'volume': 'sum'
-            }).dropna()
+            # 与布林带共用前几个交易日的5分钟K线，最后几根即前一交易日尾盘
+            prev_days_5min = self._resampled_prev_5min()
             
-            if prev_day_5min.empty:
-                print("[DEBUG] 前一交易日5分钟数据为空")
+            if prev_days_5min is None or prev_days_5min.empty:
+                log.debug("无法获取前一交易日数据用于5分钟RSI计算")
                 return None
             
             # 只取最后5根5分钟K线
-            if len(prev_day_5min) >= 5:
-                historical_data = prev_day_5min.tail(5)
-                print(f"[DEBUG] 获取历史5分钟数据用于RSI计算，数据长度: {len(historical_data)}")
-                print(f"[DEBUG] 历史5分钟数据时间范围: {historical_data.index[0]} 到 {historical_data.index[-1]}")
-                print(f"[DEBUG] 历史5分钟收盘价: {historical_data['close'].tolist()}")
-                return historical_data
-            else:
-                print(f"[DEBUG] 前一交易日5分钟数据不足5根，实际长度: {len(prev_day_5min)}")
-                return prev_day_5min
+            historical_data = prev_days_5min.tail(5)[['open', 'close', 'volume']]
+            log.debug("获取历史5分钟数据用于RSI计算，数据长度: %s", len(historical_data))
+            log.debug("历史5分钟数据时间范围: %s 到 %s", historical_data.index[0], historical_data.index[-1])
+            log.debug("历史5分钟收盘价: %s", historical_data['close'].tolist())
+            return historical_data
                 
         except Exception as e:
-            print(f"获取历史5分钟数据失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("获取历史5分钟数据失败: %s", e)
             return None
 
     def _get_historical_5min_data_for_bollinger(self) -> Optional[pd.DataFrame]:
@@ -2370,68 +2846,34 @@ class IntradayWindow:
         :return: 历史5分钟数据DataFrame，包含open, close, high, low, volume列
         """
         try:
-            # 获取多个前一交易日的分时数据
-            multiple_prev_data = self._get_multiple_previous_trading_days_intraday()
-            
-            if multiple_prev_data is None or multiple_prev_data.empty:
-                print("[DEBUG] 无法获取多个前一交易日数据用于5分钟布林带计算")
-                return None
+            prev_days_5min = self._resampled_prev_5min()
             
-            # 转换为5分钟K线数据
-            prev_days_5min = multiple_prev_data.resample('5T', offset='1T').agg({
-                'open': 'first',
-                'close': 'last',
-                'high': 'max',
-                'low': 'min',
-                'volume': 'sum'
-            }).dropna()
-            
-            if prev_days_5min.empty:
-                print("[DEBUG] 多个前一交易日5分钟数据为空")
+            if prev_days_5min is None or prev_days_5min.empty:
+                log.debug("无法获取多个前一交易日数据用于5分钟布林带计算")
                 return None
             
-            print(f"[DEBUG] 获取历史5分钟数据用于布林带计算，数据长度: {len(prev_days_5min)}")
-            print(f"[DEBUG] 历史5分钟数据时间范围: {prev_days_5min.index[0]} 到 {prev_days_5min.index[-1]}")
+            log.debug("获取历史5分钟数据用于布林带计算，数据长度: %s", len(prev_days_5min))
+            log.debug("历史5分钟数据时间范围: %s 到 %s", prev_days_5min.index[0], prev_days_5min.index[-1])
             return prev_days_5min
                 
         except Exception as e:
-            print(f"获取历史5分钟数据用于布林带计算失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("获取历史5分钟数据用于布林带计算失败: %s", e)
             return None
 
     def _get_previous_trading_day_intraday(self) -> Optional[pd.DataFrame]:
         """获取前一交易日的分时数据，用于MA指标计算的连续性"""
         try:
-            from datetime import timedelta
-
-            # 使用交易日历来获取真正的前一交易日
-            if hasattr(self, '_trade_calendar') and self._trade_calendar:
-                # 从交易日历中找到前一交易日
-                sorted_dates = sorted(list(self._trade_calendar))
-                current_idx = sorted_dates.index(self.trade_date) if self.trade_date in sorted_dates else -1
-                if current_idx > 0:
-                    prev_date = sorted_dates[current_idx - 1]
-                else:
-                    # 如果找不到当前日期或当前日期是第一个，则使用简单方法
-                    prev_date = self.trade_date - timedelta(days=1)
-                    while prev_date.weekday() >= 5:  # 5=Saturday, 6=Sunday
-                        prev_date -= timedelta(days=1)
-            else:
-                # 如果没有交易日历，使用简单方法
-                prev_date = self.trade_date - timedelta(days=1)
-                while prev_date.weekday() >= 5:  # 5=Saturday, 6=Sunday
-                    prev_date -= timedelta(days=1)
-            
-            prev_date_str = prev_date.strftime("%Y-%m-%d")
-            print(f"[DEBUG] 尝试获取前一交易日 {prev_date_str} 的分时数据")
+
+            # 按交易日历取真正的前一交易日（无日历时按工作日推算）
+            prev_date_str = self._prev_trade_date_str()
+            log.debug("尝试获取前一交易日 %s 的分时数据", prev_date_str)
             
             # 获取前一交易日的分时数据
             start_dt = f"{prev_date_str} 09:30:00"
             end_dt = f"{prev_date_str} 15:00:00"
             
             # 获取证券类型和对应的数据接口代码
-            security_type, symbol = self._get_security_type(self.code)
+            security_type, symbol = self._sec()
             
             if security_type == "INDEX":
                 # 使用指数分时数据接口
@@ -2461,11 +2903,11 @@ class IntradayWindow:
                 )
             
             if prev_intraday_df.empty:
-                print(f"[DEBUG] 前一交易日 {prev_date_str} 没有分时数据，尝试获取日线数据")
+                log.debug("前一交易日 %s 没有分时数据，尝试获取日线数据", prev_date_str)
                 # 如果分时数据为空，尝试获取日线数据
                 try:
                     # 获取证券类型和对应的数据接口代码
-                    security_type, symbol = self._get_security_type(self.code)
+                    security_type, symbol = self._sec()
                     
                     if security_type == "INDEX":
                         # 使用指数日线数据接口
@@ -2492,48 +2934,36 @@ class IntradayWindow:
                             adjust="qfq"
                         )
                     if not daily_df.empty:
-                        # 使用收盘价创建足够多的模拟分时数据点，确保能计算RSI
+                        # 使用收盘价创建单条收盘数据（常数价格无需展开成逐分钟数据，
+                        # 需要逐分钟显示时由 _get_previous_day_last_hour_data 按需展开）
                         close_price = float(daily_df.iloc[-1]["收盘"])
-                        # 创建最后1小时的模拟数据（60个1分钟数据点）
-                        prev_times = pd.date_range(f"{prev_date_str} 14:00:00", f"{prev_date_str} 15:00:00", freq='1T')
                         prev_intraday_df = pd.DataFrame({
-                            'open': [close_price] * len(prev_times),
-                            'close': [close_price] * len(prev_times),
-                            'volume': [0] * len(prev_times)
-                        }, index=prev_times)
-                        print(f"[DEBUG] 使用前一交易日收盘价 {close_price} 创建模拟分时数据，共 {len(prev_intraday_df)} 条记录")
+                            'open': [close_price],
+                            'close': [close_price],
+                            'high': [close_price],
+                            'low': [close_price],
+                            'volume': [0]
+                        }, index=pd.DatetimeIndex([pd.Timestamp(f"{prev_date_str} 15:00:00")], name="datetime"))
+                        prev_intraday_df.attrs['simulated'] = True
+                        log.debug("使用前一交易日收盘价 %s 创建模拟收盘数据", close_price)
+                        return prev_intraday_df
                     else:
-                        print(f"[DEBUG] 前一交易日 {prev_date_str} 也没有日线数据")
+                        log.debug("前一交易日 %s 也没有日线数据", prev_date_str)
                         return None
                 except Exception as e:
-                    print(f"[DEBUG] 获取前一交易日日线数据失败: {e}")
+                    log.debug("获取前一交易日日线数据失败: %s", e)
                     return None
             else:
-                print(f"[DEBUG] 成功获取前一交易日 {prev_date_str} 的分时数据，共 {len(prev_intraday_df)} 条记录")
-            
-            # 统一列名 - 包含所有必要的列
-            if '时间' in prev_intraday_df.columns:
-                prev_intraday_df.rename(columns={
-                    "时间": "datetime", 
-                    "开盘": "open", 
-                    "收盘": "close", 
-                    "最高": "high",
-                    "最低": "low",
-                    "成交量": "volume"
-                }, inplace=True)
-                prev_intraday_df["datetime"] = pd.to_datetime(prev_intraday_df["datetime"])
-                prev_intraday_df.set_index("datetime", inplace=True)
-            elif 'datetime' not in prev_intraday_df.columns:
-                # 如果已经是正确的列名，只需要设置索引
-                prev_intraday_df.set_index("datetime", inplace=True)
-            
-            print(f"[DEBUG] 前一交易日数据处理完成，最终数据长度: {len(prev_intraday_df)}")
+                log.debug("成功获取前一交易日 %s 的分时数据，共 %s 条记录", prev_date_str, len(prev_intraday_df))
+            
+            # 统一列名并设置时间索引
+            _normalize_min_df(prev_intraday_df)
+            
+            log.debug("前一交易日数据处理完成，最终数据长度: %s", len(prev_intraday_df))
             return prev_intraday_df
             
         except Exception as e:
-            print(f"[DEBUG] 获取前一交易日分时数据失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("获取前一交易日分时数据失败: %s", e)
             return None
     
     def _get_previous_day_last_hour_data(self) -> Optional[pd.DataFrame]:
@@ -2544,122 +2974,144 @@ class IntradayWindow:
             if prev_day_data is None or prev_day_data.empty:
                 return None
             
-            # 筛选最后1小时的数据（14:00-15:00）
-            last_hour_data = prev_day_data.between_time('14:00', '15:00')
+            # 模拟的单条收盘数据：按需展开为最后1小时的逐分钟数据用于显示
+            if prev_day_data.attrs.get('simulated'):
+                close_ts = prev_day_data.index[-1]
+                minute_index = pd.date_range(close_ts - pd.Timedelta(hours=1), close_ts, freq='1min', name="datetime")
+                return prev_day_data.reindex(minute_index, method='bfill')
+            
+            # 筛选最后1小时的数据（14:00-15:00，含15:00收盘）
+            idx = prev_day_data.index
+            mask = (idx.hour == 14) | ((idx.hour == 15) & (idx.minute == 0))
+            last_hour_data = prev_day_data[mask]
             
             if last_hour_data.empty:
-                print(f"[DEBUG] 上一个交易日最后1小时没有数据")
+                log.debug("上一个交易日最后1小时没有数据")
                 return None
             
-            print(f"[DEBUG] 获取到上一个交易日最后1小时数据，共 {len(last_hour_data)} 条记录")
+            log.debug("获取到上一个交易日最后1小时数据，共 %s 条记录", len(last_hour_data))
             return last_hour_data
             
         except Exception as e:
-            print(f"[DEBUG] 获取上一个交易日最后1小时数据失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("获取上一个交易日最后1小时数据失败: %s", e)
             return None
     
     def _get_multiple_previous_trading_days_intraday(self) -> Optional[pd.DataFrame]:
         """获取多个前一交易日的分时数据，确保有足够的历史数据计算MA指标"""
         try:
-            from datetime import timedelta
             
-            all_prev_data = []
             current_date = self.trade_date
             
-            # 获取前3个交易日的数据，确保有足够的历史数据
-            for i in range(1, 4):  # 获取前1-3个交易日
-                if hasattr(self, '_trade_calendar') and self._trade_calendar:
-                    # 从交易日历中找到前i个交易日
-                    sorted_dates = sorted(list(self._trade_calendar))
-                    current_idx = sorted_dates.index(current_date) if current_date in sorted_dates else -1
+            # 先在主线程中确定前1-3个交易日日期（交易日历只排序一次）
+            prev_dates = []
+            if self._trade_calendar:
+                sorted_dates = self._sorted_calendar()
+                current_idx = self._calendar_index(current_date)
+                for i in range(1, self.PREV_INTRADAY_DAYS + 1):
                     if current_idx >= i:
-                        prev_date = sorted_dates[current_idx - i]
+                        prev_dates.append(sorted_dates[current_idx - i])
                     else:
                         break
-                else:
-                    # 如果没有交易日历，使用简单方法
-                    prev_date = current_date - timedelta(days=i)
-                    while prev_date.weekday() >= 5:  # 5=Saturday, 6=Sunday
-                        prev_date -= timedelta(days=1)
-                
-                prev_date_str = prev_date.strftime("%Y-%m-%d")
-                print(f"[DEBUG] 尝试获取前{i}个交易日 {prev_date_str} 的分时数据")
-                
-                # 获取前一交易日的分时数据
-                start_dt = f"{prev_date_str} 09:30:00"
-                end_dt = f"{prev_date_str} 15:00:00"
-                
-                try:
-                    # 获取证券类型和对应的数据接口代码
-                    security_type, symbol = self._get_security_type(self.code)
-                    
-                    if security_type == "INDEX":
-                        # 使用指数分时数据接口
-                        prev_intraday_df = ak.index_zh_a_hist_min_em(
-                            symbol=symbol,
-                            start_date=start_dt,
-                            end_date=end_dt,
-                            period=str(self.period),
-                        )
-                    elif security_type == "ETF":
-                        # 使用ETF分时数据接口
-                        prev_intraday_df = ak.fund_etf_hist_min_em(
-                            symbol=symbol,
-                            start_date=start_dt,
-                            end_date=end_dt,
-                            period=str(self.period),
-                            adjust="",
-                        )
-                    else:
-                        # 使用股票分时数据接口
-                        prev_intraday_df = ak.stock_zh_a_hist_min_em(
-                            symbol=symbol,
-                            start_date=start_dt,
-                            end_date=end_dt,
-                            period=str(self.period),
-                            adjust="",
-                        )
-                    
-                    if not prev_intraday_df.empty:
-                        # 统一列名 - 包含所有必要的列
-                        if '时间' in prev_intraday_df.columns:
-                            prev_intraday_df.rename(columns={
-                                "时间": "datetime", 
-                                "开盘": "open", 
-                                "收盘": "close", 
-                                "最高": "high",
-                                "最低": "low",
-                                "成交量": "volume"
-                            }, inplace=True)
-                            prev_intraday_df["datetime"] = pd.to_datetime(prev_intraday_df["datetime"])
-                            prev_intraday_df.set_index("datetime", inplace=True)
-                        
-                        all_prev_data.append(prev_intraday_df)
-                        print(f"[DEBUG] 成功获取前{i}个交易日 {prev_date_str} 的分时数据，共 {len(prev_intraday_df)} 条记录")
-                    else:
-                        print(f"[DEBUG] 前{i}个交易日 {prev_date_str} 没有分时数据")
-                        break
-                        
-                except Exception as e:
-                    print(f"[DEBUG] 获取前{i}个交易日 {prev_date_str} 分时数据失败: {e}")
+            else:
+                # 如果没有交易日历，按工作日推算
+                prev_dates = [self._prev_trade_date(current_date, i) for i in range(1, self.PREV_INTRADAY_DAYS + 1)]
+            
+            if not prev_dates:
+                log.debug("无法获取任何前一交易日分时数据")
+                return None
+            
+            # 并发获取各交易日分时数据（网络I/O为主，线程池即可）
+            with ThreadPoolExecutor(max_workers=min(self.PREV_INTRADAY_FETCH_WORKERS, len(prev_dates))) as executor:
+                results = list(executor.map(self._fetch_one_prev_day, range(1, len(prev_dates) + 1), prev_dates))
+            
+            # 各交易日独立获取、互不中断；按日期顺序保留最长的连续成功前缀，
+            # 避免中间缺一天导致前几日分时在图上出现断档
+            all_prev_data = []
+            for i, prev_intraday_df in enumerate(results):
+                if prev_intraday_df is None:
+                    dropped = sum(df is not None for df in results[i + 1:])
+                    if dropped:
+                        log.debug("前%s个交易日分时数据缺失，丢弃更早的 %s 个交易日数据", i + 1, dropped)
                     break
+                all_prev_data.append(prev_intraday_df)
             
             if not all_prev_data:
-                print(f"[DEBUG] 无法获取任何前一交易日分时数据")
+                log.debug("无法获取任何前一交易日分时数据")
                 return None
             
-            # 合并所有前一交易日数据
-            combined_prev_data = pd.concat(all_prev_data)
-            print(f"[DEBUG] 成功获取多个前一交易日数据，总长度: {len(combined_prev_data)}")
+            # 合并所有前一交易日数据，合并后一次性解析时间列（akshare分时时间格式固定）
+            combined_prev_data = pd.concat(all_prev_data, copy=False)
+            if "datetime" in combined_prev_data.columns:
+                combined_prev_data["datetime"] = pd.to_datetime(
+                    combined_prev_data["datetime"], format=_MIN_TIME_FORMAT, errors='coerce', cache=True)
+                combined_prev_data = combined_prev_data.dropna(subset=["datetime"]).set_index("datetime")
+            log.debug("成功获取多个前一交易日数据，总长度: %s", len(combined_prev_data))
             
             return combined_prev_data
             
         except Exception as e:
-            print(f"[DEBUG] 获取多个前一交易日分时数据失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("获取多个前一交易日分时数据失败: %s", e)
+            return None
+
+    def _fetch_one_prev_day(self, i: int, prev_date: date) -> Optional[pd.DataFrame]:
+        """获取前i个交易日的分时数据（在线程池中执行）
+        
+        :param i: 第几个前交易日（仅用于日志）
+        :param prev_date: 对应的交易日期
+        :return: 统一列名后的分时数据，失败或为空时返回None
+        """
+        prev_date_str = prev_date.isoformat()
+        log.debug("尝试获取前%s个交易日 %s 的分时数据", i, prev_date_str)
+        
+        # 获取前一交易日的分时数据
+        start_dt = f"{prev_date_str} 09:30:00"
+        end_dt = f"{prev_date_str} 15:00:00"
+        
+        try:
+            # 获取证券类型和对应的数据接口代码
+            security_type, symbol = self._sec()
+            
+            # 限制对akshare后端的并发请求数
+            with _AK_FETCH_SEMAPHORE:
+                if security_type == "INDEX":
+                    # 使用指数分时数据接口
+                    prev_intraday_df = ak.index_zh_a_hist_min_em(
+                        symbol=symbol,
+                        start_date=start_dt,
+                        end_date=end_dt,
+                        period=str(self.period),
+                    )
+                elif security_type == "ETF":
+                    # 使用ETF分时数据接口
+                    prev_intraday_df = ak.fund_etf_hist_min_em(
+                        symbol=symbol,
+                        start_date=start_dt,
+                        end_date=end_dt,
+                        period=str(self.period),
+                        adjust="",
+                    )
+                else:
+                    # 使用股票分时数据接口
+                    prev_intraday_df = ak.stock_zh_a_hist_min_em(
+                        symbol=symbol,
+                        start_date=start_dt,
+                        end_date=end_dt,
+                        period=str(self.period),
+                        adjust="",
+                    )
+            
+            if prev_intraday_df.empty:
+                log.debug("前%s个交易日 %s 没有分时数据", i, prev_date_str)
+                return None
+            
+            # 统一列名（时间列在多日数据合并后统一转换）
+            _normalize_min_df(prev_intraday_df, set_index=False)
+            
+            log.debug("成功获取前%s个交易日 %s 的分时数据，共 %s 条记录", i, prev_date_str, len(prev_intraday_df))
+            return prev_intraday_df
+            
+        except Exception as e:
+            log.debug("获取前%s个交易日 %s 分时数据失败: %s", i, prev_date_str, e)
             return None
 
     def _is_realtime_signal(self, signal_timestamp: Optional[pd.Timestamp] = None, threshold_minutes: int = 2) -> bool:
@@ -2670,11 +3122,8 @@ class IntradayWindow:
         :return: True表示实时信号，False表示历史信号
         """
         try:
-            from datetime import date, datetime, time, timedelta
-
             # 检查是否为今日
-            today = date.today()
-            if self.trade_date != today:
+            if not self._is_today_cached():
                 return False
             
             # 如果没有提供信号时间戳，使用最新数据时间
@@ -2690,50 +3139,75 @@ class IntradayWindow:
             # 获取当前时间
             now = datetime.now()
             
-            # 计算信号时间与当前时间的差值
-            time_diff = abs((now - signal_timestamp).total_seconds())
-            time_diff_minutes = time_diff / 60
-            
-            # 检查是否在阈值范围内
-            is_within_threshold = time_diff_minutes <= threshold_minutes
-            
-            # 检查是否在交易时间内
+            # 先检查是否在交易时间内，不在交易时间则无需计算时间差
             current_time = now.time()
-            morning_start = time(9, 30)
-            morning_end = time(11, 30)
-            afternoon_start = time(13, 0)
-            afternoon_end = time(15, 0)
-            
-            is_trading_time = (
-                (morning_start <= current_time <= morning_end) or
-                (afternoon_start <= current_time <= afternoon_end)
-            )
+            if not (_MORNING_START <= current_time <= _MORNING_END or
+                    _AFTERNOON_START <= current_time <= _AFTERNOON_END):
+                return False
             
-            # 只有同时满足时间阈值和交易时间才认为是实时信号
-            is_realtime = is_within_threshold and is_trading_time
+            # 计算信号时间与当前时间的差值，检查是否在阈值范围内
+            time_diff = abs((now - signal_timestamp).total_seconds())
+            time_diff_minutes = time_diff / 60
+            is_realtime = time_diff_minutes <= threshold_minutes
             
             if is_realtime:
-                print(f"🔄 实时信号检测: 信号时间={signal_timestamp.strftime('%H:%M:%S')}, "
-                      f"当前时间={now.strftime('%H:%M:%S')}, "
-                      f"时间差={time_diff_minutes:.1f}分钟")
+                log.debug("实时信号检测: 信号时间=%s, 当前时间=%s, 时间差=%.1f分钟",
+                          signal_timestamp.strftime('%H:%M:%S'), now.strftime('%H:%M:%S'), time_diff_minutes)
             
             return is_realtime
             
         except Exception as e:
-            print(f"判断实时信号状态失败: {e}")
+            log.warning("判断实时信号状态失败: %s", e)
             # 出错时默认不播放声音，避免误报
             return False
 
+    def _fetch_daily(self, security_type: str, symbol: str, start: str, end: str) -> pd.DataFrame:
+        """获取日线原始数据（带缓存，缓存在下一个15:30收盘边界失效）
+        
+        日线数据只在收盘后变化，同一会话内重复计算均线时无需再次请求akshare。
+        
+        :param security_type: 证券类型 ("INDEX", "ETF", "STOCK"等)
+        :param symbol: 数据接口代码
+        :param start: 开始日期 (YYYYMMDD)
+        :param end: 结束日期 (YYYYMMDD)
+        :return: akshare返回的日线DataFrame
+        """
+        key = (security_type, symbol, start, end)
+        now = datetime.now()
+        cached = self._daily_df_cache.get(key)
+        if cached is not None and now < cached[1]:
+            log.debug("从缓存获取日线数据: %s", key)
+            return cached[0]
+        
+        if security_type == "INDEX":
+            # 使用指数历史数据接口
+            log.debug("获取指数日线数据: %s -> %s", self.code, symbol)
+            df = ak.index_zh_a_hist(symbol=symbol, start_date=start, end_date=end, adjust="")
+        elif security_type == "ETF":
+            # 使用ETF历史数据接口
+            log.debug("获取ETF日线数据: %s", self.code)
+            df = ak.fund_etf_hist_em(symbol=symbol, period="daily", start_date=start, end_date=end, adjust="qfq")
+        else:
+            # 使用股票历史数据接口
+            log.debug("获取股票日线数据: %s", self.code)
+            df = ak.stock_zh_a_hist(symbol=symbol, start_date=start, end_date=end, adjust="qfq")
+        
+        expires_at = now.replace(hour=15, minute=30, second=0, microsecond=0)
+        if now >= expires_at:
+            expires_at += timedelta(days=1)
+        self._daily_df_cache[key] = (df, expires_at)
+        return df
+
     def _get_ma_prices(self) -> tuple[Optional[float], Optional[float], Optional[float]]:
         """获取5日线、10日线和20日线价格（带缓存机制）"""
         try:
             # 检查缓存键是否变化
-            self._check_cache_key_change()
+            cache_key = self._check_cache_key_change()
             
             # 尝试从缓存获取
-            cached_ma = self._get_cached_data('ma_prices')
+            cached_ma = self._get_cached_data('ma_prices', cache_key)
             if cached_ma is not None:
-                print(f"[DEBUG] 从缓存获取MA价格: MA5={cached_ma[0]}, MA10={cached_ma[1]}, MA20={cached_ma[2]}")
+                log.debug("从缓存获取MA价格: MA5=%s, MA10=%s, MA20=%s", cached_ma[0], cached_ma[1], cached_ma[2])
                 return cached_ma
 
             # 获取足够的历史数据来计算均线
@@ -2742,77 +3216,41 @@ class IntradayWindow:
             
             # 根据证券类型获取日线数据
             # 获取证券类型和对应的数据接口代码
-            security_type, symbol = self._get_security_type(self.code)
-            
-            if security_type == "INDEX":
-                # 使用指数历史数据接口
-                print(f"[DEBUG] 获取指数日线数据用于MA计算: {self.code} -> {symbol}")
-                df = ak.index_zh_a_hist(
-                    symbol=symbol,
-                    start_date=start_date.strftime('%Y%m%d'),
-                    end_date=end_date.strftime('%Y%m%d'),
-                    adjust=""
-                )
-            elif security_type == "ETF":
-                # 使用ETF历史数据接口
-                print(f"[DEBUG] 获取ETF日线数据用于MA计算: {self.code}")
-                df = ak.fund_etf_hist_em(
-                    symbol=symbol,
-                    period="daily",
-                    start_date=start_date.strftime('%Y%m%d'),
-                    end_date=end_date.strftime('%Y%m%d'),
-                    adjust="qfq"
-                )
-            else:
-                # 使用股票历史数据接口
-                print(f"[DEBUG] 获取股票日线数据用于MA计算: {self.code}")
-                df = ak.stock_zh_a_hist(
-                    symbol=symbol,
-                    start_date=start_date.strftime('%Y%m%d'),
-                    end_date=end_date.strftime('%Y%m%d'),
-                    adjust="qfq"
-                )
+            security_type, symbol = self._sec()
+            df = self._fetch_daily(security_type, symbol, start_date.strftime('%Y%m%d'), end_date.strftime('%Y%m%d'))
             
             if df.empty:
-                print(f"[DEBUG] 获取数据为空，代码: {self.code}")
+                log.debug("获取数据为空，代码: %s", self.code)
                 return None, None, None
                 
-            # 确保日期列为索引且按时间升序排列
-            df['日期'] = pd.to_datetime(df['日期'])
-            df = df.set_index('日期').sort_index()
-            
-            # 计算5日线、10日线和20日线
-            df['MA5'] = df['收盘'].rolling(window=5, min_periods=5).mean()
-            df['MA10'] = df['收盘'].rolling(window=10, min_periods=10).mean()
-            df['MA20'] = df['收盘'].rolling(window=20, min_periods=20).mean()
-            
-            # 获取目标交易日的均线价格
-            target_data = df.loc[df.index <= pd.Timestamp(self.trade_date)]
-            if target_data.empty:
-                print(f"[DEBUG] 目标日期没有数据，目标日期: {self.trade_date}")
+            # 按日期升序取目标交易日及之前的收盘价（不修改缓存中的原始数据）
+            dates = pd.to_datetime(df['日期']).to_numpy()
+            order = np.argsort(dates, kind='stable')
+            dates = dates[order]
+            # 日期已有序，二分查找目标交易日的位置后按位置切片
+            pos = np.searchsorted(dates, np.datetime64(self.trade_date, 'ns'), side='right')
+            closes = df['收盘'].to_numpy(dtype=np.float64)[order[:pos]]
+            if closes.size == 0:
+                log.debug("目标日期没有数据，目标日期: %s", self.trade_date)
                 return None, None, None
-                
-            last_row = target_data.iloc[-1]
-            ma5_price = last_row['MA5'] if not pd.isna(last_row['MA5']) else None
-            ma10_price = last_row['MA10'] if not pd.isna(last_row['MA10']) else None
-            ma20_price = last_row['MA20'] if not pd.isna(last_row['MA20']) else None
+            
+            # 只需要最后一个交易日的均线值，直接对末尾窗口求均值
+            ma5_price, ma10_price, ma20_price = _tail_ma(closes)
             
             # 添加调试信息
-            print(f"[DEBUG] MA5: {ma5_price}, MA10: {ma10_price}, MA20: {ma20_price}")
-            print(f"[DEBUG] 目标日期: {self.trade_date}, 代码: {self.code}")
-            print(f"[DEBUG] 数据行数: {len(df)}, 最后日期: {df.index[-1]}")
+            log.debug("MA5: %s, MA10: %s, MA20: %s", ma5_price, ma10_price, ma20_price)
+            log.debug("目标日期: %s, 代码: %s", self.trade_date, self.code)
+            log.debug("数据行数: %s, 最后日期: %s", len(df), dates[pos - 1])
             
             # 缓存结果
             ma_result = (ma5_price, ma10_price, ma20_price)
-            self._set_cached_data('ma_prices', ma_result)
-            print(f"[DEBUG] MA价格已缓存: {ma_result}")
+            self._set_cached_data('ma_prices', ma_result, cache_key)
+            log.debug("MA价格已缓存: %s", ma_result)
             
             return ma_result
             
         except Exception as e:
-            print(f"获取均线价格失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("获取均线价格失败: %s", e)
             return None, None, None
 
     # ------------------------------------------------------------------
@@ -2826,63 +3264,63 @@ class IntradayWindow:
         if self.price_df is None:
             return
         
+        # 数据、关键价位和画布尺寸都未变化时，已有图形仍然有效，跳过清空坐标轴并重建所有艺术家对象；
+        # UI事件（焦点、点击）触发时只需重新渲染已有图形
+        if not self._force_redraw and _signature_matches(self._draw_signature(), self._last_draw_signature):
+            if self._ui_event_redraw:
+                self._ui_event_redraw = False
+                self._request_draw()
+            return
+        
         # 非交易时间优化：检查是否需要重绘
         if not self._is_trading_time():
             if not self._should_redraw():
-                print("[DEBUG] 非交易时间，跳过重绘")
+                log.debug("非交易时间，跳过重绘")
                 return
         
         # 如果没有分时数据，仍然可以显示支撑带和压力带
         if self.price_df.empty:
-            print("[DEBUG] 分时数据为空，但尝试显示支撑带和压力带")
+            log.debug("分时数据为空，但尝试显示支撑带和压力带")
             self._draw_support_resistance_only()
             return
+        # 以下会清空坐标轴绘制完整分时图，预览图不再有效
+        self._preview_signature = None
         
         # 支撑位和压力位已在_update_data方法中计算，这里不需要重复计算
         if self._support_resistance_calculated:
-            print("[DEBUG] 支撑位和压力位已在_update_data中计算，跳过重复计算")
+            log.debug("支撑位和压力位已在_update_data中计算，跳过重复计算")
         else:
-            print("[DEBUG] 警告：支撑位和压力位未在_update_data中计算，尝试在绘制时计算")
-            # 备用机制：如果支撑位和压力位仍未计算，尝试在绘制时计算
-            try:
-                self._calculate_support_resistance()
-                print("[DEBUG] 在_draw方法中成功计算支撑位和压力位")
-            except Exception as e:
-                print(f"[DEBUG] 在_draw方法中计算支撑位和压力位失败: {e}")
-                # 如果第一次计算失败，尝试再次计算（可能是网络延迟问题）
-                try:
-                    print("[DEBUG] 在_draw方法中第一次计算失败，尝试重新计算支撑位和压力位")
-                    import time
-                    time.sleep(1)  # 等待1秒后重试
-                    self._calculate_support_resistance()
-                    print("[DEBUG] 在_draw方法中重试计算支撑位和压力位成功")
-                except Exception as e2:
-                    print(f"[DEBUG] 在_draw方法中重试计算支撑位和压力位仍然失败: {e2}")
-                    # 即使计算失败，也要确保有基本的买卖信号
-                    if self.buy_signals is None:
-                        print("[DEBUG] 买入信号为None，初始化为空列表")
-                        self.buy_signals = []
-                    if self.sell_signals is None:
-                        print("[DEBUG] 卖出信号为None，初始化为空列表")
-                        self.sell_signals = []
+            log.debug("警告：支撑位和压力位未在_update_data中计算，转到后台计算，完成后重绘")
+            # 备用机制：在后台线程补算，避免网络请求阻塞Tk主线程；本次先按已有数据绘制
+            self._calculate_support_resistance_async()
+            # 确保有基本的买卖信号
+            if self.buy_signals is None:
+                log.debug("买入信号为None，初始化为空列表")
+                self.buy_signals = []
+            if self.sell_signals is None:
+                log.debug("卖出信号为None，初始化为空列表")
+                self.sell_signals = []
         
         # 重新计算突破跌破次数，确保显示与音效同步
         try:
-            print("[DEBUG] 在_draw方法中重新计算突破跌破次数")
+            log.debug("在_draw方法中重新计算突破跌破次数")
             # 重置计算标志，允许重新计算
             self._breakthrough_breakdown_calculated = False
             self._calculate_breakthrough_breakdown_count()
         except Exception as e:
-            print(f"[DEBUG] 在_draw方法中计算突破跌破次数失败: {e}")
+            log.debug("在_draw方法中计算突破跌破次数失败: %s", e)
 
-        # 清理
+        # 清理（RSI面板保留常驻图元，只移除本次需重建的部分）
+        # RSI面板不再整体clear，先移除十字线，避免RSI面板上的十字线图元随每次重绘累积
+        self._remove_crosshair()
         self.ax_price.clear()
         self.ax_cost.clear()
-        self.ax_rsi.clear()
+        self._reset_rsi_panel()
 
         # --- 主图：分时价格 ---
         x_times = self.price_df.index
-        prices = self.price_df["close"].values
+        # 统一转换一次为float64数组（已是float64时不复制），供绘图和各信号绘制方法共用
+        prices = self.price_df["close"].to_numpy(dtype=np.float64)
         x_index = np.arange(len(prices))
         
         # 计算分割线位置（上一个交易日数据与当日数据的分界点）
@@ -2890,9 +3328,10 @@ class IntradayWindow:
         if self.SHOW_PREVIOUS_DAY_DATA:
             # 找到当日数据的起始位置
             current_date_start = pd.Timestamp(f"{self.trade_date_str} 09:30:00")
-            split_mask = x_times >= current_date_start
-            if split_mask.any():
-                split_index = np.where(split_mask)[0][0]
+            # 时间索引单调递增，二分查找第一个不早于当日开盘的位置
+            pos = x_times.searchsorted(current_date_start, side='left')
+            if pos < len(x_times):
+                split_index = int(pos)
         
         # 先绘制5分钟K线柱子（不透明，绿跌红涨）
         self._plot_5min_candlesticks(x_index, x_times)
@@ -2918,18 +3357,18 @@ class IntradayWindow:
         
         # 绘制5分钟级别布林带（中轨黄色版本，与同花顺一致）
         if self._bollinger_calculated and self.bollinger_5min_upper is not None:
-            self._plot_bollinger_bands(x_index, prices.astype(float))
+            self._plot_bollinger_bands(x_index, prices)
         
         # 绘制买入信号圆圈
         if self.buy_signals is not None and len(self.buy_signals) > 0:
-            self._plot_buy_signals(x_index, prices.astype(float))
+            self._plot_buy_signals(x_index, prices)
         
         # 绘制卖出信号圆圈
         if self.sell_signals is not None and len(self.sell_signals) > 0:
-            self._plot_sell_signals(x_index, prices.astype(float))
+            self._plot_sell_signals(x_index, prices)
         
         # 绘制最新价格RSI信息信号
-        self._plot_latest_rsi_signal(x_index, prices.astype(float))
+        self._plot_latest_rsi_signal(x_index, prices)
 
         # Y 轴范围改为当前走势已出现的最大涨跌幅 (绝对值)
         # 使用前一交易日收盘价作为基准，而不是当日开盘价
@@ -2939,8 +3378,8 @@ class IntradayWindow:
             prev_close = prices[0]
         
         # 计算绝对最大涨跌幅
-        pct_changes = (np.array(prices) - prev_close) / prev_close
-        max_abs_pct = float(np.max(np.abs(pct_changes))) if len(pct_changes) else 0.0
+        # 先求最大绝对偏离再除以前收盘价，只产生一个临时数组
+        max_abs_pct = float(np.abs(prices - prev_close).max() / prev_close) if len(prices) else 0.0
         # 若全部价格相同, 给予1%最小区间
         if max_abs_pct == 0:
             max_abs_pct = 0.01
@@ -2960,121 +3399,16 @@ class IntradayWindow:
             # 使用1.2倍作为阈值，避免频繁调整
             if boll_max_pct > limit_pct * 1.2:
                 limit_pct = max(limit_pct, boll_max_pct * 1.1)  # 布林带范围加10%缓冲
-                print(f"[DEBUG] 根据布林带扩展价格范围，布林带范围: {boll_max_pct:.3f}, 调整后范围: {limit_pct:.3f}")
+                log.debug("根据布林带扩展价格范围，布林带范围: %.3f, 调整后范围: %.3f", boll_max_pct, limit_pct)
         
         # 计算基础价格范围
         base_up_price = prev_close * (1 + limit_pct)
         base_down_price = prev_close * (1 - limit_pct)
 
-        # 新增：检查支撑位、压力位、前高价格带和前低价格带是否需要扩展价格区间
-        # 支撑位和压力位使用5%范围，前高/前低价格带使用10%范围
-        five_point_pct = 0.05  # 5% - 用于支撑位和压力位
-        ten_point_pct = 0.10   # 10% - 用于前高/前低价格带
-        five_point_up = prev_close * (1 + five_point_pct)
-        five_point_down = prev_close * (1 - five_point_pct)
-        ten_point_up = prev_close * (1 + ten_point_pct)
-        ten_point_down = prev_close * (1 - ten_point_pct)
-        
-        # 检查支撑位是否需要扩展价格区间（使用5%范围）
-        if self.support_level is not None:
-            if self.support_level < base_down_price and self.support_level >= five_point_down:
-                # 支撑位在价格区间下方但在5%范围内，向下扩展
-                base_down_price = self.support_level * 0.995  # 留出0.5%的缓冲
-                print(f"[DEBUG] 扩展价格区间：支撑位{self.support_level:.3f}在价格区间下方，向下扩展至{base_down_price:.3f}")
-            elif self.support_level > base_up_price and self.support_level <= five_point_up:
-                # 支撑位在价格区间上方但在5%范围内，向上扩展
-                base_up_price = self.support_level * 1.005  # 留出0.5%的缓冲
-                print(f"[DEBUG] 扩展价格区间：支撑位{self.support_level:.3f}在价格区间上方，向上扩展至{base_up_price:.3f}")
-        
-        # 检查压力位是否需要扩展价格区间（使用5%范围）
-        if self.resistance_level is not None:
-            if self.resistance_level < base_down_price and self.resistance_level >= five_point_down:
-                # 压力位在价格区间下方但在5%范围内，向下扩展
-                base_down_price = self.resistance_level * 0.995  # 留出0.5%的缓冲
-                print(f"[DEBUG] 扩展价格区间：压力位{self.resistance_level:.3f}在价格区间下方，向下扩展至{base_down_price:.3f}")
-            elif self.resistance_level > base_up_price and self.resistance_level <= five_point_up:
-                # 压力位在价格区间上方但在5%范围内，向上扩展
-                base_up_price = self.resistance_level * 1.005  # 留出0.5%的缓冲
-                print(f"[DEBUG] 扩展价格区间：压力位{self.resistance_level:.3f}在价格区间上方，向上扩展至{base_up_price:.3f}")
-        
-        # 检查当前平均成本是否需要扩展价格区间（使用10%范围）
-        # 增加稳定性：只有当平均成本偏离当前范围超过2%时才调整，避免频繁切换
+        # 检查支撑位、压力位、平均成本、前高价格带和前低价格带是否需要扩展价格区间
+        # 当前平均成本在本次绘制中只获取一次，区间扩展和成本线绘制共用
         current_cost = self._get_latest_cost()
-        if current_cost is not None:
-            cost_deviation_threshold = 0.02  # 2%的偏离阈值
-            cost_down_threshold = base_down_price * (1 - cost_deviation_threshold)
-            cost_up_threshold = base_up_price * (1 + cost_deviation_threshold)
-            
-            if current_cost < cost_down_threshold and current_cost >= ten_point_down:
-                # 平均成本在价格区间下方但在10%范围内，且偏离超过2%，向下扩展
-                base_down_price = current_cost * 0.995  # 留出0.5%的缓冲
-                print(f"[DEBUG] 扩展价格区间：当前平均成本{current_cost:.3f}在价格区间下方，向下扩展至{base_down_price:.3f}")
-            elif current_cost > cost_up_threshold and current_cost <= ten_point_up:
-                # 平均成本在价格区间上方但在10%范围内，且偏离超过2%，向上扩展
-                base_up_price = current_cost * 1.005  # 留出0.5%的缓冲
-                print(f"[DEBUG] 扩展价格区间：当前平均成本{current_cost:.3f}在价格区间上方，向上扩展至{base_up_price:.3f}")
-        
-        # 检查前高价格带是否需要扩展价格区间
-        if hasattr(self, 'previous_high_dual_prices') and self.previous_high_dual_prices is not None:
-            dual_prices = self.previous_high_dual_prices
-            if dual_prices.get('resistance_band'):
-                band = dual_prices['resistance_band']
-                band_upper = band['upper']  # 上影线最高价
-                band_lower = band['lower']  # 实体最高价
-                
-                # 计算前高价格带相对于前一交易日收盘价的涨幅
-                band_upper_pct = (band_upper - prev_close) / prev_close
-                band_lower_pct = (band_lower - prev_close) / prev_close
-                
-                print(f"[DEBUG] 前高价格带涨幅检查:")
-                print(f"[DEBUG]   上边界涨幅: {band_upper_pct*100:.2f}%")
-                print(f"[DEBUG]   下边界涨幅: {band_lower_pct*100:.2f}%")
-                print(f"[DEBUG]   10%涨幅范围: {ten_point_down:.3f} - {ten_point_up:.3f}")
-                
-                # 修改逻辑：只要最低点（实体最高价）在10%阈值内，就显示包括最高点的完整价格范围
-                if ten_point_down <= band_lower <= ten_point_up:
-                    # 检查上边界是否需要扩展（显示完整的价格带，包括最高点）
-                    if band_upper > base_up_price:
-                        base_up_price = band_upper * 1.005  # 留出0.5%的缓冲
-                        print(f"[DEBUG] 扩展价格区间：前高价格带最低点{band_lower:.3f}在10%范围内，向上扩展至最高点{band_upper:.3f}")
-                    
-                    # 检查下边界是否需要扩展
-                    if band_lower < base_down_price:
-                        base_down_price = band_lower * 0.995  # 留出0.5%的缓冲
-                        print(f"[DEBUG] 扩展价格区间：前高价格带最低点{band_lower:.3f}在10%范围内，向下扩展至{base_down_price:.3f}")
-                else:
-                    print(f"[DEBUG] 前高价格带最低点{band_lower:.3f}不在10%涨幅范围内，不扩展显示区间")
-
-        # 检查前低价格带是否需要扩展价格区间
-        if hasattr(self, 'previous_low_dual_prices') and self.previous_low_dual_prices is not None:
-            dual_prices = self.previous_low_dual_prices
-            if dual_prices.get('support_band'):
-                band = dual_prices['support_band']
-                band_upper = band['upper']  # 实体最低价
-                band_lower = band['lower']  # 下影线最低价
-                
-                # 计算前低价格带相对于前一交易日收盘价的跌幅
-                band_upper_pct = (band_upper - prev_close) / prev_close
-                band_lower_pct = (band_lower - prev_close) / prev_close
-                
-                print(f"[DEBUG] 前低价格带跌幅检查:")
-                print(f"[DEBUG]   上边界跌幅: {band_upper_pct*100:.2f}%")
-                print(f"[DEBUG]   下边界跌幅: {band_lower_pct*100:.2f}%")
-                print(f"[DEBUG]   10%跌幅范围: {ten_point_down:.3f} - {ten_point_up:.3f}")
-                
-                # 修改逻辑：只要最高点（实体最低价）在10%阈值内，就显示包括最低点的完整价格范围
-                if ten_point_down <= band_upper <= ten_point_up:
-                    # 检查上边界是否需要扩展
-                    if band_upper > base_up_price:
-                        base_up_price = band_upper * 1.005  # 留出0.5%的缓冲
-                        print(f"[DEBUG] 扩展价格区间：前低价格带最高点{band_upper:.3f}在10%范围内，向上扩展至{base_up_price:.3f}")
-                    
-                    # 检查下边界是否需要扩展（显示完整的价格带，包括最低点）
-                    if band_lower < base_down_price:
-                        base_down_price = band_lower * 0.995  # 留出0.5%的缓冲
-                        print(f"[DEBUG] 扩展价格区间：前低价格带最高点{band_upper:.3f}在10%范围内，向下扩展至最低点{band_lower:.3f}")
-                else:
-                    print(f"[DEBUG] 前低价格带最高点{band_upper:.3f}不在10%跌幅范围内，不扩展显示区间")
+        base_down_price, base_up_price = self._extend_price_range(prev_close, base_down_price, base_up_price, current_cost)
 
         # 使用价格范围合并机制，确保新范围只能扩展不能缩小
         final_down_price, final_up_price = self._merge_price_range(base_down_price, base_up_price)
@@ -3082,65 +3416,26 @@ class IntradayWindow:
         # 设置轴范围
         self.ax_price.set_ylim(final_down_price, final_up_price)
 
-        # 基准线（前一交易日收盘价）
-        self.ax_price.axhline(prev_close, color="gray", linestyle="--", linewidth=0.8, label="前收盘")
-        
         # 百分比背景填充区域：正负3%, 6%, 9%, 10%的分层背景
         # 正涨幅区域：3%~6%浅红色，6%~9%深红色，9%~10%全红色
         # 负跌幅区域：-3%~-6%浅绿色，-6%~-9%深绿色，-9%~-10%全绿色
         
-        # 定义填充区域的颜色和范围
-        positive_zones = [
-            (3, 6, "#FE9999"),    # 浅红色 3%~6% (最浅)
-            (6, 9, "#FF4C4C"),    # 深红色 6%~9% (中等)
-            (9, 30, "#FF0000")    # 全红色 9%~10% (降低亮度)
-        ]
-        
-        negative_zones = [
-            (-6, -3, "#99FE99"),  # 浅绿色 -6%~-3% (最浅)
-            (-9, -6, "#4CFF4C"),  # 深绿色 -9%~-6% (中等)
-            (-30, -9, "#00CC00")  # 全绿色 -10%~-9% (降低亮度)
-        ]
-        
-        # 绘制正涨幅背景填充
-        for low_pct, high_pct, color in positive_zones:
-            low_price = prev_close * (1 + low_pct / 100)
-            high_price = prev_close * (1 + high_pct / 100)
-            
-            # 确保价格在当前Y轴范围内
-            if final_down_price <= high_price and final_up_price >= low_price:
-                # 裁剪到可见范围
-                fill_low = max(low_price, final_down_price)
-                fill_high = min(high_price, final_up_price)
-                if fill_high > fill_low:
-                    self.ax_price.axhspan(fill_low, fill_high, facecolor=color, alpha=0.2, zorder=0)
-        
-        # 绘制负跌幅背景填充
-        for low_pct, high_pct, color in negative_zones:
-            low_price = prev_close * (1 + low_pct / 100)
-            high_price = prev_close * (1 + high_pct / 100)
-            
-            # 确保价格在当前Y轴范围内
-            if final_down_price <= high_price and final_up_price >= low_price:
-                # 裁剪到可见范围
-                fill_low = max(low_price, final_down_price)
-                fill_high = min(high_price, final_up_price)
-                if fill_high > fill_low:
-                    self.ax_price.axhspan(fill_low, fill_high, facecolor=color, alpha=0.2, zorder=0)
-        
-        # 5日线（蓝色虚线）、10日线（橙色虚线）和20日线（绿色虚线）
-        if self.ma5_price is not None and final_down_price <= self.ma5_price <= final_up_price:
-            self.ax_price.axhline(self.ma5_price, color="blue", linestyle="--", linewidth=1, alpha=0.8, label="5日线")
-        if self.ma10_price is not None and final_down_price <= self.ma10_price <= final_up_price:
-            self.ax_price.axhline(self.ma10_price, color="orange", linestyle="--", linewidth=1, alpha=0.8, label="10日线")
-        if self.ma20_price is not None and final_down_price <= self.ma20_price <= final_up_price:
-            self.ax_price.axhline(self.ma20_price, color="green", linestyle="--", linewidth=1, alpha=0.8, label="20日线")
-        
-        # 新增：绘制支撑位和压力位（与MA5、MA10保持一致）
-        if self.support_level is not None and final_down_price <= self.support_level <= final_up_price:
-            self.ax_price.axhline(self.support_level, color="red", linestyle="--", linewidth=1, alpha=0.8, label=f"支撑位({self.support_type})")
-        if self.resistance_level is not None and final_down_price <= self.resistance_level <= final_up_price:
-            self.ax_price.axhline(self.resistance_level, color="green", linestyle="--", linewidth=1, alpha=0.8, label=f"压力位({self.resistance_type})")
+        # 6个分层区域合并为一个PolyCollection（x方向按轴坐标铺满，按Y轴范围裁剪并跳过不可见区域）
+        self.ax_price.add_collection(
+            self._pct_zone_collection(prev_close, final_down_price, final_up_price), autolim=False)
+        
+        # 整宽水平参考线合并为一个LineCollection：
+        # 基准线（前一交易日收盘价）、5日线（蓝色虚线）、10日线（橙色虚线）、20日线（绿色虚线）、
+        # 支撑位和压力位（与MA5、MA10保持一致）、当前平均成本线（粉色实线）
+        self._add_level_lines([
+            (prev_close, "gray", "--", 0.8, 1.0),
+            (self.ma5_price, "blue", "--", 1, 0.8),
+            (self.ma10_price, "orange", "--", 1, 0.8),
+            (self.ma20_price, "green", "--", 1, 0.8),
+            (self.support_level, "red", "--", 1, 0.8),
+            (self.resistance_level, "green", "--", 1, 0.8),
+            (current_cost, "#FF69B4", "-", 2, 0.8),
+        ], final_down_price, final_up_price)
         
         # 新增：绘制看涨线和看跌线 - 根据开盘价和上一个交易日涨跌情况确定线型
         if (self.bullish_line_price is not None and final_down_price <= self.bullish_line_price <= final_up_price) or \
@@ -3164,18 +3459,11 @@ class IntradayWindow:
                                    color="green", linestyle=bearish_style, linewidth=2, alpha=0.9, label="看跌线")
         
         
-        # 新增：绘制当前平均成本线（粉色虚线）
-        current_cost = self._get_latest_cost()
-        if current_cost is not None and final_down_price <= current_cost <= final_up_price:
-            self.ax_price.axhline(current_cost, color="#FF69B4", linestyle="-", linewidth=2, alpha=0.8, label="当前平均成本")
-        
         # 新增：绘制前高价格阻力带
-        if hasattr(self, 'previous_high_dual_prices') and self.previous_high_dual_prices is not None:
-            dual_prices = self.previous_high_dual_prices
-            if dual_prices.get('resistance_band'):
-                band = dual_prices['resistance_band']
-                upper_price = band['upper']  # 上影线最高价
-                lower_price = band['lower']  # 实体最高价
+        high_band, low_band = self._prev_bands()
+        if self.previous_high_dual_prices is not None:
+            if high_band is not None:
+                lower_price, upper_price = high_band  # 实体最高价, 上影线最高价
                 
                 # 确保阻力带在可见范围内
                 if final_down_price <= upper_price <= final_up_price or final_down_price <= lower_price <= final_up_price:
@@ -3188,7 +3476,7 @@ class IntradayWindow:
                         center_price = (upper_price + lower_price) / 2
                         upper_price = center_price + min_band_height / 2
                         lower_price = center_price - min_band_height / 2
-                        print(f"[DEBUG] 分时窗口 - 扩展阻力带以确保可见度: {lower_price:.3f} - {upper_price:.3f}")
+                        log.debug("分时窗口 - 扩展阻力带以确保可见度: %.3f - %.3f", lower_price, upper_price)
                     
                     # 绘制阻力带（绿色填充，添加线条图案）
                     self.ax_price.axhspan(
@@ -3200,10 +3488,10 @@ class IntradayWindow:
                         label=f"前高阻力带({lower_price:.2f}-{upper_price:.2f})"
                     )
                     
-                    print(f"[DEBUG] 分时窗口 - 绘制前高阻力带: {lower_price:.3f} - {upper_price:.3f}")
+                    log.debug("分时窗口 - 绘制前高阻力带: %.3f - %.3f", lower_price, upper_price)
         
         # 保持兼容性：如果没有双价格数据，使用单一前高价格线
-        elif hasattr(self, 'previous_high_price') and self.previous_high_price is not None:
+        elif self.previous_high_price is not None:
             if final_down_price <= self.previous_high_price <= final_up_price:
                 self.ax_price.axhline(
                     self.previous_high_price, 
@@ -3213,15 +3501,12 @@ class IntradayWindow:
                     alpha=0.8, 
                     label=f"前高价格({self.previous_high_price:.2f})"
                 )
-                print(f"[DEBUG] 分时窗口 - 绘制前高价格线: {self.previous_high_price:.3f}")
+                log.debug("分时窗口 - 绘制前高价格线: %.3f", self.previous_high_price)
 
         # 新增：绘制前低价格支撑带
-        if hasattr(self, 'previous_low_dual_prices') and self.previous_low_dual_prices is not None:
-            dual_prices = self.previous_low_dual_prices
-            if dual_prices.get('support_band'):
-                band = dual_prices['support_band']
-                upper_price = band['upper']  # 实体最低价
-                lower_price = band['lower']  # 下影线最低价
+        if self.previous_low_dual_prices is not None:
+            if low_band is not None:
+                lower_price, upper_price = low_band  # 下影线最低价, 实体最低价
                 
                 # 检查支撑带是否在显示范围内
                 if (final_down_price <= upper_price <= final_up_price or 
@@ -3238,10 +3523,10 @@ class IntradayWindow:
                         label=f"前低支撑带({lower_price:.2f}-{upper_price:.2f})"
                     )
                     
-                    print(f"[DEBUG] 分时窗口 - 绘制前低支撑带: {lower_price:.3f} - {upper_price:.3f}")
+                    log.debug("分时窗口 - 绘制前低支撑带: %.3f - %.3f", lower_price, upper_price)
         
         # 保持兼容性：如果没有双价格数据，使用单一前低价格线
-        elif hasattr(self, 'previous_low_price') and self.previous_low_price is not None:
+        elif self.previous_low_price is not None:
             if final_down_price <= self.previous_low_price <= final_up_price:
                 self.ax_price.axhline(
                     self.previous_low_price, 
@@ -3251,56 +3536,31 @@ class IntradayWindow:
                     alpha=0.8, 
                     label=f"前低价格({self.previous_low_price:.2f})"
                 )
-                print(f"[DEBUG] 分时窗口 - 绘制前低价格线: {self.previous_low_price:.3f}")
+                log.debug("分时窗口 - 绘制前低价格线: %.3f", self.previous_low_price)
         
 
 
         # 设置自定义价格刻度和标签
-        price_ticks = []
-        price_labels = []
-
-        # 添加基准价
-        price_ticks.append(prev_close)
-        price_labels.append(f"{prev_close:.2f}")
-
-        # 添加MA5、MA10和MA20的价格
-        if self.ma5_price is not None and final_down_price <= self.ma5_price <= final_up_price:
-            price_ticks.append(self.ma5_price)
-            price_labels.append(f"{self.ma5_price:.2f}")
-
-        if self.ma10_price is not None and final_down_price <= self.ma10_price <= final_up_price:
-            price_ticks.append(self.ma10_price)
-            price_labels.append(f"{self.ma10_price:.2f}")
-
-        if self.ma20_price is not None and final_down_price <= self.ma20_price <= final_up_price:
-            price_ticks.append(self.ma20_price)
-            price_labels.append(f"{self.ma20_price:.2f}")
-        
-        # 添加基础均线的价格（如果可见）
+        # 最新基础均线值（全为NaN时视为不可见）
+        latest_ma_base = np.nan
         if self.ma_base_values is not None and not self.ma_base_values.isna().all():
-            # 获取最新的基础均线值
             latest_ma_base = self.ma_base_values.iloc[-1]
-            if final_down_price <= latest_ma_base <= final_up_price:
-                price_ticks.append(latest_ma_base)
-                price_labels.append(f"{latest_ma_base:.2f}")
-        
-        # 新增：添加支撑位和压力位的价格刻度
-        if self.support_level is not None and final_down_price <= self.support_level <= final_up_price:
-            price_ticks.append(self.support_level)
-            price_labels.append(f"{self.support_level:.2f}")
-        
-        if self.resistance_level is not None and final_down_price <= self.resistance_level <= final_up_price:
-            price_ticks.append(self.resistance_level)
-            price_labels.append(f"{self.resistance_level:.2f}")
         
-        # 新增：添加看涨线和看跌线的价格刻度
-        if self.bullish_line_price is not None and final_down_price <= self.bullish_line_price <= final_up_price:
-            price_ticks.append(self.bullish_line_price)
-            price_labels.append(f"{self.bullish_line_price:.2f}")
-        
-        if self.bearish_line_price is not None and final_down_price <= self.bearish_line_price <= final_up_price:
-            price_ticks.append(self.bearish_line_price)
-            price_labels.append(f"{self.bearish_line_price:.2f}")
+        # 候选价位一次向量化筛选：MA5、MA10、MA20、基础均线、支撑位、压力位、看涨线、看跌线
+        def _nan_if_none(value):
+            return np.nan if value is None else value
+        
+        tick_candidates = np.array([
+            _nan_if_none(self.ma5_price), _nan_if_none(self.ma10_price), _nan_if_none(self.ma20_price),
+            latest_ma_base,
+            _nan_if_none(self.support_level), _nan_if_none(self.resistance_level),
+            _nan_if_none(self.bullish_line_price), _nan_if_none(self.bearish_line_price),
+        ], dtype=np.float64)
+        # NaN与任何值比较均为False，不可见/缺失的价位自然被过滤
+        tick_mask = (tick_candidates >= final_down_price) & (tick_candidates <= final_up_price)
+        # 基准价始终显示在首位
+        price_ticks = [prev_close, *tick_candidates[tick_mask].tolist()]
+        price_labels = [f"{v:.2f}" for v in price_ticks]
 
         # 设置刻度和标签
         if self.volume_display_enabled:
@@ -3327,24 +3587,18 @@ class IntradayWindow:
             if self.ax_volume is not None:
                 self.ax_volume.set_visible(False)
 
-        # 右侧百分比轴: 若已有旧轴, 先移除避免重叠
-        if self._ax_price_pct and self._ax_price_pct in self.fig.axes:
-            try:
-                self._ax_price_pct.remove()
-            except Exception:
-                pass
-
-        ax_pct = self.ax_price.twinx()
-        self._ax_price_pct = ax_pct
-        ax_pct.set_ylim(
-            (self.ax_price.get_ylim()[0] - prev_close) / prev_close * 100,
-            (self.ax_price.get_ylim()[1] - prev_close) / prev_close * 100,
-        )
+        # 右侧百分比轴: 首次创建后跨重绘复用，每次只重设范围和刻度
+        if self._ax_price_pct is None or self._ax_price_pct not in self.fig.axes:
+            self._ax_price_pct = self.ax_price.twinx()
+        ax_pct = self._ax_price_pct
+        # 价格轴上下限一次换算为相对前收盘价的涨跌幅
+        y_min, y_max = ((np.asarray(self.ax_price.get_ylim(), dtype=np.float64) - prev_close)
+                        / prev_close * 100).tolist()
+        ax_pct.set_ylim(y_min, y_max)
         
         # 设置自定义刻度和标签
         y_ticks = []
         y_labels = []
-        y_min, y_max = ax_pct.get_ylim()
         
         # 添加百分比刻度：3%, 6%, 9%
         for pct in [3, 6, 9]:
@@ -3355,55 +3609,29 @@ class IntradayWindow:
                 y_ticks.append(pct)
                 y_labels.append(f"+{pct}%")
         
-        # 添加MA5和MA10的刻度
-        if self.ma5_price is not None and prev_close > 0:
-            ma5_pct = (self.ma5_price - prev_close) / prev_close * 100
-            if y_min <= ma5_pct <= y_max:
-                y_ticks.append(ma5_pct)
-                y_labels.append(f"MA5\n{ma5_pct:+.1f}%")
-        
-        if self.ma10_price is not None and prev_close > 0:
-            ma10_pct = (self.ma10_price - prev_close) / prev_close * 100
-            if y_min <= ma10_pct <= y_max:
-                y_ticks.append(ma10_pct)
-                y_labels.append(f"MA10\n{ma10_pct:+.1f}%")
-        
-        # 添加基础均线的刻度（如果可见）
-        if self.ma_base_values is not None and not self.ma_base_values.isna().all() and prev_close > 0:
-            latest_ma_base = self.ma_base_values.iloc[-1]
-            ma_base_pct = (latest_ma_base - prev_close) / prev_close * 100
-            if y_min <= ma_base_pct <= y_max:
-                y_ticks.append(ma_base_pct)
-                y_labels.append(f"MA{self.MA_BASE_PERIOD}\n{ma_base_pct:+.1f}%")
-        
-        # 新增：添加支撑位和压力位的百分比刻度
-        if self.support_level is not None and prev_close > 0:
-            support_pct = (self.support_level - prev_close) / prev_close * 100
-            if y_min <= support_pct <= y_max:
-                y_ticks.append(support_pct)
-                y_labels.append(f"支撑位\n{support_pct:+.1f}%")
-        
-        if self.resistance_level is not None and prev_close > 0:
-            resistance_pct = (self.resistance_level - prev_close) / prev_close * 100
-            if y_min <= resistance_pct <= y_max:
-                y_ticks.append(resistance_pct)
-                y_labels.append(f"压力位\n{resistance_pct:+.1f}%")
-        
-        # 前高阻力带不在Y轴显示涨幅刻度
-        # 保持兼容性：如果没有双价格数据，使用单一前高价格刻度
-        elif hasattr(self, 'previous_high_price') and self.previous_high_price is not None and prev_close > 0:
-            previous_high_pct = (self.previous_high_price - prev_close) / prev_close * 100
-            if y_min <= previous_high_pct <= y_max:
-                y_ticks.append(previous_high_pct)
-                y_labels.append(f"前高价格\n{previous_high_pct:+.1f}%")
-
-        # 前低支撑带不在Y轴显示涨幅刻度
-        # 保持兼容性：如果没有双价格数据，使用单一前低价格刻度
-        elif hasattr(self, 'previous_low_price') and self.previous_low_price is not None and prev_close > 0:
-            previous_low_pct = (self.previous_low_price - prev_close) / prev_close * 100
-            if y_min <= previous_low_pct <= y_max:
-                y_ticks.append(previous_low_pct)
-                y_labels.append(f"前低价格\n{previous_low_pct:+.1f}%")
+        if prev_close > 0:
+            # MA5、MA10、基础均线、支撑位和压力位的涨跌幅一次向量化计算，按右轴范围掩码后生成标签
+            # 前高/前低阻力带不在Y轴显示涨幅刻度；保持兼容性：没有压力位时依次回退到单一前高、前低价格刻度
+            pct_entries = [
+                (self.ma5_price, "MA5"),
+                (self.ma10_price, "MA10"),
+                (latest_ma_base, f"MA{self.MA_BASE_PERIOD}"),
+                (self.support_level, "支撑位"),
+            ]
+            if self.resistance_level is not None:
+                pct_entries.append((self.resistance_level, "压力位"))
+            elif self.previous_high_price is not None:
+                pct_entries.append((self.previous_high_price, "前高价格"))
+            elif self.previous_low_price is not None:
+                pct_entries.append((self.previous_low_price, "前低价格"))
+            
+            pct_values = (np.array([_nan_if_none(v) for v, _ in pct_entries], dtype=np.float64)
+                          - prev_close) / prev_close * 100
+            pct_mask = (pct_values >= y_min) & (pct_values <= y_max)
+            visible_pcts = pct_values[pct_mask].tolist()
+            visible_names = [name for (_, name), visible in zip(pct_entries, pct_mask.tolist()) if visible]
+            y_ticks.extend(visible_pcts)
+            y_labels.extend(f"{name}\n{pct_value:+.1f}%" for name, pct_value in zip(visible_names, visible_pcts))
         
         # 添加0%基准线
         if y_min <= 0 <= y_max:
@@ -3449,43 +3677,89 @@ class IntradayWindow:
             self.fig.subplots_adjust(hspace=0.0375, top=0.99, bottom=0.05)
         
         # 绑定鼠标事件（仅在首次绘制时绑定）
-        if not hasattr(self, '_mouse_events_bound'):
+        if not self._mouse_events_bound:
             self._bind_mouse_events()
             self._mouse_events_bound = True
         
-        self.canvas.draw_idle()
+        self._request_draw()
         
-        # 更新重绘时间戳
-        from datetime import datetime
+        # 更新重绘时间戳和数据签名
         self._last_redraw_time = datetime.now()
+        self._last_draw_signature = self._draw_signature()
+        self._ui_event_redraw = False
+        self._force_redraw = False
+
+    def _draw_signature(self) -> tuple:
+        """绘制所依赖输入的签名，用于判断已有图形能否复用
+        
+        返回(对象引用, 标量值)：数据对象持有强引用并按is比较（不受对象回收后id复用影响），
+        另带长度与最新值以识别原地追加；标量为关键价位、计数、开关和画布尺寸。用_signature_matches比较。
+        """
+        df = self.price_df
+        last = (len(df), df.index[-1], df['close'].iat[-1]) if df is not None and len(df) else None
+        cost_len = len(self.cost_df) if self.cost_df is not None else None
+        ma_base_last = (self.ma_base_values.iat[-1]
+                        if self.ma_base_values is not None and len(self.ma_base_values) else None)
+        buy_signals = tuple(self.buy_signals or ())
+        sell_signals = tuple(self.sell_signals or ())
+        refs = (
+            df, self.cost_df, self.rsi_df, self.rsi_df_display, self.kdj_df,
+            self.bollinger_5min_upper, self.bollinger_5min_middle, self.bollinger_5min_lower,
+            self.ma_short_values, self.ma_mid_values, self.ma_base_values,
+            self.previous_high_dual_prices, self.previous_low_dual_prices,
+        ) + buy_signals + sell_signals
+        values = (
+            self.code, self.trade_date, last, cost_len, ma_base_last,
+            len(buy_signals), len(sell_signals), self._bollinger_calculated,
+            self.support_level, self.resistance_level, self.support_type, self.resistance_type,
+            self.bullish_line_price, self.bearish_line_price,
+            self.previous_high_price, self.previous_low_price,
+            self.ma5_price, self.ma10_price, self.ma20_price,
+            self.breakthrough_count, self.breakdown_count,
+            self.volume_display_enabled, tuple(self.fig.get_size_inches()),
+        )
+        return refs, values
+
+    def _schedule_ui_redraw(self, delay_ms: int):
+        """延迟触发UI事件重绘：连续事件只保留最后一次，合并为一次重绘"""
+        self._ui_event_redraw = True
+        if self._redraw_timer is not None:
+            try:
+                self.window.after_cancel(self._redraw_timer)
+            except tk.TclError:
+                pass
+        self._redraw_timer = self.window.after(delay_ms, self._run_scheduled_redraw)
+
+    def _run_scheduled_redraw(self):
+        """执行合并后的UI事件重绘"""
+        self._redraw_timer = None
+        self._trigger_redraw()
 
     def _on_window_configure(self, event):
         """处理窗口大小变动事件"""
         if event.widget == self.window:
-            print("[DEBUG] 窗口大小变动，触发重绘")
-            self._ui_event_redraw = True
+            log.debug("窗口大小变动，触发重绘")
             # 延迟重绘，避免频繁调用
-            if hasattr(self, '_configure_timer'):
-                self.window.after_cancel(self._configure_timer)
-            self._configure_timer = self.window.after(100, self._trigger_redraw)
+            self._schedule_ui_redraw(100)
 
     def _on_window_focus(self, event):
         """处理窗口获得焦点事件"""
-        print("[DEBUG] 窗口获得焦点，触发重绘")
-        self._ui_event_redraw = True
-        self._trigger_redraw()
+        last_redraw = self._last_redraw_time
+        if last_redraw is not None and \
+                (datetime.now() - last_redraw).total_seconds() < self.FOCUS_REDRAW_MIN_INTERVAL:
+            return
+        log.debug("窗口获得焦点，触发重绘")
+        self._schedule_ui_redraw(self.UI_REDRAW_DELAY_MS)
 
     def _on_window_click(self, event):
         """处理窗口点击事件"""
-        print("[DEBUG] 窗口点击，触发重绘")
-        self._ui_event_redraw = True
-        self._trigger_redraw()
+        log.debug("窗口点击，触发重绘")
+        self._schedule_ui_redraw(self.UI_REDRAW_DELAY_MS)
 
     def _on_window_click_release(self, event):
         """处理窗口点击释放事件"""
-        print("[DEBUG] 窗口点击释放，触发重绘")
-        self._ui_event_redraw = True
-        self._trigger_redraw()
+        log.debug("窗口点击释放，触发重绘")
+        self._schedule_ui_redraw(self.UI_REDRAW_DELAY_MS)
 
     def _trigger_redraw(self):
         """触发重绘"""
@@ -3494,21 +3768,30 @@ class IntradayWindow:
 
     def force_redraw(self):
         """强制重绘（公共方法，供外部调用）"""
-        print("[DEBUG] 外部触发强制重绘")
+        log.debug("外部触发强制重绘")
         self._force_redraw = True
         if not self._is_destroyed and hasattr(self, 'window') and self.window and self.window.winfo_exists():
             self.window.after(0, self._draw)
 
+    # 成本涨幅背景色带: (下限%, 上限%, 颜色)，仅对正涨幅区域着色
+    _COST_PCT_BANDS = (
+        (1, 3, "#FFF9D1"),    # 淡黄色
+        (3, 6, "#FFD59E"),    # 橙色(浅)
+        (6, 20, "#FFA07A"),   # 橙色
+        (20, 100, "#DDA0DD"), # 紫色
+    )
+
     def _plot_cost_panel(self, x_index, x_times, cost_series, split_index=None):
         """绘制成本面板(供 _draw 与 _redraw_cost 复用)"""
         # 清除旧轴
         self.ax_cost.clear()
-        # 若之前创建过 twin 轴，移除避免叠加
-        if hasattr(self, "_ax_cost_pct") and self._ax_cost_pct in self.fig.axes:
-            try:
-                self._ax_cost_pct.remove()
-            except Exception:
-                pass
+        # 右侧涨幅 twin 轴及其背景色带集合跨重绘复用，每次只更新色带顶点
+        if self._ax_cost_pct is None or self._ax_cost_pct not in self.fig.axes:
+            self._ax_cost_pct = self.ax_cost.twinx()
+            self._ax_cost_pct.yaxis.set_major_formatter(FuncFormatter(lambda y, _: f"{y:.1f}%"))
+            self._ax_cost_pct.tick_params(axis="y", labelcolor="blue", labelsize=8)
+            self._cost_band_collection = None
+        ax_pct = self._ax_cost_pct
         
         # 确保成本数据与x_index对齐
         if len(cost_series) == len(x_index):
@@ -3534,41 +3817,32 @@ class IntradayWindow:
             if len(non_nan) > 0:
                 prev_cost = float(non_nan.iloc[0])
         prev_cost = prev_cost or 1.0
-        pct_series = (cost_series - prev_cost) / prev_cost * 100
-        ax_pct = self.ax_cost.twinx()
-        self._ax_cost_pct = ax_pct
-        # 仅保留右侧刻度，不绘制折线，避免视觉干扰
-        ax_pct.plot(x_index, pct_series.values, alpha=0)  # 隐藏曲线
-        ax_pct.yaxis.set_major_formatter(FuncFormatter(lambda y, _: f"{y:.1f}%"))
-        ax_pct.tick_params(axis="y", labelcolor="blue", labelsize=8)
+        # 仅保留右侧刻度，不绘制折线：由成本轴范围直接换算涨幅轴范围，刻度与成本线位置一一对应
+        cost_low, cost_high = self.ax_cost.get_ylim()
+        ax_pct.set_ylim((cost_low - prev_cost) / prev_cost * 100, (cost_high - prev_cost) / prev_cost * 100)
         # 移除平均成本标签文字
         # self.ax_cost.set_ylabel("平均成本", fontsize=8)
         self.ax_cost.tick_params(axis='y', labelsize=8)
         self.ax_cost.grid(True, axis='y', linestyle="--", alpha=0.3)
         
-        # 确保X轴范围与主图一致（使用固定时间范围）
-        self._set_axis_xlim(self.ax_cost, x_times)
-        
         # 绘制分割线（如果存在上一个交易日数据）
         if split_index is not None and split_index > 0:
             self.ax_cost.axvline(x=split_index, color="black", linestyle="-", linewidth=1, alpha=0.7)
 
         # ---------- 背景色区段 ----------
-        # 仅对正涨幅区域着色，根据当前y轴上限裁剪
+        # 所有色带合并为一个PolyCollection，根据当前y轴上限裁剪并跳过不可见色带
         y_max = ax_pct.get_ylim()[1]
-        bands = [
-            (1, 3, "#FFF9D1"),   # 淡黄色
-            (3, 6, "#FFD59E"),  # 橙色(浅)
-            (6, 20, "#FFA07A"), # 橙色
-            (20, 100, "#DDA0DD") # 紫色
-        ]
-        for low, high, color in bands:
-            if low >= y_max:
-                break  # 超出可见范围
-            band_low = max(low, 0)
-            band_high = min(high, y_max)
-            if band_high > band_low:
-                ax_pct.axhspan(band_low, band_high, facecolor=color, alpha=0.2, zorder=0)
+        visible = [(max(low, 0), min(high, y_max), color)
+                   for low, high, color in self._COST_PCT_BANDS if min(high, y_max) > max(low, 0)]
+        if self._cost_band_collection is None:
+            # x方向按轴坐标铺满
+            self._cost_band_collection = ax_pct.add_collection(
+                PolyCollection([], edgecolors='none', alpha=0.2, zorder=0,
+                               transform=ax_pct.get_yaxis_transform()),
+                autolim=False)
+        self._cost_band_collection.set_verts(
+            [[(0, low), (1, low), (1, high), (0, high)] for low, high, _ in visible])
+        self._cost_band_collection.set_facecolor([color for _, _, color in visible])
 
         # ---------- 当前价相对平均成本 ----------
         try:
@@ -3583,58 +3857,117 @@ class IntradayWindow:
                 if current_cost > 0:
                     diff_pct = float((current_price - current_cost) / current_cost * 100)
                     label_color = "#E74C3C" if diff_pct >= 0 else "#2ECC71"  # 红涨绿跌
-                    self.ax_cost.text(
+                    self._axes_text(
+                        "cost_diff",
+                        self.ax_cost,
                         0.01,
                         0.95,
                         f"价差: {diff_pct:+.2f}%",
-                        transform=self.ax_cost.transAxes,
+                        label_color,
                         fontsize=8,
-                        color=label_color,
                         verticalalignment="top",
                         bbox=dict(facecolor="white", alpha=0.7, pad=2),
                     )
 
                     # 颜色说明标签 (底部显示, 字体稍大)
                     legend_y = 0.05
-                    self.ax_cost.text(
-                        0.01,
-                        legend_y,
-                        "黄色:可买入持有",
-                        transform=self.ax_cost.transAxes,
-                        fontsize=9,
-                        color="#E5A800",
-                        verticalalignment="bottom",
-                    )
-                    self.ax_cost.text(
-                        0.25,
-                        legend_y,
-                        "橙色:只当日T",
-                        transform=self.ax_cost.transAxes,
-                        fontsize=9,
-                        color="#FF8C00",
-                        verticalalignment="bottom",
-                    )
-                    self.ax_cost.text(
-                        0.45,
-                        legend_y,
-                        "红色:不可买入",
-                        transform=self.ax_cost.transAxes,
-                        fontsize=9,
-                        color="#FF0000",
-                        verticalalignment="bottom",
-                    )
+                    for key, legend_x, legend_text, legend_color in (
+                        ("cost_legend_yellow", 0.01, "黄色:可买入持有", "#E5A800"),
+                        ("cost_legend_orange", 0.25, "橙色:只当日T", "#FF8C00"),
+                        ("cost_legend_red", 0.45, "红色:不可买入", "#FF0000"),
+                    ):
+                        self._axes_text(key, self.ax_cost, legend_x, legend_y, legend_text, legend_color,
+                                        fontsize=9, verticalalignment="bottom")
         except Exception:
             pass
 
+    def _axes_text(self, key: str, ax, x: float, y: float, text: str, color: str, **kwargs) -> Text:
+        """在坐标轴相对位置显示文字，复用上次创建的Text对象
+        
+        只在首次调用时创建Text（其余属性由kwargs给定），之后仅更新文字和颜色；
+        坐标轴被clear()后Text会被移出，此时重新挂载到坐标轴上。
+        """
+        artist = self._text_artists.get(key)
+        if artist is None:
+            artist = ax.text(x, y, text, transform=ax.transAxes, color=color, **kwargs)
+            self._text_artists[key] = artist
+            return artist
+        artist.set_text(text)
+        artist.set_color(color)
+        if artist not in ax.texts:
+            ax.add_artist(artist)
+            artist.set_clip_path(ax.patch)
+        return artist
+
+    @staticmethod
+    def _first_valid(values: np.ndarray) -> Optional[int]:
+        """返回数组中第一个非NaN值的位置，全部为NaN时返回None"""
+        mask = pd.notna(values)
+        if not mask.any():
+            return None
+        return int(np.argmax(mask))
+
+    def _ensure_rsi_panel(self) -> Dict[str, Any]:
+        """创建（或在坐标轴被clear()后重建）RSI面板的常驻图元
+        
+        KDJ-D、RSI6(1min)、RSI6(5min)三条曲线每次重绘只用set_data更新数据，
+        成交量柱集合只更新顶点和颜色；超买超卖水平线和上下半部背景色不随数据变化，只创建一次。
+        """
+        artists = self._rsi_panel_artists
+        if artists is not None and artists['d'] in self.ax_rsi.lines:
+            return artists
+        ax = self.ax_rsi
+        artists = {
+            'd': ax.plot([], [], color='brown', linewidth=1, label='KDJ-D')[0],
+            'rsi1': ax.plot([], [], color='blue', linewidth=1, label='RSI6(1min)')[0],
+            'rsi5': ax.plot([], [], color='orange', linewidth=1, label='RSI6(5min)')[0],
+            # 绘制超买超卖水平线（参考ETF K线窗口的设置）
+            'line80': ax.axhline(y=80, color='red', linestyle='--', alpha=0.2, linewidth=0.8),
+            'line20': ax.axhline(y=20, color='green', linestyle='--', alpha=0.2, linewidth=0.8),
+            # 添加RSI背景色：上半部淡红色(50-100)，下半部淡绿色(0-50)
+            'span_upper': ax.axhspan(50, 100, facecolor='red', alpha=0.2, zorder=0),
+            'span_lower': ax.axhspan(0, 50, facecolor='green', alpha=0.2, zorder=0),
+            # 成交量柱：所有柱子合并为一个PolyCollection，每次重绘更新顶点和颜色
+            'volume': ax.add_collection(
+                PolyCollection([], edgecolors='none', alpha=0.6), autolim=False),
+        }
+        for artist in artists.values():
+            artist.set_visible(False)
+        self._rsi_panel_artists = artists
+        return artists
+
+    def _reset_rsi_panel(self):
+        """重绘前清理RSI面板：移除上次新建的图元，隐藏常驻图元（替代 ax_rsi.clear()）"""
+        for artist in self._rsi_dynamic_artists:
+            try:
+                artist.remove()
+            except (ValueError, NotImplementedError):
+                # 坐标轴已被clear()时图元已不在轴上
+                pass
+        self._rsi_dynamic_artists = []
+        if self._rsi_panel_artists is not None:
+            for artist in self._rsi_panel_artists.values():
+                artist.set_visible(False)
+        for key in ("rsi_1min", "rsi_5min", "kdj_d"):
+            text = self._text_artists.get(key)
+            if text is not None and text in self.ax_rsi.texts:
+                text.remove()
+        self.ax_rsi.grid(False)
+
     def _plot_rsi_panel(self, x_index, x_times, split_index=None):
         """绘制RSI面板"""
-        # 清除旧轴
-        self.ax_rsi.clear()
+        # 清除上次的图元（常驻曲线和背景保留复用）
+        self._reset_rsi_panel()
         
         # 检查RSI数据是否存在
         if self.rsi_df is None or self.rsi_df.empty:
             return
         
+        artists = self._ensure_rsi_panel()
+        for key in ('line80', 'line20', 'span_upper', 'span_lower'):
+            artists[key].set_visible(True)
+        dynamic = self._rsi_dynamic_artists
+        
         # 使用显示用的RSI数据（5分钟RSI使用线性插值）
         rsi_df_to_plot = getattr(self, 'rsi_df_display', self.rsi_df)
         
@@ -3642,102 +3975,56 @@ class IntradayWindow:
         if self.kdj_df is not None and not self.kdj_df.empty and 'D' in self.kdj_df.columns:
             d_values = self.kdj_df['D'].values
             if not pd.isna(d_values).all():
-                self.ax_rsi.plot(x_index, d_values, color='brown', linewidth=1, label='KDJ-D')
+                artists['d'].set_data(x_index, d_values)
+                artists['d'].set_visible(True)
         
-        # 绘制RSI曲线（参考ETF K线窗口的颜色设置，不使用虚线）
-        if 'RSI6_1min' in rsi_df_to_plot.columns:
-            rsi6_1min_values = rsi_df_to_plot['RSI6_1min'].values
-            if not pd.isna(rsi6_1min_values).all():
-                self.ax_rsi.plot(x_index, rsi6_1min_values, color='blue', linewidth=1, label='RSI6(1min)')
-                
-                # 在RSI6起始点添加红色小圆点标记
-                first_valid_idx = None
-                for i, val in enumerate(rsi6_1min_values):
-                    if not pd.isna(val):
-                        first_valid_idx = i
-                        break
-                
-                if first_valid_idx is not None:
-                    self.ax_rsi.plot(x_index[first_valid_idx], rsi6_1min_values[first_valid_idx], 
-                                   'ro', markersize=4, markeredgecolor='darkred', markeredgewidth=0.5,
-                                   label='RSI6起始点' if first_valid_idx == 0 else '')
-        
-        if 'RSI6_5min' in rsi_df_to_plot.columns:
-            rsi6_5min_values = rsi_df_to_plot['RSI6_5min'].values
-            if not pd.isna(rsi6_5min_values).all():
-                self.ax_rsi.plot(x_index, rsi6_5min_values, color='orange', linewidth=1, label='RSI6(5min)')
-                
-                # 在RSI6(5min)起始点添加红色小圆点标记
-                first_valid_idx = None
-                for i, val in enumerate(rsi6_5min_values):
-                    if not pd.isna(val):
-                        first_valid_idx = i
-                        break
-                
-                if first_valid_idx is not None:
-                    self.ax_rsi.plot(x_index[first_valid_idx], rsi6_5min_values[first_valid_idx], 
-                                   'ro', markersize=4, markeredgecolor='darkred', markeredgewidth=0.5,
-                                   label='RSI6(5min)起始点' if first_valid_idx == 0 else '')
+        # 绘制RSI曲线（参考ETF K线窗口的颜色设置，不使用虚线），并在起始点添加红色小圆点标记
+        for column, key, start_label in (('RSI6_1min', 'rsi1', 'RSI6起始点'),
+                                         ('RSI6_5min', 'rsi5', 'RSI6(5min)起始点')):
+            if column not in rsi_df_to_plot.columns:
+                continue
+            rsi_values = rsi_df_to_plot[column].values
+            if pd.isna(rsi_values).all():
+                continue
+            artists[key].set_data(x_index, rsi_values)
+            artists[key].set_visible(True)
+            
+            first_valid_idx = self._first_valid(rsi_values)
+            if first_valid_idx is not None:
+                dynamic.extend(self.ax_rsi.plot(
+                    x_index[first_valid_idx], rsi_values[first_valid_idx],
+                    'ro', markersize=4, markeredgecolor='darkred', markeredgewidth=0.5,
+                    label=start_label if first_valid_idx == 0 else ''))
         
 
         
         # 绘制成交量柱状图在RSI面板上
         if "volume" in self.price_df.columns:
-            volumes = self.price_df["volume"].values
+            # 成交量、收盘价、开盘价一次取出为ndarray，后续只做NumPy运算，不再按行访问DataFrame
+            volumes = self.price_df["volume"].to_numpy(dtype=np.float64)
             if len(volumes) > 0:
-                # 计算成交量颜色（红涨绿跌）
-                colors_vol = []
+                # 计算成交量颜色（红涨绿跌）：每根柱子与前一根柱子的收盘价比较
+                closes = self.price_df["close"].to_numpy(dtype=np.float64)
+                opens = self.price_df["open"].to_numpy(dtype=np.float64)
                 prev_close = self._get_previous_close_for_volume_colors()
+                if prev_close is not None:
+                    # 第一根柱子：与前一交易日收盘价比较
+                    first_ref = prev_close
+                else:
+                    # 如果无法获取前一交易日收盘价，第一根柱子使用开盘价和收盘价比较
+                    first_ref = opens[0]
                 
-                for i in range(len(volumes)):
-                    if i == 0:
-                        # 第一根柱子：与前一交易日收盘价比较
-                        if prev_close is not None:
-                            current_price = self.price_df["close"].iloc[i]
-                            is_red = current_price >= prev_close
-                            colors_vol.append("red" if is_red else "green")
-                        else:
-                            # 如果无法获取前一交易日收盘价，使用开盘价和收盘价比较
-                            is_red = self.price_df["close"].iloc[i] >= self.price_df["open"].iloc[i]
-                            colors_vol.append("red" if is_red else "green")
-                    else:
-                        # 后续柱子：与前一根柱子的收盘价比较
-                        current_price = self.price_df["close"].iloc[i]
-                        prev_price = self.price_df["close"].iloc[i-1]
-                        is_red = current_price >= prev_price
-                        colors_vol.append("red" if is_red else "green")
-                
-                # 计算成交量最大值，用于高度调整
-                max_volume = np.max(volumes) if len(volumes) > 0 else 1
-                
-                # 绘制成交量柱状图
-                # 红柱绘制在RSI80-100区域（颠倒绘制，最小值在RSI100），绿柱绘制在RSI0-20区域
-                for i, (vol, color) in enumerate(zip(volumes, colors_vol)):
-                    if vol > 0:  # 只绘制有成交量的柱子
-                        # 计算柱子高度（基于RSI水平线位置）
-                        if color == "red":
-                            # 红柱：颠倒绘制，从RSI100向下到RSI80，高度按比例调整
-                            height = (vol / max_volume) * 20  # 20是RSI80-100的区间
-                            bottom = 100 - height  # 底部在RSI100减去高度，实现颠倒绘制
-                        else:
-                            # 绿柱：从RSI0到RSI20，高度按比例调整
-                            height = (vol / max_volume) * 20  # 20是RSI0-20的区间
-                            bottom = 0  # 底部在RSI0
-                        
-                        # 绘制单个柱子
-                        self.ax_rsi.bar(i, height, bottom=bottom, color=color, alpha=0.6, width=0.8)
-        
-        # 绘制超买超卖水平线（参考ETF K线窗口的设置）
-        self.ax_rsi.axhline(y=80, color='red', linestyle='--', alpha=0.2, linewidth=0.8)
-        self.ax_rsi.axhline(y=20, color='green', linestyle='--', alpha=0.2, linewidth=0.8)
+                # 绘制成交量柱状图：只绘制有成交量的柱子，宽度0.8（数据坐标）
+                verts, bar_red = _volume_bar_verts(closes, volumes, first_ref)
+                volume_bars = artists['volume']
+                volume_bars.set_verts(verts)
+                volume_bars.set_facecolor(np.where(bar_red[:, np.newaxis], to_rgba("red"), to_rgba("green")))
+                volume_bars.set_alpha(0.6)
+                volume_bars.set_visible(True)
         
         # 设置Y轴范围
         self.ax_rsi.set_ylim(0, 100)
         
-        # 添加RSI背景色：上半部淡红色(50-100)，下半部淡绿色(0-50)
-        self.ax_rsi.axhspan(50, 100, facecolor='red', alpha=0.2, zorder=0)  # 上半部淡红色
-        self.ax_rsi.axhspan(0, 50, facecolor='green', alpha=0.2, zorder=0)   # 下半部淡绿色
-        
         # 移除RSI标签文字
         # self.ax_rsi.set_ylabel("RSI", fontsize=8)
         self.ax_rsi.tick_params(axis='y', labelsize=8)
@@ -3770,64 +4057,63 @@ class IntradayWindow:
             # 分别显示RSI数值，使用对应的线条颜色，水平并列排列
             # RSI6(1min) 使用蓝色
             rsi_1min_text = f"RSI: {latest_rsi6_1min:.1f}"
-            self.ax_rsi.text(
+            self._axes_text(
+                "rsi_1min",
+                self.ax_rsi,
                 0.01,
                 0.95,
                 rsi_1min_text,
-                transform=self.ax_rsi.transAxes,
+                'blue',  # 与RSI6(1min)线条颜色一致
                 fontsize=9,
-                color='blue',  # 与RSI6(1min)线条颜色一致
                 verticalalignment="top",
                 bbox=dict(facecolor="white", alpha=0.7, pad=2)
             )
             
             # RSI6(5min) 使用紫色，水平并列排列
             rsi_5min_text = f"{latest_rsi6_5min:.1f}"
-            self.ax_rsi.text(
+            self._axes_text(
+                "rsi_5min",
+                self.ax_rsi,
                 0.20,  # 水平向右移动，与RSI6(1min)并列
                 0.95,
                 rsi_5min_text,
-                transform=self.ax_rsi.transAxes,
+                'orange',  # 与RSI6(5min)线条颜色一致
                 fontsize=9,
-                color='orange',  # 与RSI6(5min)线条颜色一致
                 verticalalignment="top",
                 bbox=dict(facecolor="white", alpha=0.7, pad=2)
             )
             
             # KDJ D值 使用褐色，水平并列排列
             d_text = f"D: {latest_d_value:.1f}"
-            self.ax_rsi.text(
+            self._axes_text(
+                "kdj_d",
+                self.ax_rsi,
                 0.40,  # 水平向右移动，与RSI6(5min)并列
                 0.95,
                 d_text,
-                transform=self.ax_rsi.transAxes,
+                'brown',  # 与KDJ-D线条颜色一致
                 fontsize=9,
-                color='brown',  # 与KDJ-D线条颜色一致
                 verticalalignment="top",
                 bbox=dict(facecolor="white", alpha=0.7, pad=2)
             )
         
-        # 确保X轴范围与主图一致（使用固定时间范围）
-        self._set_axis_xlim(self.ax_rsi, x_times)
-        
         # 绘制分割线（如果存在上一个交易日数据）
         if split_index is not None and split_index > 0:
-            self.ax_rsi.axvline(x=split_index, color="black", linestyle="-", linewidth=1, alpha=0.7)
+            dynamic.append(self.ax_rsi.axvline(x=split_index, color="black", linestyle="-", linewidth=1, alpha=0.7))
 
 
 
     def _get_cost_series(self, target_times):
         """返回与 target_times 对齐的平均成本序列，缺失值处理"""
         if self.cost_df is None or self.cost_df.empty:
-            series = pd.Series(index=target_times, data=np.nan)
-        else:
-            df = self.cost_df.copy()
-            df.set_index("time", inplace=True)
-            series = df["cost"].reindex(target_times)
-
-
-
-        return series
+            return pd.Series(index=target_times, data=np.nan)
+        # 按位置对齐：get_indexer 给出每个目标时间在成本时间中的位置（缺失为-1），无需复制整表再重建索引
+        cost_times = pd.DatetimeIndex(self.cost_df["time"].to_numpy())
+        positions = cost_times.get_indexer(pd.DatetimeIndex(target_times))
+        values = np.full(len(positions), np.nan)
+        found = positions >= 0
+        values[found] = self.cost_df["cost"].to_numpy(dtype=np.float64)[positions[found]]
+        return pd.Series(values, index=target_times)
 
     # ---------  获取平均成本辅助 ----------
 
@@ -3844,13 +4130,21 @@ class IntradayWindow:
             while prev_date.weekday() >= 5:
                 prev_date -= timedelta(days=1)
 
-            cyq_df = ak.stock_cyq_em(symbol=self.code, adjust="qfq")
+            # 历史交易日的平均成本不再变化，按(代码, 日期)缓存
+            key = (self.code, prev_date)
+            cached = self._prev_trade_cost_cache.get(key)
+            if cached is not None:
+                return cached
+
+            cyq_df = _fetch_cyq(self.code)
             if cyq_df.empty:
                 return None
-            cyq_df["日期"] = pd.to_datetime(cyq_df["日期"])
-            row = cyq_df[cyq_df["日期"] == pd.Timestamp(prev_date)]
+            # 缓存的DataFrame为共享对象，不原地修改
+            row = cyq_df[pd.to_datetime(cyq_df["日期"]) == pd.Timestamp(prev_date)]
             if not row.empty:
-                return float(row.iloc[-1]["平均成本"])
+                prev_cost = float(row.iloc[-1]["平均成本"])
+                self._prev_trade_cost_cache[key] = prev_cost
+                return prev_cost
         except Exception:
             pass
         return None
@@ -3859,117 +4153,72 @@ class IntradayWindow:
 
 
 
-    def _set_axis_xlim(self, ax, x_times):
-        """设置轴的x轴范围，固定显示完整交易时间段 09:30-11:30, 13:00-15:00"""
-        if ax is None:
-            return
-            
-        # 固定时间范围：上午 09:30-11:30，下午 13:00-15:00
-        morning_start = datetime.strptime("09:30", "%H:%M").time()
-        morning_end = datetime.strptime("11:30", "%H:%M").time()
-        afternoon_start = datetime.strptime("13:00", "%H:%M").time()
-        afternoon_end = datetime.strptime("15:00", "%H:%M").time()
-
-        def _is_in_display_range(ts: datetime) -> bool:
-            """判断时间是否在显示范围内（上午或下午交易时段）"""
-            ts_time = ts.time()
-            # 判断是否在上午时段 09:30-11:30 或下午时段 13:00-15:00
-            in_morning = morning_start <= ts_time <= morning_end
-            in_afternoon = afternoon_start <= ts_time <= afternoon_end
-            return in_morning or in_afternoon
-
-        # 计算显示范围对应的x轴范围
-        display_start_idx = None
-        display_end_idx = None
-        
-        for i, ts in enumerate(x_times):
-            if _is_in_display_range(ts):
-                if display_start_idx is None:
-                    display_start_idx = i
-                display_end_idx = i
-        
-        # 如果找不到显示范围的数据，使用默认范围
-        if display_start_idx is None:
-            display_start_idx = 0
-        if display_end_idx is None:
-            display_end_idx = len(x_times) - 1
-            
-        ax.set_xlim(display_start_idx, display_end_idx)
-
     def _draw_time_grid(self, x_index, x_times):
         """绘制时间轴刻度(每30分钟)，固定显示完整交易时间段 09:30-11:30, 13:00-15:00"""
-        tick_positions: list[int] = []
-        tick_labels: list[str] = []
-        
-        # 固定时间范围：上午 09:30-11:30，下午 13:00-15:00
-        morning_start = datetime.strptime("09:30", "%H:%M").time()
-        morning_end = datetime.strptime("11:30", "%H:%M").time()
-        afternoon_start = datetime.strptime("13:00", "%H:%M").time()
-        afternoon_end = datetime.strptime("15:00", "%H:%M").time()
-
-        def _is_in_display_range(ts: datetime) -> bool:
-            """判断时间是否在显示范围内（上午或下午交易时段）"""
-            ts_time = ts.time()
-            # 判断是否在上午时段 09:30-11:30 或下午时段 13:00-15:00
-            in_morning = morning_start <= ts_time <= morning_end
-            in_afternoon = afternoon_start <= ts_time <= afternoon_end
-            return in_morning or in_afternoon
-
-        def _is_tick_time(ts: datetime) -> bool:
-            """判断是否为刻度时间（每30分钟）"""
-            return ts.minute % 30 == 0 and ts.second == 0
-
-        # 生成刻度位置和标签
-        for i, ts in enumerate(x_times):
-            if not _is_in_display_range(ts):
-                continue
-            if _is_tick_time(ts):
-                tick_positions.append(i)
-                tick_labels.append(f"{ts.hour}:{ts.minute:02d}")
-
-        # 计算显示范围对应的x轴范围
-        display_start_idx = None
-        display_end_idx = None
-        
-        for i, ts in enumerate(x_times):
-            if _is_in_display_range(ts):
-                if display_start_idx is None:
-                    display_start_idx = i
-                display_end_idx = i
-        
-        # 如果找不到显示范围的数据，使用默认范围
-        if display_start_idx is None:
-            display_start_idx = 0
-        if display_end_idx is None:
-            display_end_idx = len(x_times) - 1
-            
-        print(f"[DEBUG] 显示范围索引: {display_start_idx} - {display_end_idx}")
-
-        # 设置X轴范围
-        for ax in (self.ax_price, self.ax_cost, self.ax_rsi):
-            if ax is None:
-                continue
-            ax.set_xlim(display_start_idx, display_end_idx)
-            ax.set_xticks(tick_positions)
-            # 只在最底部的RSI子图显示时间标签
-            if ax is self.ax_rsi:
-                ax.set_xticklabels(tick_labels, rotation=0, fontsize=8)
-                ax.tick_params(axis='x', labelbottom=True)
-            else:
-                ax.set_xticklabels([])
-                ax.tick_params(axis='x', labelbottom=False)
-                # 强制隐藏可能残留的刻度标签
-                for lbl in ax.get_xticklabels():
-                    lbl.set_visible(False)
+        tick_positions, tick_labels, display_start_idx, display_end_idx, marker_idx = \
+            self._time_grid_layout(x_times)
+        log.debug("显示范围索引: %s - %s", display_start_idx, display_end_idx)
+
+        # 成本图与RSI图创建时sharex=self.ax_price，X轴范围和刻度定位/格式化器在三个子图间共享，
+        # 只需设置一次；各子图仅需决定是否显示刻度标签
+        self.ax_price.set_xlim(display_start_idx, display_end_idx)
+        self.ax_rsi.set_xticks(tick_positions)
+        # 只在最底部的RSI子图显示时间标签
+        self.ax_rsi.set_xticklabels(tick_labels, rotation=0, fontsize=8)
+        self.ax_rsi.tick_params(axis='x', labelbottom=True)
+        for ax in (self.ax_price, self.ax_cost):
+            ax.tick_params(axis='x', labelbottom=False)
 
         # -------- 强调10:30垂直线 (仅成本图; 不在价格/成交量子图绘制垂直线) --------
-        try:
-            for i, ts in enumerate(x_times):
-                if ts.hour == 10 and ts.minute == 15:
-                    self.ax_cost.axvline(i, color="black", linewidth=1, alpha=0.7, zorder=2)
-                    break
-        except Exception:
-            pass
+        if marker_idx is not None:
+            try:
+                self.ax_cost.axvline(marker_idx, color="black", linewidth=1, alpha=0.7, zorder=2)
+            except Exception:
+                pass
+
+    def _time_grid_layout(self, x_times: pd.DatetimeIndex) -> tuple:
+        """计算时间轴刻度位置、标签、显示范围和成本图强调线位置
+        
+        同一交易日的时间索引在多次重绘间基本不变，按(长度, 首个时间, 最后时间)缓存结果。
+        
+        :return: (刻度位置, 刻度标签, 显示起始索引, 显示结束索引, 强调线索引或None)
+        """
+        key = (len(x_times), x_times[0], x_times[-1]) if len(x_times) else (0, None, None)
+        if self._time_grid_cache is not None and self._time_grid_cache[0] == key:
+            return self._time_grid_cache[1]
+
+        def _seconds(t: dtime) -> int:
+            return t.hour * 3600 + t.minute * 60 + t.second
+
+        hours = np.asarray(x_times.hour)
+        minutes = np.asarray(x_times.minute)
+        seconds = np.asarray(x_times.second)
+        day_seconds = hours * 3600 + minutes * 60 + seconds
+        
+        # 上午时段 09:30-11:30 或下午时段 13:00-15:00 内的数据参与显示
+        in_display = (
+            ((day_seconds >= _seconds(_MORNING_START)) & (day_seconds <= _seconds(_MORNING_END)))
+            | ((day_seconds >= _seconds(_AFTERNOON_START)) & (day_seconds <= _seconds(_AFTERNOON_END)))
+        )
+        
+        # 刻度：显示范围内每30分钟整点
+        tick_idx = np.flatnonzero(in_display & (minutes % 30 == 0) & (seconds == 0))
+        tick_positions = tick_idx.tolist()
+        tick_labels = [f"{h}:{m:02d}" for h, m in zip(hours[tick_idx].tolist(), minutes[tick_idx].tolist())]
+        
+        # 显示范围对应的x轴范围，找不到时使用默认范围
+        display_idx = np.flatnonzero(in_display)
+        if display_idx.size:
+            display_start_idx, display_end_idx = int(display_idx[0]), int(display_idx[-1])
+        else:
+            display_start_idx, display_end_idx = 0, len(x_times) - 1
+        
+        marker_hits = np.flatnonzero((hours == _COST_MARKER_TIME.hour) & (minutes == _COST_MARKER_TIME.minute))
+        marker_idx = int(marker_hits[0]) if marker_hits.size else None
+        
+        layout = (tick_positions, tick_labels, display_start_idx, display_end_idx, marker_idx)
+        self._time_grid_cache = (key, layout)
+        return layout
 
     # ------------------------------------------------------------------
     # UI Callbacks
@@ -3977,194 +4226,171 @@ class IntradayWindow:
     # 交易日导航
     # ------------------------------------------------------------------
     def _load_trade_calendar(self):
-        """加载交易日历返回set[date]"""
+        """加载交易日历返回set[date]（同一天内各窗口共用一次请求）"""
         try:
-            cal_df = ak.tool_trade_date_hist_sina()
-            cal_df['trade_date'] = pd.to_datetime(cal_df['trade_date']).dt.date
-            if 'is_trading_day' in cal_df.columns:
-                cal_df = cal_df[cal_df['is_trading_day'] == 1]
-            return set(cal_df['trade_date'])
+            return _cached_trade_calendar(date.today().toordinal())
         except Exception:
             return set()
 
+    @property
+    def _trade_calendar(self) -> set:
+        """交易日历(set[date])"""
+        return getattr(self, '_trade_calendar_set', set())
+
+    @_trade_calendar.setter
+    def _trade_calendar(self, value: set):
+        # 重新赋值时使排序缓存失效
+        self._trade_calendar_set = value
+        self._prev_date_str_cache: Optional[tuple] = None
+        self._sorted_cal: Optional[List[date]] = None
+        self._busday_cal: Optional[np.busdaycalendar] = None
+
+    def _sorted_calendar(self) -> List[date]:
+        """返回排序后的交易日历（首次使用时排序并缓存）"""
+        if self._sorted_cal is None:
+            self._sorted_cal = sorted(self._trade_calendar)
+        return self._sorted_cal
+
+    def _busday_calendar(self) -> np.busdaycalendar:
+        """由交易日历构造numpy工作日历：日历范围内未开市的工作日视为节假日"""
+        if self._busday_cal is None:
+            # 在datetime64[D]数组上向量化求差集：日历范围内的工作日去掉交易日即为节假日
+            trade_days = np.array(self._sorted_calendar(), dtype='datetime64[D]')
+            holidays = trade_days[:0]
+            if trade_days.size:
+                all_days = np.arange(trade_days[0], trade_days[-1] + 1, dtype='datetime64[D]')
+                holidays = np.setdiff1d(all_days[np.is_busday(all_days)], trade_days, assume_unique=True)
+            self._busday_cal = np.busdaycalendar(holidays=holidays)
+        return self._busday_cal
+
+    def _prev_trade_date(self, d: date, n: int = 1) -> date:
+        """返回d之前第n个交易日（跳过周末及交易日历中的节假日）"""
+        prev = np.busday_offset(np.datetime64(d, 'D'), -n, roll='forward', busdaycal=self._busday_calendar())
+        return prev.astype(date)
+
+    def _prev_trade_date_str(self) -> str:
+        """当前交易日的前一交易日(YYYY-MM-DD)，按交易日缓存，前收盘价、前一日分时与布林带共用"""
+        cached = self._prev_date_str_cache
+        if cached is None or cached[0] != self.trade_date:
+            cached = (self.trade_date, self._prev_trade_date(self.trade_date).isoformat())
+            self._prev_date_str_cache = cached
+        return cached[1]
+
+    def _calendar_index(self, d: date) -> int:
+        """二分查找日期在排序交易日历中的位置，不在日历中返回-1"""
+        sorted_cal = self._sorted_calendar()
+        idx = bisect.bisect_left(sorted_cal, d)
+        if idx < len(sorted_cal) and sorted_cal[idx] == d:
+            return idx
+        return -1
+
     def _get_adjacent_trade_date(self, current: date, step: int) -> Optional[date]:
-        """step= -1 previous, 1 next; 返回相邻交易日"""
-        cal = self._trade_calendar
-        if not cal:
-            return None
-        d = current
-        while True:
-            d = d + timedelta(days=step)
-            if d in cal:
-                return d
-            # 边界：超出当前日历范围
-            if (step == -1 and d < min(cal)) or (step == 1 and d > max(cal)):
-                return None
+        """step= -1 previous, 1 next; 返回相邻交易日
+        
+        在排序交易日历上二分查找，current不必是交易日；超出日历范围返回None。
+        """
+        sorted_cal = self._sorted_calendar()
+        if step < 0:
+            idx = bisect.bisect_left(sorted_cal, current)
+            return sorted_cal[idx - 1] if idx > 0 else None
+        idx = bisect.bisect_right(sorted_cal, current)
+        return sorted_cal[idx] if idx < len(sorted_cal) else None
+
+    # 切换交易日时需清空的逐日数据缓存（置None）与计算标记（置False）
+    _DAY_CACHE_FIELDS = (
+        # 均线价格
+        'ma5_price', 'ma10_price', 'ma20_price',
+        # RSI/KDJ与移动平均线数据
+        'rsi_df', 'kdj_df', 'ma_short_values', 'ma_mid_values', 'ma_base_values',
+        # 信号延迟检查状态
+        'buy_signal_pending', 'sell_signal_pending', 'buy_signal_last_check', 'sell_signal_last_check',
+        # 支撑位与压力位
+        'support_level', 'resistance_level', 'support_type', 'resistance_type', 'position_status',
+        # 前高与前低
+        'previous_high_price', 'previous_high_dual_prices', 'previous_low_price', 'previous_low_dual_prices',
+        # 看涨线与看跌线
+        'bullish_line_price', 'bearish_line_price',
+    )
+    _DAY_CACHE_FLAGS = (
+        '_support_resistance_calculated', '_previous_high_calculated', '_previous_low_calculated',
+        '_bullish_line_calculated', '_bearish_line_calculated',
+    )
+
+    def _invalidate_day_caches(self):
+        """清空与交易日相关的数据缓存和计算标记，强制按新交易日重新获取/计算"""
+        for name in self._DAY_CACHE_FIELDS:
+            setattr(self, name, None)
+        for name in self._DAY_CACHE_FLAGS:
+            setattr(self, name, False)
+        # 清空分时买卖信号数据缓存
+        self.buy_signals = []
+        self.sell_signals = []
+        # 清空分时信号管理器的待确认信号并重置所有信号状态
+        self.signal_manager.clear_pending_signals()
+        self.signal_manager.reset_all_signal_states()
+        # 作废尚在排队的后台支撑位压力位计算；已在执行的结果回到主线程时按代码与交易日校验后丢弃
+        with self._sr_lock:
+            if self._sr_future is not None:
+                self._sr_future.cancel()
+                self._sr_future = None
+                self._sr_future_ctx = None
+        # 前一交易日收盘价缓存键已含交易日，历史收盘价不再变化，切换交易日时保留，来回翻页无需重新请求
+
+    def _change_day(self, step: int):
+        """切换到相邻交易日（step=-1 前一天，1 后一天）并重新加载数据"""
+        new_date = self._get_adjacent_trade_date(self.trade_date, step)
+        if not new_date:
+            return
+        self.trade_date = new_date
+        self.trade_date_str = self.trade_date.isoformat()
+        
+        # 更新日期标签
+        if hasattr(self, 'date_label') and self.date_label:
+            self.date_label.config(text=self.trade_date_str)
+        
+        # 通知日K线图更新垂直贯穿线位置
+        if self.on_date_change_callback:
+            try:
+                self.on_date_change_callback(self.trade_date_str)
+            except Exception as e:
+                log.exception("调用日期变化回调函数失败: %s", e)
+        
+        # 重建缓存路径并加载
+        self.cost_cache_file = os.path.join(
+            self.cache_dir,
+            f"intraday_cost_{self.code}_{self.trade_date_str}.csv",
+        )
+        self._load_cached_cost()
+        self._invalidate_day_caches()
+        
+        self._update_nav_buttons()
+        # 数据获取与各项指标计算均为网络I/O，在后台线程执行，完成后由 _update_data 通过 after 回到主线程绘图
+        self._submit_update(new_context=True)
 
     def _on_prev_day(self):
-        new_date = self._get_adjacent_trade_date(self.trade_date, -1)
-        if new_date:
-            self.trade_date = new_date
-            self.trade_date_str = self.trade_date.strftime("%Y-%m-%d")
-            
-            # 更新日期标签
-            if hasattr(self, 'date_label') and self.date_label:
-                self.date_label.config(text=self.trade_date_str)
-            
-            # 通知日K线图更新垂直贯穿线位置
-            if self.on_date_change_callback:
-                try:
-                    self.on_date_change_callback(self.trade_date_str)
-                except Exception as e:
-                    print(f"调用日期变化回调函数失败: {e}")
-            
-            # 重建缓存路径并加载
-            self.cost_cache_file = os.path.join(
-                self.cache_dir,
-                f"intraday_cost_{self.code}_{self.trade_date_str}.csv",
-            )
-            self._load_cached_cost()
-            # 清空均线价格缓存，强制重新获取
-            self.ma5_price = None
-            self.ma10_price = None
-            self.ma20_price = None
-            # 清空RSI数据缓存
-            self.rsi_df = None
-            self.kdj_df = None
-            # 清空移动平均线数据缓存
-            self.ma_short_values = None
-            self.ma_mid_values = None
-            self.ma_base_values = None
-            # 清空分时买入信号数据缓存
-            self.buy_signals = []
-            # 清空分时卖出信号数据缓存
-            self.sell_signals = []
-            # 清除延迟检查状态
-            self.buy_signal_pending = None
-            self.sell_signal_pending = None
-            self.buy_signal_last_check = None
-            self.sell_signal_last_check = None
-            # 清空分时信号管理器的待确认信号并重置所有信号状态
-            self.signal_manager.clear_pending_signals()
-            self.signal_manager.reset_all_signal_states()
-            
-            # 新增：清空支撑位和压力位数据，强制重新计算
-            self.support_level = None
-            self.resistance_level = None
-            self.support_type = None
-            self.resistance_type = None
-            self.position_status = None
-            self._support_resistance_calculated = False  # 重置计算标记
-            
-            # 新增：清空前高价格数据，强制重新计算
-            self.previous_high_price = None
-            self.previous_high_dual_prices = None
-            self._previous_high_calculated = False
-            
-            # 新增：清空前低价格数据，强制重新计算
-            self.previous_low_price = None
-            self.previous_low_dual_prices = None
-            self._previous_low_calculated = False
-            
-            # 新增：清空看涨线和看跌线数据，强制重新计算
-            self.bullish_line_price = None
-            self._bullish_line_calculated = False
-            self.bearish_line_price = None
-            self._bearish_line_calculated = False
-            
-            # 清空前一交易日收盘价缓存
-            self._cached_previous_close = None
-            self._cached_previous_close_date = None
-            
-            self._update_nav_buttons()
-            self._update_data()
+        self._change_day(-1)
 
     def _on_next_day(self):
-        new_date = self._get_adjacent_trade_date(self.trade_date, 1)
-        if new_date:
-            self.trade_date = new_date
-            self.trade_date_str = self.trade_date.strftime("%Y-%m-%d")
-            
-            # 更新日期标签
-            if hasattr(self, 'date_label') and self.date_label:
-                self.date_label.config(text=self.trade_date_str)
-            
-            # 通知日K线图更新垂直贯穿线位置
-            if self.on_date_change_callback:
-                try:
-                    self.on_date_change_callback(self.trade_date_str)
-                except Exception as e:
-                    print(f"调用日期变化回调函数失败: {e}")
-            
-            self.cost_cache_file = os.path.join(
-                self.cache_dir,
-                f"intraday_cost_{self.code}_{self.trade_date_str}.csv",
-            )
-            self._load_cached_cost()
-            # 清空均线价格缓存，强制重新获取
-            self.ma5_price = None
-            self.ma10_price = None
-            self.ma20_price = None
-            # 清空RSI数据缓存
-            self.rsi_df = None
-            self.kdj_df = None
-            # 清空移动平均线数据缓存
-            self.ma_short_values = None
-            self.ma_mid_values = None
-            self.ma_base_values = None
-            # 清空分时买入信号数据缓存
-            self.buy_signals = []
-            # 清空分时卖出信号数据缓存
-            self.sell_signals = []
-            # 清除延迟检查状态
-            self.buy_signal_pending = None
-            self.sell_signal_pending = None
-            self.buy_signal_last_check = None
-            self.sell_signal_last_check = None
-            
-            # 新增：清空支撑位和压力位数据，强制重新计算
-            self.support_level = None
-            self.resistance_level = None
-            self.support_type = None
-            self.resistance_type = None
-            self.position_status = None
-            self._support_resistance_calculated = False  # 重置计算标记
-            
-            # 新增：清空前高和前低价格数据，强制重新计算
-            self.previous_high_price = None
-            self.previous_high_dual_prices = None
-            self._previous_high_calculated = False
-            self.previous_low_price = None
-            self.previous_low_dual_prices = None
-            self._previous_low_calculated = False
-            
-            # 新增：清空看涨线和看跌线数据，强制重新计算
-            self.bullish_line_price = None
-            self._bullish_line_calculated = False
-            self.bearish_line_price = None
-            self._bearish_line_calculated = False
-            
-            # 清空前一交易日收盘价缓存
-            self._cached_previous_close = None
-            self._cached_previous_close_date = None
-            
-            self._update_nav_buttons()
-            self._update_data()
+        self._change_day(1)
 
     def _update_nav_buttons(self):
         # 检查按钮是否存在
         if self.prev_btn is None or self.next_btn is None:
             return
             
+        has_prev, has_next = self._nav_flags()
+        self.prev_btn.config(state=tk.NORMAL if has_prev else tk.DISABLED)
+        self.next_btn.config(state=tk.NORMAL if has_next else tk.DISABLED)
+
+    def _nav_flags(self) -> Tuple[bool, bool]:
+        """一次二分查找得到(前一交易日是否存在, 后一交易日是否存在且不晚于最新交易日)"""
+        sorted_cal = self._sorted_calendar()
+        has_prev = bisect.bisect_left(sorted_cal, self.trade_date) > 0
         latest = self._get_latest_trade_date()
-        # 前一天是否存在
-        self.prev_btn.config(state=tk.NORMAL if self._get_adjacent_trade_date(self.trade_date, -1) else tk.DISABLED)
-        # 后一天存在且不超过最新
         if self.trade_date >= latest:
-            self.next_btn.config(state=tk.DISABLED)
-        else:
-            has_next = self._get_adjacent_trade_date(self.trade_date, 1) is not None
-            self.next_btn.config(state=tk.NORMAL if has_next else tk.DISABLED)
+            return has_prev, False
+        next_idx = bisect.bisect_right(sorted_cal, self.trade_date)
+        return has_prev, next_idx < len(sorted_cal) and sorted_cal[next_idx] <= latest
 
     # ------------------------------------------------------------------
     # 公共接口
@@ -4175,21 +4401,11 @@ class IntradayWindow:
             self.window.focus_force()
 
     def _get_latest_trade_date(self) -> date:
-        """自动探测最近一个交易日"""
+        """自动探测最近一个交易日（同一天内复用交易日历请求与计算结果）"""
         try:
-            cal_df = ak.tool_trade_date_hist_sina()
-            cal_df['trade_date'] = pd.to_datetime(cal_df['trade_date'])
-            # 过滤至今天之前(含今天)
-            cal_df = cal_df[cal_df['trade_date'] <= pd.Timestamp(date.today())]
-            # 若有交易日标记列, 仅保留交易日
-            if 'is_trading_day' in cal_df.columns:
-                cal_df = cal_df[cal_df['is_trading_day'] == 1]
-            latest = cal_df['trade_date'].max()
-            if pd.isna(latest):
-                raise ValueError("未找到交易日历数据")
-            return latest.date()
+            return _cached_latest_trade_date(date.today().toordinal())
         except Exception as _:
-            # 回退: 若周末则取最近周五
+            # 回退: 交易日历不可用（节假日已由日历索引处理，此处只能按周末推算），若周末则取最近周五
             today = date.today()
             weekday = today.weekday()  # 0=Mon
             if weekday >= 5:  # Sat/Sun
@@ -4197,165 +4413,47 @@ class IntradayWindow:
             return today
 
     def _calculate_previous_high_low_prices(self):
-        """计算前高前低价格（带缓存机制）"""
-        try:
-            # 检查缓存键是否变化
-            self._check_cache_key_change()
-            
-            # 尝试从缓存获取前高价格
-            cached_previous_high = self._get_cached_data('previous_high')
-            if cached_previous_high is not None:
-                print(f"[DEBUG] 从缓存获取前高价格: {cached_previous_high}")
-                self.previous_high_price = cached_previous_high.get('price')
-                self.previous_high_dual_prices = cached_previous_high.get('dual_prices')
-                self._previous_high_calculated = True
-                return
-            
-            # 计算前高价格（双价格）
-            if not hasattr(self, '_previous_high_calculated') or not self._previous_high_calculated:
-                try:
-                    from trading_utils import get_previous_high_dual_prices
-                    
-                    print(f"[DEBUG] 分时窗口 - 开始计算前高双价格: {self.code}")
-                    
-                    # 计算前高双价格（历史数据）
-                    security_type, symbol = self._get_security_type(self.code)
-                    
-                    dual_prices = get_previous_high_dual_prices(
-                        symbol=symbol,
-                        current_date=self.trade_date_str,
-                        months_back=12,  # 改为1年（12个月）
-                        security_type=security_type
-                    )
-                    
-                    if "error" not in dual_prices:
-                        self.previous_high_dual_prices = dual_prices
-                        self.previous_high_price = dual_prices['shadow_high_price']  # 保持兼容性
-                        
-                        print(f"[DEBUG] 分时窗口 - 前高双价格:")
-                        print(f"[DEBUG]   当前价格: {dual_prices['current_price']:.3f}")
-                        print(f"[DEBUG]   上影线最高价: {dual_prices['shadow_high_price']:.3f}")
-                        print(f"[DEBUG]   实体最高价: {dual_prices['entity_high_price']:.3f}")
-                        
-                        if dual_prices['resistance_band']:
-                            band = dual_prices['resistance_band']
-                            print(f"[DEBUG]   阻力带: {band['lower']:.3f} - {band['upper']:.3f}")
-                            print(f"[DEBUG]   阻力带日期: {band['date']}")
-                    else:
-                        print(f"[DEBUG] 分时窗口 - 前高双价格计算失败: {dual_prices['error']}")
-                        self.previous_high_dual_prices = None
-                        self.previous_high_price = None
-                    
-                    # 缓存前高价格结果
-                    if self.previous_high_price is not None:
-                        high_cache_data = {
-                            'price': self.previous_high_price,
-                            'dual_prices': self.previous_high_dual_prices
-                        }
-                        self._set_cached_data('previous_high', high_cache_data)
-                        print(f"[DEBUG] 前高价格已缓存: {high_cache_data}")
-                    
-                    self._previous_high_calculated = True
-                    
-                except Exception as e:
-                    print(f"[DEBUG] 分时窗口 - 计算前高双价格失败: {e}")
-                    self.previous_high_dual_prices = None
-                    self.previous_high_price = None
-                    self._previous_high_calculated = True
-
-            # 尝试从缓存获取前低价格
-            cached_previous_low = self._get_cached_data('previous_low')
-            if cached_previous_low is not None:
-                print(f"[DEBUG] 从缓存获取前低价格: {cached_previous_low}")
-                self.previous_low_price = cached_previous_low.get('price')
-                self.previous_low_dual_prices = cached_previous_low.get('dual_prices')
-                self._previous_low_calculated = True
-                return
+        """计算前高前低价格（带缓存机制），前高与前低各自判断是否需要计算"""
+        self._compute_prev_extreme('high')
+        self._compute_prev_extreme('low')
+
+    def _prev_day_bollinger(self, window: int = 20) -> Optional[Tuple[str, pd.Series, pd.Series]]:
+        """计算前一个交易日的1分钟布林带上下轨（看涨线与看跌线共用）
+        
+        前一交易日按交易日历计算（跳过周末及节假日），结果按(代码, 交易日, 窗口)缓存。
+        看涨线与看跌线在并发任务中同时调用，整个计算加锁，后到的调用等待并命中缓存，只请求一次分时数据。
+        
+        :return: (前一交易日字符串, 上轨, 下轨)；不支持的证券类型返回None；未获取到分时数据时抛出异常，不缓存
+        """
+        with self._prev_day_boll_lock:
+            key = (self.code, self.trade_date, window)
+            cached = self._prev_day_boll_cache
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            
+            security_type, symbol = self._sec()
+            if security_type not in ("STOCK", "ETF"):
+                return None
+            prev_date_str = self._prev_trade_date(key[1]).isoformat()
+            prev_close = _cached_day_min_close(security_type, symbol, prev_date_str)
             
-            # 计算前低价格（双价格）
-            if not hasattr(self, '_previous_low_calculated') or not self._previous_low_calculated:
-                try:
-                    from trading_utils import get_previous_low_dual_prices
-                    
-                    print(f"[DEBUG] 分时窗口 - 开始计算前低双价格: {self.code}")
-                    
-                    # 计算前低双价格
-                    security_type, symbol = self._get_security_type(self.code)
-                    
-                    dual_prices = get_previous_low_dual_prices(
-                        symbol=symbol,
-                        current_date=self.trade_date_str,
-                        months_back=12,  # 1年（12个月）
-                        security_type=security_type
-                    )
-                    
-                    if "error" not in dual_prices:
-                        # 获取上个交易日收盘价进行验证
-                        prev_close = self._get_previous_close()
-                        
-                        # 验证前低不能高于上个交易日收盘价
-                        entity_low_price = dual_prices['entity_low_price']
-                        shadow_low_price = dual_prices['shadow_low_price']
-                        
-                        if prev_close is not None:
-                            if entity_low_price > prev_close:
-                                print(f"[WARNING] 前低实体最低价({entity_low_price:.3f})高于上个交易日收盘价({prev_close:.3f})，跳过前低计算")
-                                self.previous_low_dual_prices = None
-                                self.previous_low_price = None
-                            elif shadow_low_price > prev_close:
-                                print(f"[WARNING] 前低下影线最低价({shadow_low_price:.3f})高于上个交易日收盘价({prev_close:.3f})，跳过前低计算")
-                                self.previous_low_dual_prices = None
-                                self.previous_low_price = None
-                            else:
-                                # 前低验证通过，保存数据
-                                self.previous_low_dual_prices = dual_prices
-                                self.previous_low_price = dual_prices['shadow_low_price']  # 保持兼容性
-                                
-                                print(f"[DEBUG] 分时窗口 - 前低双价格验证通过:")
-                                print(f"[DEBUG]   上个交易日收盘价: {prev_close:.3f}")
-                                print(f"[DEBUG]   当前价格: {dual_prices['current_price']:.3f}")
-                                print(f"[DEBUG]   下影线最低价: {dual_prices['shadow_low_price']:.3f}")
-                                print(f"[DEBUG]   实体最低价: {dual_prices['entity_low_price']:.3f}")
-                        else:
-                            print(f"[WARNING] 无法获取上个交易日收盘价，跳过前低验证")
-                            # 无法验证时，仍然保存数据但给出警告
-                            self.previous_low_dual_prices = dual_prices
-                            self.previous_low_price = dual_prices['shadow_low_price']
-                    else:
-                        print(f"[DEBUG] 分时窗口 - 前低双价格计算失败: {dual_prices['error']}")
-                        self.previous_low_dual_prices = None
-                        self.previous_low_price = None
-                    
-                    # 缓存前低价格结果
-                    if self.previous_low_price is not None:
-                        low_cache_data = {
-                            'price': self.previous_low_price,
-                            'dual_prices': self.previous_low_dual_prices
-                        }
-                        self._set_cached_data('previous_low', low_cache_data)
-                        print(f"[DEBUG] 前低价格已缓存: {low_cache_data}")
-                    
-                    self._previous_low_calculated = True
-                    
-                except Exception as e:
-                    print(f"[DEBUG] 分时窗口 - 计算前低双价格失败: {e}")
-                    self.previous_low_dual_prices = None
-                    self.previous_low_price = None
-                    self._previous_low_calculated = True
-                    
-        except Exception as e:
-            print(f"[DEBUG] 计算前高前低价格失败: {e}")
+            ma, std = rolling_mean_std(prev_close.to_numpy(dtype=np.float64), window)
+            result = (prev_date_str,
+                      pd.Series(ma + 2 * std, index=prev_close.index),
+                      pd.Series(ma - 2 * std, index=prev_close.index))
+            self._prev_day_boll_cache = (key, result)
+            return result
 
     def _calculate_bullish_line(self):
         """计算看涨线（上个交易日布林带最高点）（带缓存机制）"""
         try:
             # 检查缓存键是否变化
-            self._check_cache_key_change()
+            cache_key = self._check_cache_key_change()
             
             # 尝试从缓存获取
-            cached_bullish_line = self._get_cached_data('bullish_line')
+            cached_bullish_line = self._get_cached_data('bullish_line', cache_key)
             if cached_bullish_line is not None:
-                print(f"[DEBUG] 从缓存获取看涨线价格: {cached_bullish_line}")
+                log.debug("从缓存获取看涨线价格: %s", cached_bullish_line)
                 self.bullish_line_price = cached_bullish_line
                 self._bullish_line_calculated = True
                 return
@@ -4363,69 +4461,13 @@ class IntradayWindow:
             if self._bullish_line_calculated:
                 return
             
-            print("[DEBUG] 开始计算看涨线")
-            
-            # 使用交易日期而不是依赖分时数据
-            current_date = self.trade_date
-            
-            # 计算前一个交易日
-            from datetime import timedelta
-            prev_date = current_date - timedelta(days=1)
-            while prev_date.weekday() >= 5:  # 跳过周末
-                prev_date -= timedelta(days=1)
-            
-            prev_date_str = prev_date.strftime('%Y-%m-%d')
-            
-            # 获取证券类型和代码
-            security_type, symbol = self._get_security_type(self.code)
-            
-            # 获取前一个交易日的分时数据计算布林带最高点
-            start_dt = f"{prev_date_str} 09:30:00"
-            end_dt = f"{prev_date_str} 15:00:00"
-            
-            import akshare as ak
-            if security_type == "STOCK":
-                prev_intraday_df = ak.stock_zh_a_hist_min_em(
-                    symbol=symbol,
-                    start_date=start_dt,
-                    end_date=end_dt,
-                    period="1",
-                    adjust=""
-                )
-            elif security_type == "ETF":
-                prev_intraday_df = ak.fund_etf_hist_min_em(
-                    symbol=symbol,
-                    start_date=start_dt,
-                    end_date=end_dt,
-                    period="1",
-                    adjust=""
-                )
-            else:
-                return
+            log.debug("开始计算看涨线")
             
-            if prev_intraday_df.empty:
-                print(f"[DEBUG] 未获取到前一个交易日 {prev_date_str} 的分时数据")
-                self._bullish_line_calculated = True
+            # 前一个交易日的1分钟布林带（与看跌线共用一次计算）
+            prev_boll = self._prev_day_bollinger()
+            if prev_boll is None:
                 return
-            
-            # 统一列名
-            if '时间' in prev_intraday_df.columns:
-                prev_intraday_df.rename(columns={
-                    "时间": "datetime", 
-                    "开盘": "open", 
-                    "收盘": "close", 
-                    "最高": "high",
-                    "最低": "low",
-                    "成交量": "volume"
-                }, inplace=True)
-                prev_intraday_df["datetime"] = pd.to_datetime(prev_intraday_df["datetime"])
-                prev_intraday_df.set_index("datetime", inplace=True)
-            
-            # 计算1分钟布林带
-            window = 20
-            ma20 = prev_intraday_df['close'].rolling(window=window, min_periods=1).mean()
-            std = prev_intraday_df['close'].rolling(window=window, min_periods=1).std()
-            upper_band = ma20 + 2 * std
+            prev_date_str, upper_band, _ = prev_boll
             
             # 使用peak检测找到最近一个高点
             bollinger_high = self._find_recent_peak(upper_band, peak_type="high")
@@ -4433,27 +4475,25 @@ class IntradayWindow:
             self.bullish_line_price = bollinger_high
             self._bullish_line_calculated = True
             
-            print(f"[DEBUG] 看涨线计算完成: 前一个交易日 {prev_date_str} 布林带最近高点: {bollinger_high:.3f}")
+            log.debug("看涨线计算完成: 前一个交易日 %s 布林带最近高点: %.3f", prev_date_str, bollinger_high)
             
             # 缓存看涨线结果
-            self._set_cached_data('bullish_line', self.bullish_line_price)
-            print(f"[DEBUG] 看涨线价格已缓存: {self.bullish_line_price}")
+            self._set_cached_data('bullish_line', self.bullish_line_price, cache_key)
+            log.debug("看涨线价格已缓存: %s", self.bullish_line_price)
             
         except Exception as e:
-            print(f"[ERROR] 计算看涨线失败: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            log.exception("计算看涨线失败: %s", e)
 
     def _calculate_bearish_line(self):
         """计算看跌线（上个交易日布林带最低点）（带缓存机制）"""
         try:
             # 检查缓存键是否变化
-            self._check_cache_key_change()
+            cache_key = self._check_cache_key_change()
             
             # 尝试从缓存获取
-            cached_bearish_line = self._get_cached_data('bearish_line')
+            cached_bearish_line = self._get_cached_data('bearish_line', cache_key)
             if cached_bearish_line is not None:
-                print(f"[DEBUG] 从缓存获取看跌线价格: {cached_bearish_line}")
+                log.debug("从缓存获取看跌线价格: %s", cached_bearish_line)
                 self.bearish_line_price = cached_bearish_line
                 self._bearish_line_calculated = True
                 return
@@ -4461,69 +4501,13 @@ class IntradayWindow:
             if self._bearish_line_calculated:
                 return
             
-            print("[DEBUG] 开始计算看跌线")
+            log.debug("开始计算看跌线")
             
-            # 使用交易日期而不是依赖分时数据
-            current_date = self.trade_date
-            
-            # 计算前一个交易日
-            from datetime import timedelta
-            prev_date = current_date - timedelta(days=1)
-            while prev_date.weekday() >= 5:  # 跳过周末
-                prev_date -= timedelta(days=1)
-            
-            prev_date_str = prev_date.strftime('%Y-%m-%d')
-            
-            # 获取证券类型和代码
-            security_type, symbol = self._get_security_type(self.code)
-            
-            # 获取前一个交易日的分时数据计算布林带最低点
-            start_dt = f"{prev_date_str} 09:30:00"
-            end_dt = f"{prev_date_str} 15:00:00"
-            
-            import akshare as ak
-            if security_type == "STOCK":
-                prev_intraday_df = ak.stock_zh_a_hist_min_em(
-                    symbol=symbol,
-                    start_date=start_dt,
-                    end_date=end_dt,
-                    period="1",
-                    adjust=""
-                )
-            elif security_type == "ETF":
-                prev_intraday_df = ak.fund_etf_hist_min_em(
-                    symbol=symbol,
-                    start_date=start_dt,
-                    end_date=end_dt,
-                    period="1",
-                    adjust=""
-                )
-            else:
+            # 前一个交易日的1分钟布林带（与看涨线共用一次计算）
+            prev_boll = self._prev_day_bollinger()
+            if prev_boll is None:
                 return
-            
-            if prev_intraday_df.empty:
-                print(f"[DEBUG] 未获取到前一个交易日 {prev_date_str} 的分时数据")
-                self._bearish_line_calculated = True
-                return
-            
-            # 统一列名
-            if '时间' in prev_intraday_df.columns:
-                prev_intraday_df.rename(columns={
-                    "时间": "datetime", 
-                    "开盘": "open", 
-                    "收盘": "close", 
-                    "最高": "high",
-                    "最低": "low",
-                    "成交量": "volume"
-                }, inplace=True)
-                prev_intraday_df["datetime"] = pd.to_datetime(prev_intraday_df["datetime"])
-                prev_intraday_df.set_index("datetime", inplace=True)
-            
-            # 计算1分钟布林带
-            window = 20
-            ma20 = prev_intraday_df['close'].rolling(window=window, min_periods=1).mean()
-            std = prev_intraday_df['close'].rolling(window=window, min_periods=1).std()
-            lower_band = ma20 - 2 * std
+            prev_date_str, _, lower_band = prev_boll
             
             # 使用peak检测找到最近一个低点
             bollinger_low = self._find_recent_peak(lower_band, peak_type="low")
@@ -4531,20 +4515,31 @@ class IntradayWindow:
             self.bearish_line_price = bollinger_low
             self._bearish_line_calculated = True
             
-            print(f"[DEBUG] 看跌线计算完成: 前一个交易日 {prev_date_str} 布林带最近低点: {bollinger_low:.3f}")
+            log.debug("看跌线计算完成: 前一个交易日 %s 布林带最近低点: %.3f", prev_date_str, bollinger_low)
             
             # 缓存看跌线结果
-            self._set_cached_data('bearish_line', self.bearish_line_price)
-            print(f"[DEBUG] 看跌线价格已缓存: {self.bearish_line_price}")
+            self._set_cached_data('bearish_line', self.bearish_line_price, cache_key)
+            log.debug("看跌线价格已缓存: %s", self.bearish_line_price)
             
         except Exception as e:
-            print(f"[ERROR] 计算看跌线失败: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            log.exception("计算看跌线失败: %s", e)
 
     def _calculate_breakthrough_breakdown_count(self):
-        """计算5分钟K线突破和跌破布林带的次数"""
-        # 移除检查，允许实时更新时重新计算
+        """计算5分钟K线突破和跌破布林带的次数
+        
+        价格数据和布林带均未变化时结果不变，按输入签名跳过重新检测（也不会重复提醒）。
+        """
+        df, upper, lower = self.price_df, self.bollinger_5min_upper, self.bollinger_5min_lower
+        # 持有输入对象的强引用按is比较（不受id复用影响），另带长度和最新值以识别原地追加
+        sig = (
+            (df, upper, lower),
+            ((len(df), df.index[-1], df['close'].iat[-1]) if df is not None and len(df) else None,
+             (len(upper), upper.iat[-1]) if upper is not None and len(upper) else None,
+             (len(lower), lower.iat[-1]) if lower is not None and len(lower) else None),
+        )
+        if _signature_matches(sig, self._bb_last_sig):
+            self._breakthrough_breakdown_calculated = True
+            return
             
         # 清空布林带信号列表，避免重复播放
         self.bollinger_breakthrough_signals.clear()
@@ -4552,25 +4547,21 @@ class IntradayWindow:
         
         # 检查是否为初始化阶段，避免在窗口加载时播放音效
         # 但是仍然需要计算突破跌破次数用于显示
-        is_initialization = not hasattr(self, '_initialization_complete') or not self._initialization_complete
+        is_initialization = not self._initialization_complete
         if is_initialization:
-            if not hasattr(self, '_initialization_complete'):
-                self._initialization_complete = False
-            print("[DEBUG] 初始化阶段，跳过布林带音效播放，但继续计算突破跌破次数")
+            log.debug("初始化阶段，跳过布林带音效播放，但继续计算突破跌破次数")
             
         try:
             if self.price_df is None or self.price_df.empty:
-                print("[DEBUG] 价格数据为空，无法计算突破跌破次数")
+                log.debug("价格数据为空，无法计算突破跌破次数")
                 return
                 
             if (self.bollinger_5min_upper is None or self.bollinger_5min_lower is None or 
                 self.bollinger_5min_upper.empty or self.bollinger_5min_lower.empty):
-                print("[DEBUG] 布林带数据为空，无法计算突破跌破次数")
+                log.debug("布林带数据为空，无法计算突破跌破次数")
                 return
             
             # 使用trading_utils中的通用突破跌破检测函数
-            from trading_utils import detect_bollinger_breakthrough_breakdown
-            
             result = detect_bollinger_breakthrough_breakdown(
                 price_data=self.price_df,
                 bollinger_upper=self.bollinger_5min_upper,
@@ -4590,34 +4581,11 @@ class IntradayWindow:
                 # 立刻播放突破音效和震动
                 if (self.audio_enabled and not is_initialization and 
                     self._is_bollinger_signal_realtime(signal['timestamp'])):
-                    try:
-                        # 在单独线程中同时执行震动和音效，确保同步
-                        def play_breakthrough_audio_and_shake():
-                            try:
-                                # 立即震动主K线图窗口
-                                if hasattr(self, 'parent') and self.parent:
-                                    main_window = self.parent.winfo_toplevel()
-                                    if hasattr(main_window, 'winfo_exists') and main_window.winfo_exists():
-                                        WindowManager.shake_window(main_window, duration=0.5, intensity=8)
-                                        print(f"🔔 {self.name}({self.code}) 布林带突破震动提醒")
-                                
-                                # 播放音效
-                                from audio_notifier import \
-                                    notify_bollinger_breakthrough
-                                notify_bollinger_breakthrough()
-                                print(f"🔊 立刻播放布林带突破音效: {self.name}({self.code})")
-                            except Exception as e:
-                                print(f"播放布林带突破音效失败: {e}")
-                        
-                        # 启动震动和音效线程
-                        import threading
-                        threading.Thread(target=play_breakthrough_audio_and_shake, daemon=True).start()
-                    except Exception as e:
-                        print(f"启动布林带突破音效线程失败: {e}")
+                    self._enqueue_bollinger_alert('breakthrough')
                 elif self.audio_enabled and not is_initialization:
-                    print(f"🔇 布林带突破信号非实时，跳过音效播放: {self.name}({self.code})")
+                    log.debug("布林带突破信号非实时，跳过音效播放: %s(%s)", self.name, self.code)
                 elif is_initialization:
-                    print(f"🔇 初始化阶段，跳过布林带突破音效播放: {self.name}({self.code})")
+                    log.debug("初始化阶段，跳过布林带突破音效播放: %s(%s)", self.name, self.code)
             
             for signal in result['breakdown_signals']:
                 self.bollinger_breakdown_signals.append(signal)
@@ -4625,49 +4593,66 @@ class IntradayWindow:
                 # 立刻播放跌破音效和震动
                 if (self.audio_enabled and not is_initialization and 
                     self._is_bollinger_signal_realtime(signal['timestamp'])):
-                    try:
-                        # 在单独线程中同时执行震动和音效，确保同步
-                        def play_breakdown_audio_and_shake():
-                            try:
-                                # 立即震动主K线图窗口
-                                if hasattr(self, 'parent') and self.parent:
-                                    main_window = self.parent.winfo_toplevel()
-                                    if hasattr(main_window, 'winfo_exists') and main_window.winfo_exists():
-                                        WindowManager.shake_window(main_window, duration=0.5, intensity=8)
-                                        print(f"🔔 {self.name}({self.code}) 布林带跌破震动提醒")
-                                
-                                # 播放音效
-                                from audio_notifier import \
-                                    notify_bollinger_breakdown
-                                notify_bollinger_breakdown()
-                                print(f"🔊 立刻播放布林带跌破音效: {self.name}({self.code})")
-                            except Exception as e:
-                                print(f"播放布林带跌破音效失败: {e}")
-                        
-                        # 启动震动和音效线程
-                        import threading
-                        threading.Thread(target=play_breakdown_audio_and_shake, daemon=True).start()
-                    except Exception as e:
-                        print(f"启动布林带跌破音效线程失败: {e}")
+                    self._enqueue_bollinger_alert('breakdown')
                 elif self.audio_enabled and not is_initialization:
-                    print(f"🔇 布林带跌破信号非实时，跳过音效播放: {self.name}({self.code})")
+                    log.debug("布林带跌破信号非实时，跳过音效播放: %s(%s)", self.name, self.code)
                 elif is_initialization:
-                    print(f"🔇 初始化阶段，跳过布林带跌破音效播放: {self.name}({self.code})")
+                    log.debug("初始化阶段，跳过布林带跌破音效播放: %s(%s)", self.name, self.code)
             
-            print(f"[DEBUG] 突破跌破次数计算完成: 突破={self.breakthrough_count}次, 跌破={self.breakdown_count}次")
+            log.debug("突破跌破次数计算完成: 突破=%s次, 跌破=%s次", self.breakthrough_count, self.breakdown_count)
+            self._bb_last_sig = sig
             
         except Exception as e:
-            print(f"[ERROR] 计算突破跌破次数失败: {e}")
+            log.error("计算突破跌破次数失败: %s", e)
             self.breakthrough_count = 0
             self.breakdown_count = 0
             
         self._breakthrough_breakdown_calculated = True
 
+    # 布林带提醒类型 -> (显示名称, 音效函数)
+    _BOLLINGER_ALERTS = {
+        'breakthrough': ("突破", notify_bollinger_breakthrough),
+        'breakdown': ("跌破", notify_bollinger_breakdown),
+    }
+
+    def _enqueue_bollinger_alert(self, kind: str):
+        """提交布林带突破/跌破提醒，由常驻提醒线程顺序执行震动和音效"""
+        if self._bollinger_alert_thread is None:
+            self._bollinger_alert_thread = threading.Thread(target=self._bollinger_alert_worker, daemon=True)
+            self._bollinger_alert_thread.start()
+        self._bollinger_alert_queue.put(kind)
+
+    def _bollinger_alert_worker(self):
+        """提醒线程主循环：震动经after交给Tk主线程，本线程只顺序播放音效，收到None时退出"""
+        while True:
+            kind = self._bollinger_alert_queue.get()
+            if kind is None:
+                return
+            label, notify = self._BOLLINGER_ALERTS[kind]
+            if not self._is_destroyed:
+                self.window.after(0, self._shake_main_window, label)
+            try:
+                notify()
+                log.info("立刻播放布林带%s音效: %s(%s)", label, self.name, self.code)
+            except Exception as e:
+                log.exception("播放布林带%s音效失败: %s", label, e)
+
+    def _shake_main_window(self, label: str):
+        """震动主K线图窗口（Tk主线程）"""
+        try:
+            if self.parent:
+                main_window = self.parent.winfo_toplevel()
+                if main_window.winfo_exists():
+                    WindowManager.shake_window(main_window, duration=0.5, intensity=8)
+                    log.info("%s(%s) 布林带%s震动提醒", self.name, self.code, label)
+        except Exception as e:
+            log.exception("布林带%s震动提醒失败: %s", label, e)
+
     def _plot_breakthrough_breakdown_count(self):
         """在价格图表上显示突破和跌破次数"""
         try:
             if not self._breakthrough_breakdown_calculated:
-                print("[DEBUG] 突破跌破次数未计算，跳过显示")
+                log.debug("突破跌破次数未计算，跳过显示")
                 return
                 
             # 获取价格图的范围
@@ -4701,7 +4686,7 @@ class IntradayWindow:
                     pad=2
                 )
             )
-            print(f"[DEBUG] 显示突破次数: {self.breakthrough_count}次")
+            log.debug("显示突破次数: %s次", self.breakthrough_count)
             
             # 绘制跌破次数（底部中央，绿色粗体）- 始终显示
             breakdown_text = f"破下轨: {self.breakdown_count}次\n看跌，开口朝下杀，否则等中轨"
@@ -4722,12 +4707,10 @@ class IntradayWindow:
                     pad=2
                 )
             )
-            print(f"[DEBUG] 显示跌破次数: {self.breakdown_count}次")
+            log.debug("显示跌破次数: %s次", self.breakdown_count)
                 
         except Exception as e:
-            print(f"[ERROR] 绘制突破跌破次数显示失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("绘制突破跌破次数显示失败: %s", e)
 
     def _draw_support_resistance_only(self):
         """当没有分时数据时，只显示支撑带和压力带"""
@@ -4736,15 +4719,33 @@ class IntradayWindow:
             return
             
         try:
-            # 清理图表
+            # 获取前一交易日收盘价作为基准
+            prev_close = self._get_previous_close()
+            
+            has_trend_lines = self.bullish_line_price is not None or self.bearish_line_price is not None
+            # 看涨线与看跌线的线型只由开盘价和两线价格决定，签名中放开盘价，线型在确需重绘时再计算
+            opening_price = self._get_opening_price() if has_trend_lines else None
+            
+            # 预览内容与画布尺寸都未变化时，直接恢复上次整图绘制缓存的背景并blit，
+            # 不再清空坐标轴重建艺术家并重新栅格化整张图
+            signature = (self.code, self.trade_date, prev_close,
+                         self.support_level, self.support_type, self.resistance_level, self.resistance_type,
+                         self.bullish_line_price, self.bearish_line_price, opening_price,
+                         self._prev_bands(), self.canvas.get_width_height())
+            if prev_close is not None and signature == self._preview_signature:
+                self._blit_crosshair()
+                return
+            self._preview_signature = None
+            line_styles = self._determine_line_styles() if has_trend_lines else None
+            
+            # 清理图表（先移除十字线，clear后的图元引用不再有效）
+            self._remove_crosshair()
             self.ax_price.clear()
             self.ax_cost.clear()
             self.ax_rsi.clear()
             
-            # 获取前一交易日收盘价作为基准
-            prev_close = self._get_previous_close()
             if prev_close is None:
-                print("[DEBUG] 无法获取前一交易日收盘价，无法显示支撑带和压力带")
+                log.debug("无法获取前一交易日收盘价，无法显示支撑带和压力带")
                 return
             
             # 设置价格范围（基于前一交易日收盘价的±5%）
@@ -4769,44 +4770,25 @@ class IntradayWindow:
             self.ax_price.set_ylim(down_price, up_price)
             self.ax_price.set_xlim(0, 1)  # 设置一个简单的x轴范围
             
-            # 绘制基准线（前一交易日收盘价）
-            self.ax_price.axhline(prev_close, color="gray", linestyle="--", linewidth=0.8, label="前收盘")
-            
-            # 绘制支撑位和压力位
-            if self.support_level is not None and down_price <= self.support_level <= up_price:
-                self.ax_price.axhline(self.support_level, color="red", linestyle="--", linewidth=1, alpha=0.8, label=f"支撑位({self.support_type})")
-            
-            if self.resistance_level is not None and down_price <= self.resistance_level <= up_price:
-                self.ax_price.axhline(self.resistance_level, color="green", linestyle="--", linewidth=1, alpha=0.8, label=f"压力位({self.resistance_type})")
-            
-            # 绘制看涨线和看跌线 - 根据开盘价和上一个交易日涨跌情况确定线型
-            if (self.bullish_line_price is not None and down_price <= self.bullish_line_price <= up_price) or \
-               (self.bearish_line_price is not None and down_price <= self.bearish_line_price <= up_price):
-                
-                # 确定线型
-                bullish_style, bearish_style = self._determine_line_styles()
-                
-                # 计算图表宽度的1/4（在盘前显示时，使用一个固定的宽度）
-                chart_width = 240  # 假设4小时交易时间，每分钟一个数据点
-                line_length = chart_width / 4
-                
-                # 绘制看涨线
-                if self.bullish_line_price is not None and down_price <= self.bullish_line_price <= up_price:
-                    self.ax_price.hlines(self.bullish_line_price, xmin=0, xmax=line_length, 
-                                       color="red", linestyle=bullish_style, linewidth=2, alpha=0.9, label="看涨线")
-                
-                # 绘制看跌线
-                if self.bearish_line_price is not None and down_price <= self.bearish_line_price <= up_price:
-                    self.ax_price.hlines(self.bearish_line_price, xmin=0, xmax=line_length, 
-                                       color="green", linestyle=bearish_style, linewidth=2, alpha=0.9, label="看跌线")
+            # 前收盘、支撑位、压力位、看涨线、看跌线合并为一个LineCollection绘制，图例使用代理线条
+            # 看涨线和看跌线线型根据开盘价和上一个交易日涨跌情况确定
+            bullish_style, bearish_style = line_styles or ('solid', 'solid')
+            # 可见性在这里判断一次，参考线与价格刻度共用；前收盘价始终显示
+            level_lines = [(prev_close, "gray", "--", 0.8, 1.0, "前收盘")] + [
+                lv for lv in (
+                    (self.support_level, "red", "--", 1, 0.8, f"支撑位({self.support_type})"),
+                    (self.resistance_level, "green", "--", 1, 0.8, f"压力位({self.resistance_type})"),
+                    (self.bullish_line_price, "red", bullish_style, 2, 0.9, "看涨线"),
+                    (self.bearish_line_price, "green", bearish_style, 2, 0.9, "看跌线"),
+                ) if lv[0] is not None and down_price <= lv[0] <= up_price
+            ]
+            level_handles = self._add_level_lines(level_lines)
             
             # 绘制前高价格阻力带
-            if hasattr(self, 'previous_high_dual_prices') and self.previous_high_dual_prices is not None:
-                dual_prices = self.previous_high_dual_prices
-                if dual_prices.get('resistance_band'):
-                    band = dual_prices['resistance_band']
-                    upper_price = band['upper']  # 上影线最高价
-                    lower_price = band['lower']  # 实体最高价
+            high_band, low_band = self._prev_bands()
+            if self.previous_high_dual_prices is not None:
+                if high_band is not None:
+                    lower_price, upper_price = high_band  # 实体最高价, 上影线最高价
                     
                     # 确保阻力带在可见范围内
                     if down_price <= upper_price <= up_price or down_price <= lower_price <= up_price:
@@ -4819,15 +4801,12 @@ class IntradayWindow:
                             linewidth=0.5,  # 边框宽度
                             label=f"前高阻力带({lower_price:.2f}-{upper_price:.2f})"
                         )
-                        print(f"[DEBUG] 分时窗口 - 绘制前高价格线: {self.previous_high_price:.3f}")
+                        log.debug("分时窗口 - 绘制前高价格线: %.3f", self.previous_high_price)
             
             # 绘制前低价格支撑带
-            if hasattr(self, 'previous_low_dual_prices') and self.previous_low_dual_prices is not None:
-                dual_prices = self.previous_low_dual_prices
-                if dual_prices.get('support_band'):
-                    band = dual_prices['support_band']
-                    upper_price = band['upper']  # 实体最低价
-                    lower_price = band['lower']  # 下影线最低价
+            if self.previous_low_dual_prices is not None:
+                if low_band is not None:
+                    lower_price, upper_price = low_band  # 下影线最低价, 实体最低价
                     
                     # 检查支撑带是否在显示范围内
                     if (down_price <= upper_price <= up_price or 
@@ -4843,33 +4822,11 @@ class IntradayWindow:
                             linewidth=0.5,  # 边框宽度
                             label=f"前低支撑带({lower_price:.2f}-{upper_price:.2f})"
                         )
-                        print(f"[DEBUG] 分时窗口 - 绘制前低支撑带: {lower_price:.3f} - {upper_price:.3f}")
-            
-            # 设置价格刻度和标签
-            price_ticks = []
-            price_labels = []
-            
-            # 添加基准价（前一交易日收盘价）
-            price_ticks.append(prev_close)
-            price_labels.append(f"{prev_close:.2f}")
+                        log.debug("分时窗口 - 绘制前低支撑带: %.3f - %.3f", lower_price, upper_price)
             
-            # 添加支撑位和压力位的价格刻度
-            if self.support_level is not None and down_price <= self.support_level <= up_price:
-                price_ticks.append(self.support_level)
-                price_labels.append(f"{self.support_level:.2f}")
-            
-            if self.resistance_level is not None and down_price <= self.resistance_level <= up_price:
-                price_ticks.append(self.resistance_level)
-                price_labels.append(f"{self.resistance_level:.2f}")
-            
-            # 新增：添加看涨线和看跌线的价格刻度
-            if self.bullish_line_price is not None and down_price <= self.bullish_line_price <= up_price:
-                price_ticks.append(self.bullish_line_price)
-                price_labels.append(f"{self.bullish_line_price:.2f}")
-            
-            if self.bearish_line_price is not None and down_price <= self.bearish_line_price <= up_price:
-                price_ticks.append(self.bearish_line_price)
-                price_labels.append(f"{self.bearish_line_price:.2f}")
+            # 设置价格刻度和标签：前收盘、支撑位、压力位、看涨线、看跌线中可见的价位
+            price_ticks = [lv[0] for lv in level_lines]
+            price_labels = [f"{price:.2f}" for price in price_ticks]
             
             # 设置刻度和标签
             self.ax_price.set_yticks(price_ticks)
@@ -4878,21 +4835,86 @@ class IntradayWindow:
             # 设置标题和标签
             self.ax_price.set_title(f"{self.name}({self.code}) - 分时 {self.trade_date_str} - 支撑带压力带预览", fontsize=10)
             self.ax_price.set_ylabel("价格", fontsize=9)
-            self.ax_price.legend(loc='upper right', fontsize=8)
+            band_handles, _ = self.ax_price.get_legend_handles_labels()
+            self.ax_price.legend(handles=level_handles + band_handles, loc='upper right', fontsize=8)
             self.ax_price.grid(True, alpha=0.3)
             
             # 隐藏x轴标签（因为没有时间数据）
             self.ax_price.set_xticks([])
             
-            # 绘制图表
-            self.canvas.draw()
+            # 请求绘制图表（draw_event回调会缓存本次绘制的背景供后续blit）
+            self._request_draw()
+            self._preview_signature = signature
             
-            print("[DEBUG] 支撑带和压力带预览图绘制完成")
+            log.debug("支撑带和压力带预览图绘制完成")
             
         except Exception as e:
-            print(f"[DEBUG] 绘制支撑带和压力带预览图失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("绘制支撑带和压力带预览图失败: %s", e)
+
+    def _calculate_support_resistance_async(self, attempt: int = 0):
+        """在后台线程计算支撑位和压力位，完成后回到Tk主线程重绘（供主线程调用）
+        
+        已有计算在执行时不重复提交；计算未成功时按SR_RETRY_DELAY_MS指数退避，用after调度重试。
+        
+        :param attempt: 已重试次数
+        """
+        if self._is_destroyed or (self._sr_future is not None and not self._sr_future.done()):
+            return
+        # 提交前在主线程记下代码、交易日与缓存键，后台只按这些参数计算到局部变量
+        code, name, trade_date = self.code, self.name, self.trade_date
+        cache_key = self._check_cache_key_change()
+        cached_sr = self._get_cached_data('support_resistance', cache_key)
+        if cached_sr is not None:
+            # 本方法在 _draw 中调用：命中缓存只写入结果，由当前这次绘制继续使用，不再嵌套重绘
+            self._apply_support_resistance(cached_sr)
+            return
+        
+        def _done(future: Future):
+            # 在线程池线程中回调，通过after切回Tk主线程
+            if not self._is_destroyed and not future.cancelled():
+                self.window.after(0, self._on_support_resistance_done, future, code, trade_date, cache_key, attempt)
+        
+        self._submit_support_resistance(code, name, trade_date).add_done_callback(_done)
+
+    def _submit_support_resistance(self, code: str, name: str, trade_date: date) -> Future:
+        """支撑位压力位计算的唯一提交入口
+        
+        同一(代码, 交易日)已有未完成的计算时直接返回该Future，避免并发重复请求日线数据。
+        """
+        with self._sr_lock:
+            future = self._sr_future
+            if future is not None and not future.done() and self._sr_future_ctx == (code, trade_date):
+                return future
+            future = self._io_pool.submit(self._compute_support_resistance, code, name, trade_date, self.price_df)
+            self._sr_future = future
+            self._sr_future_ctx = (code, trade_date)
+            return future
+
+    def _on_support_resistance_done(self, future: Future, code: str, trade_date: date, cache_key: str, attempt: int):
+        """后台支撑位压力位计算结束（Tk主线程）：成功则应用结果并重绘，失败则退避后重试
+        
+        提交后已切换代码或交易日时丢弃结果，不写入属性和缓存。
+        """
+        if self._is_destroyed:
+            return
+        if (self.code, self.trade_date) != (code, trade_date):
+            log.debug("支撑位压力位结果已过期(%s %s)，丢弃", code, trade_date)
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            log.exception("后台计算支撑位和压力位时出错: %s", e)
+            result = None
+        if result is not None:
+            self._apply_support_resistance(result)
+            self._set_cached_data('support_resistance', result, cache_key)
+            self._draw()
+        elif attempt < self.SR_MAX_RETRIES:
+            delay = self.SR_RETRY_DELAY_MS * (2 ** attempt)
+            log.debug("后台计算支撑位和压力位未成功，%sms后第%s次重试", delay, attempt + 1)
+            self.window.after(delay, self._calculate_support_resistance_async, attempt + 1)
+        else:
+            self._fill_support_resistance_defaults()
 
     def _calculate_support_resistance(self):
         """计算支撑位和压力位（带缓存机制）
@@ -4904,184 +4926,173 @@ class IntradayWindow:
         4. 支撑位和压力位每天重新计算，不依赖昨天的突破/跌破价格
         """
         # 检查缓存键是否变化
-        self._check_cache_key_change()
+        cache_key = self._check_cache_key_change()
         
         # 尝试从缓存获取
-        cached_sr = self._get_cached_data('support_resistance')
+        cached_sr = self._get_cached_data('support_resistance', cache_key)
         if cached_sr is not None:
-            print(f"[DEBUG] 从缓存获取支撑位压力位: 支撑位={cached_sr['support_level']}, 压力位={cached_sr['resistance_level']}")
-            self.support_level = cached_sr['support_level']
-            self.resistance_level = cached_sr['resistance_level']
-            self.support_type = cached_sr['support_type']
-            self.resistance_type = cached_sr['resistance_type']
-            self.position_status = cached_sr['position_status']
-            self._support_resistance_calculated = True
+            log.debug("从缓存获取支撑位压力位: 支撑位=%s, 压力位=%s", cached_sr['support_level'], cached_sr['resistance_level'])
+            self._apply_support_resistance(cached_sr)
             return
         
-        max_retries = 1
-        retry_delay = 2  # 秒
-        
-        for attempt in range(max_retries):
-            try:
-                print(f"[DEBUG] 尝试计算支撑位和压力位，第{attempt + 1}次尝试")
-                print(f"[DEBUG] 股票代码: {self.code}, 交易日: {self.trade_date_str}")
-                
-                # 使用和K线图相同的方法获取数据（包含布林带计算）
-                daily_data = self.etf_engine.load_data(
-                    code=self.code,
-                    symbol_name=self.name,
-                    period_mode='day',
-                    start_date=(self.trade_date - timedelta(days=60)).strftime('%Y-%m-%d'),
-                    end_date=self.trade_date.strftime('%Y-%m-%d'),
-                    period_config={
-                        'day': {
-                            'ak_period': 'daily',
-                            'buffer_ratio': '0.2',
-                            'min_buffer': '20'
-                        }
-                    },
-                    ma_lines=[5, 10, 20, 250],  # 包含MA20用于布林带计算
-                    force_refresh=False
-                )
-                
-                if daily_data.empty:
-                    print(f"[DEBUG] 第{attempt + 1}次尝试：无法获取 {self.code} 的历史数据")
-                    if attempt < max_retries - 1:
-                        print(f"[DEBUG] 等待{retry_delay}秒后重试...")
-                        import time
-                        time.sleep(retry_delay)
-                        continue
-                    else:
-                        print(f"[DEBUG] 所有尝试都失败，无法计算支撑位和压力位")
-                        return
-                
-                # 检查是否包含布林带数据
-                if 'MA20' not in daily_data.columns or 'BOLL_UPPER' not in daily_data.columns:
-                    print(f"[DEBUG] 第{attempt + 1}次尝试：历史数据中缺少布林带指标")
-                    print(f"[DEBUG] 可用列: {list(daily_data.columns)}")
-                    if attempt < max_retries - 1:
-                        print(f"[DEBUG] 等待{retry_delay}秒后重试...")
-                        import time
-                        time.sleep(retry_delay)
-                        continue
-                    else:
-                        print(f"[DEBUG] 所有尝试都失败，无法计算支撑位和压力位")
-                        return
-                
-                # 获取最新交易日数据
-                latest_daily = daily_data.iloc[-1]
-                ma20 = latest_daily['MA20']
-                boll_upper = latest_daily['BOLL_UPPER']
-                boll_lower = latest_daily['BOLL_LOWER']
-                
-                # 获取上一个交易日的收盘价作为支撑位计算的基准价格
-                if len(daily_data) > 1:
-                    prev_close = daily_data.iloc[-2]['收盘']
-                    prev_date = daily_data.index[-2].strftime('%Y-%m-%d')
-                else:
-                    # 如果没有上一个交易日数据，使用当前日线收盘价
-                    prev_close = latest_daily['收盘']
-                    prev_date = "无前一交易日数据"
-                
-                # 获取当前分时价格（用于显示和调试）
-                if self.price_df is not None and not self.price_df.empty:
-                    current_price = self.price_df['close'].iloc[-1]
-                else:
-                    # 如果没有分时数据，使用日线收盘价
-                    current_price = latest_daily['收盘']
-                
-                print(f"[DEBUG] 支撑位和压力位计算成功（第{attempt + 1}次尝试）:")
-                print(f"[DEBUG]  前一交易日({prev_date})收盘价: {prev_close:.3f}")
-                print(f"[DEBUG]  当前分时价格: {current_price:.3f}")
-                print(f"[DEBUG]  MA20(布林中轨): {ma20:.3f}")
-                print(f"[DEBUG]  布林上轨: {boll_upper:.3f}")
-                print(f"[DEBUG]  布林下轨: {boll_lower:.3f}")
-                
-                # 计算支撑位和压力位（基于上一交易日收盘价相对于MA20的位置）
-                # 这是固定的算法，不依赖昨天的突破/跌破价格
-                if prev_close > ma20:
-                    # 上一交易日收盘价在MA20之上：MA20为支撑位，布林上轨为压力位
-                    self.support_level = ma20
-                    self.resistance_level = boll_upper
-                    self.position_status = "上一交易日收盘价在20日线之上"
-                    self.support_type = "MA20(布林中轨)"
-                    self.resistance_type = "布林上轨"
-                    print(f"[DEBUG]  判断逻辑: 前一交易日收盘价({prev_close:.3f}) > MA20({ma20:.3f})")
-                else:
-                    # 上一交易日收盘价在MA20之下：MA20为压力位，布林下轨为支撑位
-                    self.support_level = boll_lower
-                    self.resistance_level = ma20
-                    self.position_status = "上一交易日收盘价在20日线之下"
-                    self.support_type = "布林下轨"
-                    self.resistance_type = "MA20(布林中轨)"
-                    print(f"[DEBUG]  判断逻辑: 前一交易日收盘价({prev_close:.3f}) <= MA20({ma20:.3f})")
-                
-                print(f"[DEBUG]  位置状态: {self.position_status}")
-                print(f"[DEBUG]  支撑位: {self.support_level:.3f} ({self.support_type})")
-                print(f"[DEBUG]  压力位: {self.resistance_level:.3f} ({self.resistance_type})")
-                
-                # 计算距离和涨跌幅
-                if self.price_df is not None and not self.price_df.empty:
-                    distance_to_support = ((current_price - self.support_level) / current_price) * 100
-                    distance_to_resistance = ((self.resistance_level - current_price) / current_price) * 100
-                    
-                    print(f"[DEBUG]  到支撑位距离: {distance_to_support:+.2f}%")
-                    print(f"[DEBUG]  到压力位距离: {distance_to_resistance:+.2f}%")
-                
-                # 计算相对于前一交易日收盘价的涨跌幅
-                if len(daily_data) > 1:
-                    prev_close = daily_data.iloc[-2]['收盘']
-                    support_change = (self.support_level - prev_close) / prev_close * 100
-                    resistance_change = (self.resistance_level - prev_close) / prev_close * 100
-                    
-                    print(f"[DEBUG]  支撑位涨跌幅: {support_change:+.2f}%")
-                    print(f"[DEBUG]  压力位涨跌幅: {resistance_change:+.2f}%")
-                
-                # 验证支撑位和压力位的合理性
-                if self.support_level is not None and self.resistance_level is not None:
-                    if self.support_level <= 0 or self.resistance_level <= 0:
-                        print(f"[WARNING] 支撑位或压力位计算异常: 支撑位={self.support_level}, 压力位={self.resistance_level}")
-                    
-                    if self.support_level >= self.resistance_level:
-                        print(f"[WARNING] 支撑位({self.support_level:.3f}) >= 压力位({self.resistance_level:.3f})，可能存在计算错误")
-                
-                print(f"[DEBUG] 支撑位和压力位计算完成")
-                
-                # 缓存结果
-                sr_result = {
-                    'support_level': self.support_level,
-                    'resistance_level': self.resistance_level,
-                    'support_type': self.support_type,
-                    'resistance_type': self.resistance_type,
-                    'position_status': self.position_status
+        try:
+            # 与后台补算共用同一提交入口，已有同一交易日的计算在执行时等待其结果
+            sr_result = self._submit_support_resistance(self.code, self.name, self.trade_date).result()
+            if sr_result is None:
+                return
+            self._apply_support_resistance(sr_result)
+            self._set_cached_data('support_resistance', sr_result, cache_key)
+            log.debug("支撑位压力位已缓存: %s", sr_result)
+        except CancelledError:
+            # 切换交易日时已作废，结果不再写入
+            log.debug("支撑位压力位计算已取消")
+        except Exception as e:
+            log.exception("计算支撑位和压力位时出错: %s", e)
+            self._fill_support_resistance_defaults()
+
+    def _apply_support_resistance(self, sr_result: dict):
+        """将支撑位压力位计算结果写入窗口状态并标记计算完成"""
+        self.support_level = sr_result['support_level']
+        self.resistance_level = sr_result['resistance_level']
+        self.support_type = sr_result['support_type']
+        self.resistance_type = sr_result['resistance_type']
+        self.position_status = sr_result['position_status']
+        self._support_resistance_calculated = True
+
+    def _fill_support_resistance_defaults(self):
+        """计算失败时确保支撑位压力位相关变量不为None"""
+        if self.support_level is None:
+            self.support_level = 0.0
+        if self.resistance_level is None:
+            self.resistance_level = 0.0
+        if self.support_type is None:
+            self.support_type = "未知"
+        if self.resistance_type is None:
+            self.resistance_type = "未知"
+        if self.position_status is None:
+            self.position_status = "计算失败"
+
+    def _compute_support_resistance(self, code: str, name: str, trade_date: date,
+                                    price_df: Optional[pd.DataFrame]) -> Optional[dict]:
+        """按给定代码与交易日计算支撑位和压力位，只使用局部变量，不修改窗口状态（可在后台线程调用）
+        
+        :return: 含support_level/resistance_level/support_type/resistance_type/position_status的字典，
+                 数据不足时返回None；获取数据出错时抛出异常
+        """
+        log.debug("计算支撑位和压力位: %s, 交易日: %s", code, trade_date)
+        
+        # 使用和K线图相同的方法获取数据（包含布林带计算）
+        daily_data = self.etf_engine.load_data(
+            code=code,
+            symbol_name=name,
+            period_mode='day',
+            start_date=(trade_date - timedelta(days=60)).strftime('%Y-%m-%d'),
+            end_date=trade_date.strftime('%Y-%m-%d'),
+            period_config={
+                'day': {
+                    'ak_period': 'daily',
+                    'buffer_ratio': '0.2',
+                    'min_buffer': '20'
                 }
-                self._set_cached_data('support_resistance', sr_result)
-                print(f"[DEBUG] 支撑位压力位已缓存: {sr_result}")
-                
-                self._support_resistance_calculated = True  # 标记计算完成
-                return  # 成功计算，退出重试循环
-                
-            except Exception as e:
-                print(f"[DEBUG] 第{attempt + 1}次尝试计算支撑位和压力位时出错: {e}")
-                import traceback
-                traceback.print_exc()
-                if attempt < max_retries - 1:
-                    print(f"[DEBUG] 等待{retry_delay}秒后重试...")
-                    import time
-                    time.sleep(retry_delay)
-                else:
-                    print(f"[DEBUG] 所有{max_retries}次尝试都失败，无法计算支撑位和压力位")
-                    # 即使计算失败，也要确保变量不为None
-                    if self.support_level is None:
-                        self.support_level = 0.0
-                    if self.resistance_level is None:
-                        self.resistance_level = 0.0
-                    if self.support_type is None:
-                        self.support_type = "未知"
-                    if self.resistance_type is None:
-                        self.resistance_type = "未知"
-                    if self.position_status is None:
-                        self.position_status = "计算失败"
+            },
+            ma_lines=[5, 10, 20, 250],  # 包含MA20用于布林带计算
+            force_refresh=False
+        )
+        
+        if daily_data.empty:
+            log.debug("无法获取 %s 的历史数据，无法计算支撑位和压力位", code)
+            return None
+        
+        # 检查是否包含布林带数据
+        if 'MA20' not in daily_data.columns or 'BOLL_UPPER' not in daily_data.columns:
+            log.debug("历史数据中缺少布林带指标，无法计算支撑位和压力位，可用列: %s", list(daily_data.columns))
+            return None
+        
+        # 获取最新交易日数据
+        latest_daily = daily_data.iloc[-1]
+        ma20 = latest_daily['MA20']
+        boll_upper = latest_daily['BOLL_UPPER']
+        boll_lower = latest_daily['BOLL_LOWER']
+        
+        # 获取上一个交易日的收盘价作为支撑位计算的基准价格
+        if len(daily_data) > 1:
+            prev_close = daily_data['收盘'].iat[-2]
+            prev_date = daily_data.index[-2].strftime('%Y-%m-%d')
+        else:
+            # 如果没有上一个交易日数据，使用当前日线收盘价
+            prev_close = latest_daily['收盘']
+            prev_date = "无前一交易日数据"
+        
+        # 获取当前分时价格（用于显示和调试）
+        has_intraday = price_df is not None and not price_df.empty
+        if has_intraday:
+            current_price = price_df['close'].iloc[-1]
+        else:
+            # 如果没有分时数据，使用日线收盘价
+            current_price = latest_daily['收盘']
+        
+        log.debug("支撑位和压力位计算成功:")
+        log.debug("前一交易日(%s)收盘价: %.3f", prev_date, prev_close)
+        log.debug("当前分时价格: %.3f", current_price)
+        log.debug("MA20(布林中轨): %.3f", ma20)
+        log.debug("布林上轨: %.3f", boll_upper)
+        log.debug("布林下轨: %.3f", boll_lower)
+        
+        # 计算支撑位和压力位（基于上一交易日收盘价相对于MA20的位置）
+        # 这是固定的算法，不依赖昨天的突破/跌破价格
+        if prev_close > ma20:
+            # 上一交易日收盘价在MA20之上：MA20为支撑位，布林上轨为压力位
+            support_level = ma20
+            resistance_level = boll_upper
+            position_status = "上一交易日收盘价在20日线之上"
+            support_type = "MA20(布林中轨)"
+            resistance_type = "布林上轨"
+            log.debug("判断逻辑: 前一交易日收盘价(%.3f) > MA20(%.3f)", prev_close, ma20)
+        else:
+            # 上一交易日收盘价在MA20之下：MA20为压力位，布林下轨为支撑位
+            support_level = boll_lower
+            resistance_level = ma20
+            position_status = "上一交易日收盘价在20日线之下"
+            support_type = "布林下轨"
+            resistance_type = "MA20(布林中轨)"
+            log.debug("判断逻辑: 前一交易日收盘价(%.3f) <= MA20(%.3f)", prev_close, ma20)
+        
+        log.debug("位置状态: %s", position_status)
+        log.debug("支撑位: %.3f (%s)", support_level, support_type)
+        log.debug("压力位: %.3f (%s)", resistance_level, resistance_type)
+        
+        # 计算距离和涨跌幅
+        if has_intraday:
+            distance_to_support = ((current_price - support_level) / current_price) * 100
+            distance_to_resistance = ((resistance_level - current_price) / current_price) * 100
+            
+            log.debug("到支撑位距离: %+.2f%%", distance_to_support)
+            log.debug("到压力位距离: %+.2f%%", distance_to_resistance)
+        
+        # 计算相对于前一交易日收盘价的涨跌幅（复用上面取得的前收盘价）
+        if len(daily_data) > 1:
+            support_change = (support_level - prev_close) / prev_close * 100
+            resistance_change = (resistance_level - prev_close) / prev_close * 100
+            
+            log.debug("支撑位涨跌幅: %+.2f%%", support_change)
+            log.debug("压力位涨跌幅: %+.2f%%", resistance_change)
+        
+        # 验证支撑位和压力位的合理性
+        if support_level <= 0 or resistance_level <= 0:
+            log.warning("支撑位或压力位计算异常: 支撑位=%s, 压力位=%s", support_level, resistance_level)
+        
+        if support_level >= resistance_level:
+            log.warning("支撑位(%.3f) >= 压力位(%.3f)，可能存在计算错误", support_level, resistance_level)
+        
+        log.debug("支撑位和压力位计算完成")
+        
+        return {
+            'support_level': support_level,
+            'resistance_level': resistance_level,
+            'support_type': support_type,
+            'resistance_type': resistance_type,
+            'position_status': position_status
+        }
 
     # ------------------------------------------------------------------
     # Screenshot
@@ -5106,8 +5117,6 @@ class IntradayWindow:
             if img.mode == "RGBA":
                 img = img.convert("RGB")
 
-            import os
-            import tempfile
             tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg")
             img.save(tmp.name, format="JPEG", quality=95)
             tmp.close()
@@ -5122,14 +5131,14 @@ class IntradayWindow:
         """更新股票代码和名称，重新加载数据"""
         # 清理所有缓存（股票代码变更时）
         self._clear_all_caches()
-        print(f"[DEBUG] 股票代码变更，清理所有缓存: {self.code} -> {new_code}")
+        log.debug("股票代码变更，清理所有缓存: %s -> %s", self.code, new_code)
         
         self.code = new_code
         self.name = new_name
         
         # 重新获取最新交易日
         self.trade_date = self._get_latest_trade_date()
-        self.trade_date_str = self.trade_date.strftime("%Y-%m-%d")
+        self.trade_date_str = self.trade_date.isoformat()
         
         # 更新缓存键
         self._cache_key = self._get_cache_key()
@@ -5144,7 +5153,7 @@ class IntradayWindow:
             try:
                 self.on_date_change_callback(self.trade_date_str)
             except Exception as e:
-                print(f"调用日期变化回调函数失败: {e}")
+                log.exception("调用日期变化回调函数失败: %s", e)
         
         # 更新成本缓存文件路径
         self.cost_cache_file = os.path.join(
@@ -5217,19 +5226,21 @@ class IntradayWindow:
         # 清空ETF分析引擎的缓存，确保获取新股票的最新数据
         if hasattr(self.etf_engine, 'clear_cache'):
             self.etf_engine.clear_cache()
-            print(f"[DEBUG] 已清空ETF分析引擎缓存，切换股票: {new_code}")
+            log.debug("已清空ETF分析引擎缓存，切换股票: %s", new_code)
         
         # 清空ETF分析引擎的指标缓存
         if hasattr(self.etf_engine, '_indicator_cache'):
             self.etf_engine._indicator_cache.clear()
-            print(f"[DEBUG] 已清空ETF分析引擎指标缓存，切换股票: {new_code}")
+            log.debug("已清空ETF分析引擎指标缓存，切换股票: %s", new_code)
         
         # 清空前一交易日收盘价缓存（股票代码变化时需要重新获取）
-        self._cached_previous_close = None
-        self._cached_previous_close_date = None
+        self._prev_close_cache.clear()
+        
+        # 清空证券类型缓存
+        self._sec_type_cache = (None, None)
         
         # 重新加载数据并更新图表
-        threading.Thread(target=self._update_data, daemon=True).start()
+        self._submit_update(new_context=True)
     
 
     
@@ -5327,64 +5338,57 @@ class IntradayWindow:
                             if hasattr(main_window, 'winfo_exists') and main_window.winfo_exists():
                                 # 立即开始震动
                                 WindowManager.shake_window(main_window, duration=0.5, intensity=8)
-                                print(f"🔔 {self.name}({self.code}) 主K线图窗口震动提醒")
+                                log.info("🔔 %s(%s) 主K线图窗口震动提醒", self.name, self.code)
                         
                         # 检查音效开关状态
                         if not self.audio_enabled:
-                            print(f"🔇 音效已关闭，跳过音效播放: {self.name}({self.code})")
+                            log.info("🔇 音效已关闭，跳过音效播放: %s(%s)", self.name, self.code)
                             return
                         
                         # 播放买入信号音效（如果应该播放）
                         if should_play_buy_audio:
                             try:
-                                from audio_notifier import notify_buy_signal
                                 notify_buy_signal()
-                                print(f"🔊 播放买入信号音效: {self.name}({self.code}) (连续{self.surge_signal_consecutive_count if buy_signal_type == 'surge' else 'N/A'}次)")
+                                log.info("🔊 播放买入信号音效: %s(%s) (连续%s次)", self.name, self.code, self.surge_signal_consecutive_count if buy_signal_type == 'surge' else 'N/A')
                             except Exception as e:
-                                print(f"播放买入信号音效失败: {e}")
+                                log.exception("播放买入信号音效失败: %s", e)
                         elif has_realtime_buy_signal:
-                            print(f"🔇 买入信号音效已跳过: {self.name}({self.code}) (连续{self.surge_signal_consecutive_count if buy_signal_type == 'surge' else 'N/A'}次，超过限制)")
+                            log.info("🔇 买入信号音效已跳过: %s(%s) (连续%s次，超过限制)", self.name, self.code, self.surge_signal_consecutive_count if buy_signal_type == 'surge' else 'N/A')
                         
                         # 播放卖出信号音效（如果应该播放）
                         if should_play_sell_audio:
                             try:
-                                from audio_notifier import notify_sell_signal
                                 notify_sell_signal()
-                                print(f"🔊 播放卖出信号音效: {self.name}({self.code}) (连续{self.plunge_signal_consecutive_count if sell_signal_type == 'plunge' else 'N/A'}次)")
+                                log.info("🔊 播放卖出信号音效: %s(%s) (连续%s次)", self.name, self.code, self.plunge_signal_consecutive_count if sell_signal_type == 'plunge' else 'N/A')
                             except Exception as e:
-                                print(f"播放卖出信号音效失败: {e}")
+                                log.exception("播放卖出信号音效失败: %s", e)
                         elif has_realtime_sell_signal:
-                            print(f"🔇 卖出信号音效已跳过: {self.name}({self.code}) (连续{self.plunge_signal_consecutive_count if sell_signal_type == 'plunge' else 'N/A'}次，超过限制)")
+                            log.info("🔇 卖出信号音效已跳过: %s(%s) (连续%s次，超过限制)", self.name, self.code, self.plunge_signal_consecutive_count if sell_signal_type == 'plunge' else 'N/A')
                         
                         # 播放布林带突破音效（如果应该播放）
                         if should_play_bollinger_breakthrough_audio:
                             try:
-                                from audio_notifier import \
-                                    notify_bollinger_breakthrough
                                 notify_bollinger_breakthrough()
-                                print(f"🔊 播放布林带突破音效: {self.name}({self.code}) (连续{self.bollinger_breakthrough_consecutive_count}次)")
+                                log.info("🔊 播放布林带突破音效: %s(%s) (连续%s次)", self.name, self.code, self.bollinger_breakthrough_consecutive_count)
                             except Exception as e:
-                                print(f"播放布林带突破音效失败: {e}")
+                                log.exception("播放布林带突破音效失败: %s", e)
                         elif has_realtime_bollinger_breakthrough:
-                            print(f"🔇 布林带突破音效已跳过: {self.name}({self.code}) (连续{self.bollinger_breakthrough_consecutive_count}次，超过限制)")
+                            log.info("🔇 布林带突破音效已跳过: %s(%s) (连续%s次，超过限制)", self.name, self.code, self.bollinger_breakthrough_consecutive_count)
                         
                         # 播放布林带跌破音效（如果应该播放）
                         if should_play_bollinger_breakdown_audio:
                             try:
-                                from audio_notifier import \
-                                    notify_bollinger_breakdown
                                 notify_bollinger_breakdown()
-                                print(f"🔊 播放布林带跌破音效: {self.name}({self.code}) (连续{self.bollinger_breakdown_consecutive_count}次)")
+                                log.info("🔊 播放布林带跌破音效: %s(%s) (连续%s次)", self.name, self.code, self.bollinger_breakdown_consecutive_count)
                             except Exception as e:
-                                print(f"播放布林带跌破音效失败: {e}")
+                                log.exception("播放布林带跌破音效失败: %s", e)
                         elif has_realtime_bollinger_breakdown:
-                            print(f"🔇 布林带跌破音效已跳过: {self.name}({self.code}) (连续{self.bollinger_breakdown_consecutive_count}次，超过限制)")
+                            log.info("🔇 布林带跌破音效已跳过: %s(%s) (连续%s次，超过限制)", self.name, self.code, self.bollinger_breakdown_consecutive_count)
                             
                     except Exception as e:
-                        print(f"播放信号音效和震动失败: {e}")
+                        log.exception("播放信号音效和震动失败: %s", e)
                 
                 # 启动震动和音效线程
-                import threading
                 threading.Thread(target=play_all_signals_audio_and_shake, daemon=True).start()
                         
             # 标记布林带信号已处理
@@ -5394,7 +5398,7 @@ class IntradayWindow:
             self._initialization_complete = True
             
         except Exception as e:
-            print(f"播放信号音频通知失败: {e}")
+            log.exception("播放信号音频通知失败: %s", e)
             # 即使出错也要标记初始化完成
             self._initialization_complete = True
     
@@ -5408,10 +5412,10 @@ class IntradayWindow:
             if hasattr(self, 'audio_toggle_btn') and self.audio_toggle_btn:
                 if self.audio_enabled:
                     self.audio_toggle_btn.config(text="🔊")
-                    print(f"🔊 音效已开启: {self.name}({self.code})")
+                    log.info("🔊 音效已开启: %s(%s)", self.name, self.code)
                 else:
                     self.audio_toggle_btn.config(text="🔇")
-                    print(f"🔇 音效已关闭: {self.name}({self.code})")
+                    log.info("🔇 音效已关闭: %s(%s)", self.name, self.code)
             
             # 如果切换到开启状态，播放一次音效和震动作为反馈
             if self.audio_enabled:
@@ -5424,21 +5428,19 @@ class IntradayWindow:
                             if hasattr(main_window, 'winfo_exists') and main_window.winfo_exists():
                                 # 立即开始震动
                                 WindowManager.shake_window(main_window, duration=0.5, intensity=8)
-                                print("🔔 音效开关测试震动提醒")
+                                log.info("🔔 音效开关测试震动提醒")
                         
                         # 播放测试音效
-                        from audio_notifier import notify_buy_signal
                         notify_buy_signal()
-                        print("🔊 播放音效开启反馈音效")
+                        log.info("🔊 播放音效开启反馈音效")
                     except Exception as e:
-                        print(f"播放音效开启反馈音效失败: {e}")
+                        log.exception("播放音效开启反馈音效失败: %s", e)
                 
                 # 启动震动和音效线程
-                import threading
                 threading.Thread(target=play_test_audio_and_shake, daemon=True).start()
                         
         except Exception as e:
-            print(f"切换音效开关失败: {e}")
+            log.exception("切换音效开关失败: %s", e)
     
     def _toggle_volume_display(self):
         """切换总成交量显示状态"""
@@ -5450,16 +5452,16 @@ class IntradayWindow:
             if hasattr(self, 'volume_display_btn') and self.volume_display_btn:
                 if self.volume_display_enabled:
                     self.volume_display_btn.config(text="||")
-                    print(f"|| 总成交量显示已开启: {self.name}({self.code})")
+                    log.info("|| 总成交量显示已开启: %s(%s)", self.name, self.code)
                 else:
                     self.volume_display_btn.config(text="=")
-                    print(f"= 总成交量显示已关闭: {self.name}({self.code})")
+                    log.info("= 总成交量显示已关闭: %s(%s)", self.name, self.code)
             
             # 重新绘制图表
             self._draw()
             
         except Exception as e:
-            print(f"切换总成交量显示失败: {e}")
+            log.exception("切换总成交量显示失败: %s", e)
     
     def _toggle_height_ratio(self):
         """切换分时窗口和日线窗口的高度比例"""
@@ -5467,10 +5469,10 @@ class IntradayWindow:
             # 切换比例模式
             if self.height_ratio_mode == "3:7":
                 self.height_ratio_mode = "7:3"
-                print(f"[DEBUG] 切换到7:3比例模式")
+                log.debug("切换到7:3比例模式")
             else:
                 self.height_ratio_mode = "3:7"
-                print(f"[DEBUG] 切换到3:7比例模式")
+                log.debug("切换到3:7比例模式")
             
             # 更新按钮显示
             if hasattr(self, 'ratio_btn') and self.ratio_btn:
@@ -5480,10 +5482,10 @@ class IntradayWindow:
             if self.height_ratio_callback:
                 self.height_ratio_callback(self.height_ratio_mode)
             else:
-                print(f"[WARNING] 高度比例回调函数未设置")
+                log.warning("高度比例回调函数未设置")
                 
         except Exception as e:
-            print(f"[ERROR] 切换高度比例失败: {str(e)}")
+            log.exception("切换高度比例失败: %s", e)
     
     def set_height_ratio_callback(self, callback):
         """设置高度比例变化回调函数
@@ -5538,7 +5540,7 @@ class IntradayWindow:
             return float(x_index[index])
             
         except Exception as e:
-            print(f"[ERROR] 计算5分钟中心位置失败: {e}")
+            log.exception("计算5分钟中心位置失败: %s", e)
             return float(x_index[index])
     
     def _plot_buy_signals(self, x_index: np.ndarray, prices: np.ndarray):
@@ -5548,16 +5550,16 @@ class IntradayWindow:
         :param prices: 价格数组
         """
         if self.buy_signals is None or len(self.buy_signals) == 0:
-            print("[DEBUG] 没有买入信号需要绘制")
+            log.debug("没有买入信号需要绘制")
             return
         
-        print(f"[DEBUG] 开始绘制买入信号，信号数量: {len(self.buy_signals)}")
+        log.debug("开始绘制买入信号，信号数量: %s", len(self.buy_signals))
         
         # 检查连涨信号
         consecutive_signals = [sig for sig in self.buy_signals if '连涨' in sig.get('signal_type', '')]
-        print(f"[DEBUG] 连涨信号数量: {len(consecutive_signals)}")
+        log.debug("连涨信号数量: %s", len(consecutive_signals))
         for i, sig in enumerate(consecutive_signals):
-            print(f"[DEBUG] 连涨信号{i+1}: 索引={sig['index']}, 价格={sig['price']:.3f}, is_fake={sig['is_fake']}, wait_validate={sig['wait_validate']}")
+            log.debug("连涨信号%s: 索引=%s, 价格=%.3f, is_fake=%s, wait_validate=%s", i + 1, sig['index'], sig['price'], sig['is_fake'], sig['wait_validate'])
         
         try:
             # 获取图表的实际显示范围（包含所有子图）
@@ -5594,7 +5596,7 @@ class IntradayWindow:
                 
                 # 检查信号类型
                 signal_type = signal.get('signal_type', '')
-                print(f"[DEBUG] 绘制信号: 类型={signal_type}, 索引={index}, 价格={price:.3f}")
+                log.debug("绘制信号: 类型=%s, 索引=%s, 价格=%.3f", signal_type, index, price)
                 if '突破压力位' in signal_type:
                     # 破压力买入信号：不显示竖线，只显示红色向上三角形
                     line_style = None  # 不绘制竖线
@@ -5621,7 +5623,6 @@ class IntradayWindow:
                     label_color = 'red'
                 elif '连涨' in signal_type:
                     # 连涨买入信号：使用配置参数
-                    from consecutive_signal_config import get_surge_config
                     config = get_surge_config()
                     line_style = config['line_style']
                     line_color = config['line_color']
@@ -5672,7 +5673,6 @@ class IntradayWindow:
                     last_signal_was_rsi_surge = True
                 elif '连涨' in signal_type:
                     # 连涨信号：使用配置参数
-                    from consecutive_signal_config import get_surge_config
                     config = get_surge_config()
                     label_text = config['display_text']
                     
@@ -5699,12 +5699,10 @@ class IntradayWindow:
                 
                 # 绘制竖线，垂直撑满整个图表的显示区域（MA上穿信号不绘制竖线）
                 if line_style is not None and line_color is not None:
-                    from matplotlib.lines import Line2D
 
                     x_pos = float(x_index[index])
                     # 根据信号类型设置线条宽度
                     if '连涨' in signal_type:
-                        from consecutive_signal_config import get_surge_config
                         config = get_surge_config()
                         line_width = config['line_width']
                     else:
@@ -5725,7 +5723,6 @@ class IntradayWindow:
                 # 标签位置：在信号价格下方
                 if '连涨' in signal_type:
                     # 连涨信号：使用配置参数
-                    from consecutive_signal_config import get_surge_config
                     config = get_surge_config()
                     label_offset = -(y_max - y_min) * config['label_offset_ratio']
                 else:
@@ -5746,7 +5743,6 @@ class IntradayWindow:
                     font_size = 12  # 增大字体
                 elif '连涨' in signal_type:
                     # 连涨信号：使用配置参数
-                    from consecutive_signal_config import get_surge_config
                     config = get_surge_config()
                     bbox_style = config['bbox_style']
                     font_size = config['font_size']
@@ -5769,7 +5765,7 @@ class IntradayWindow:
                                   zorder=6)
                 
         except Exception as e:
-            print(f"绘制分时买入信号时发生错误: {e}")
+            log.warning("绘制分时买入信号时发生错误: %s", e)
     
     def _plot_sell_signals(self, x_index: np.ndarray, prices: np.ndarray):
         """绘制分时卖出信号竖线和净涨跌幅标签
@@ -5850,7 +5846,6 @@ class IntradayWindow:
                     last_signal_was_rsi_plunge = False
                 elif '连跌' in signal_type:
                     # 连跌卖出信号：使用配置参数
-                    from consecutive_signal_config import get_plunge_config
                     config = get_plunge_config()
                     line_style = config['line_style']
                     line_color = config['line_color']
@@ -5897,12 +5892,10 @@ class IntradayWindow:
                     last_signal_was_rsi_plunge = False
                 
                 # 绘制竖线，垂直撑满整个图表的显示区域
-                from matplotlib.lines import Line2D
 
                 x_pos = float(x_index[index])
                 # 根据信号类型设置线条宽度
                 if '连跌' in signal_type:
-                    from consecutive_signal_config import get_plunge_config
                     config = get_plunge_config()
                     line_width = config['line_width']
                 else:
@@ -5925,7 +5918,6 @@ class IntradayWindow:
                     # 标签位置：在信号价格下方
                     if '连跌' in signal_type:
                         # 连跌信号：使用配置参数
-                        from consecutive_signal_config import get_plunge_config
                         config = get_plunge_config()
                         label_offset = (y_max - y_min) * config['label_offset_ratio']
                     else:
@@ -5942,7 +5934,6 @@ class IntradayWindow:
                         font_size = 12  # 增大字体
                     elif '连跌' in signal_type:
                         # 连跌信号：使用配置参数
-                        from consecutive_signal_config import get_plunge_config
                         config = get_plunge_config()
                         bbox_style = config['bbox_style']
                         font_size = config['font_size']
@@ -5968,7 +5959,7 @@ class IntradayWindow:
                                       zorder=6)
                 
         except Exception as e:
-            print(f"绘制分时卖出信号时发生错误: {e}")
+            log.warning("绘制分时卖出信号时发生错误: %s", e)
     
     # ------------------------------------------------------------------
     # 鼠标十字定位功能
@@ -6022,11 +6013,11 @@ class IntradayWindow:
         self.crosshair_lines = []
         for ax in [self.ax_price, self.ax_cost, self.ax_rsi]:
             if ax is not None:
-                line = ax.axvline(x=x_data, color='gray', linestyle='--', alpha=0.2)
+                line = ax.axvline(x=x_data, color='gray', linestyle='--', alpha=0.2, animated=True)
                 self.crosshair_lines.append(line)
         
         # 绘制水平线（仅在当前面板）
-        line = target_ax.axhline(y=event.ydata, color='gray', linestyle='--', alpha=0.2)
+        line = target_ax.axhline(y=event.ydata, color='gray', linestyle='--', alpha=0.2, animated=True)
         self.crosshair_lines.append(line)
         
         # 显示坐标值
@@ -6045,7 +6036,7 @@ class IntradayWindow:
             time_price_str = f'{time_str}-{price_str}'
             text = self.ax_price.text(x_data, self.ax_price.get_ylim()[0], 
                                     time_price_str,
-                                    ha='center', va='top',
+                                    ha='center', va='top', animated=True,
                                     bbox=dict(facecolor='white', alpha=0.8, pad=1))
             self.crosshair_text.append(text)
         
@@ -6059,35 +6050,75 @@ class IntradayWindow:
         text = target_ax.text(
             target_ax.get_xlim()[1], event.ydata,
             y_str,
-            ha='left', va='center',
+            ha='left', va='center', animated=True,
             bbox=dict(facecolor='white', alpha=0.8, pad=1)
         )
         self.crosshair_text.append(text)
-        print(f"[DEBUG] 文本已添加到crosshair_text列表，当前列表长度: {len(self.crosshair_text)}")
         
-        # 重绘画布
-        self.canvas.draw_idle()
+        # 十字线只在缓存背景上blit，不触发整图重绘
+        self._blit_crosshair()
     
     def _on_leave(self, event):
         """处理鼠标离开事件"""
         self._remove_crosshair()
-        self.canvas.draw_idle()
+        self._blit_crosshair()
     
-    def _remove_crosshair(self):
-        """移除十字线和文本"""
+    def _crosshair_artists(self) -> list:
+        """当前十字线及坐标文本艺术家列表"""
+        return (self.crosshair_lines or []) + (self.crosshair_text or [])
+    
+    def _on_canvas_draw(self, event):
+        """整图绘制完成后缓存不含十字线的背景，并把十字线补画到新背景上
+        
+        十字线艺术家均为animated，整图绘制时会被跳过，背景缓存因此不含十字线。
+        """
+        self._blit_background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self._crosshair_artists():
+            self.fig.draw_artist(artist)
+    
+    def _request_draw(self):
+        """请求在Tk空闲时整图重绘；已有待执行的重绘时不再重复排队"""
+        if self._draw_pending:
+            return
+        self._draw_pending = True
+        self.window.after_idle(self._run_pending_draw)
+    
+    def _run_pending_draw(self):
+        """执行排队的整图重绘；无论渲染是否抛出异常都清除排队标记，避免之后的重绘请求全部被忽略"""
         try:
-            if self.crosshair_lines:
-                for line in self.crosshair_lines:
-                    line.remove()
-                self.crosshair_lines = None
-            
-            if self.crosshair_text:
-                for text in self.crosshair_text:
-                    text.remove()
-                self.crosshair_text = None
-            
-        except Exception as e:
-            print(f"移除十字线时出错: {str(e)}") 
+            if not self._is_destroyed:
+                self.canvas.draw()
+        finally:
+            self._draw_pending = False
+    
+    def _blit_crosshair(self):
+        """恢复背景缓存后只绘制十字线并blit；背景不可用时退回整图重绘"""
+        if self._draw_pending:
+            # 已排队的整图重绘会连同十字线一起绘制，此时的背景缓存已过期
+            return
+        background = self._blit_background
+        if background is None or background.get_extents() != tuple(int(v) for v in self.fig.bbox.extents):
+            self._request_draw()
+            return
+        self.canvas.restore_region(background)
+        for artist in self._crosshair_artists():
+            self.fig.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+    
+    def _remove_crosshair(self):
+        """移除十字线和文本
+        
+        逐个移除：所在坐标轴已被clear的图元已经脱离坐标轴，remove会抛出NotImplementedError，
+        不能因此中断其余面板（如不再清空的RSI面板）上图元的移除。
+        """
+        artists = self._crosshair_artists()
+        self.crosshair_lines = None
+        self.crosshair_text = None
+        for artist in artists:
+            try:
+                artist.remove()
+            except Exception as e:
+                log.debug("移除十字线图元时出错: %s", e)
 
     # ------------------------------------------------------------------
     # 信号自定义接口
@@ -6165,7 +6196,6 @@ class IntradayWindow:
         self.signal_manager.add_sell_signal(RSISellSignal())
         self.signal_manager.add_sell_signal(RSIPlungeSellSignal())
         # 添加连续5次连跌卖出信号
-        from consecutive_plunge_signal import ConsecutivePlungeSellSignal
         self.signal_manager.add_sell_signal(ConsecutivePlungeSellSignal())
     
     def _update_bollinger_data(self, bollinger_upper: pd.Series, bollinger_middle: pd.Series, bollinger_lower: pd.Series):
@@ -6189,13 +6219,13 @@ class IntradayWindow:
                 self.window.after(0, self._draw)
                 
         except Exception as e:
-            print(f"更新布林带数据失败: {e}")
+            log.exception("更新布林带数据失败: %s", e)
 
     def _detect_signals_with_bollinger(self):
         """在布林带数据可用时重新检测信号"""
         try:
             if self.price_df is None or self.price_df.empty:
-                print("[DEBUG] 价格数据不可用，跳过信号检测")
+                log.debug("价格数据不可用，跳过信号检测")
                 return
             
             price_df = self.price_df
@@ -6228,14 +6258,14 @@ class IntradayWindow:
                     signal.reset_state()
             
             # 检测买入和卖出信号
-            print("[DEBUG] 布林带数据可用，开始检测信号...")
+            log.debug("布林带数据可用，开始检测信号...")
             basic_buy_signals = self.signal_manager.detect_buy_signals(data, price_df['close'])
             basic_sell_signals = self.signal_manager.detect_sell_signals(data, price_df['close'])
             
-            print(f"[DEBUG] 信号检测完成 - 买入信号: {len(basic_buy_signals)}, 卖出信号: {len(basic_sell_signals)}")
+            log.debug("信号检测完成 - 买入信号: %s, 卖出信号: %s", len(basic_buy_signals), len(basic_sell_signals))
             if basic_buy_signals:
                 for i, signal in enumerate(basic_buy_signals):
-                    print(f"[DEBUG] 买入信号 {i+1}: {signal.get('signal_type', 'Unknown')}")
+                    log.debug("买入信号 %s: %s", i+1, signal.get('signal_type', 'Unknown'))
             
             # 更新信号列表
             self.buy_signals = basic_buy_signals
@@ -6245,9 +6275,7 @@ class IntradayWindow:
             self._play_signal_audio_notifications()
             
         except Exception as e:
-            print(f"[ERROR] 布林带信号检测失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("布林带信号检测失败: %s", e)
 
     def _calculate_bollinger_ratio(self, signal: Dict[str, Any], index: int) -> str:
         """计算布林带位置比例
@@ -6274,11 +6302,10 @@ class IntradayWindow:
             lower_band = self.bollinger_5min_lower.iloc[index]
             
             # 使用trading_utils中的通用布林带比例计算函数
-            from trading_utils import calculate_bollinger_ratio
             return calculate_bollinger_ratio(current_price, middle_band, lower_band)
                 
         except Exception as e:
-            print(f"[ERROR] 计算布林带比例失败: {e}")
+            log.exception("计算布林带比例失败: %s", e)
             return ""
 
     def _plot_bollinger_bands(self, x_index: np.ndarray, prices: np.ndarray):
@@ -6329,13 +6356,11 @@ class IntradayWindow:
                              linestyle=lower_linestyle,
                              label='布林下轨')
             
-            print(f"[DEBUG] 布林带绘制完成，当前价格: {current_price:.3f}, 中轨: {middle_price:.3f}")
-            print(f"[DEBUG] 线型设置 - 上轨: {upper_linestyle}, 下轨: {lower_linestyle}")
+            log.debug("布林带绘制完成，当前价格: %.3f, 中轨: %.3f", current_price, middle_price)
+            log.debug("线型设置 - 上轨: %s, 下轨: %s", upper_linestyle, lower_linestyle)
             
         except Exception as e:
-            print(f"绘制布林带失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("绘制布林带失败: %s", e)
 
     def _plot_latest_rsi_signal(self, x_index: np.ndarray, prices: np.ndarray):
         """绘制最新价格RSI信息信号
@@ -6414,11 +6439,11 @@ class IntradayWindow:
                 # 计算绘图区域右边界对应的数据坐标
                 chart_right = xlim[0] + (plot_right_fig - ax_pos.x0) / (ax_pos.x1 - ax_pos.x0) * data_range
                 
-                print(f"[DEBUG] 绘图区域计算: ax_pos={ax_pos}, fig_width={fig_width}, plot_width_pixels={plot_width_pixels}")
-                print(f"[DEBUG] plot_right_fig={plot_right_fig}, chart_right={chart_right}")
+                log.debug("绘图区域计算: ax_pos=%s, fig_width=%s, plot_width_pixels=%s", ax_pos, fig_width, plot_width_pixels)
+                log.debug("plot_right_fig=%s, chart_right=%s", plot_right_fig, chart_right)
                 
             except Exception as e:
-                print(f"计算绘图区域边界失败，使用备用方法: {e}")
+                log.debug("计算绘图区域边界失败，使用备用方法: %s", e)
                 # 备用方法：使用get_xlim()
                 chart_right = self.ax_price.get_xlim()[1]
             
@@ -6508,12 +6533,12 @@ class IntradayWindow:
                     zorder=7  # 确保在其他元素之上
                 )
             
-            print(f"[DEBUG] 分时窗口 - 绘制最新RSI信息信号:")
-            print(f"[DEBUG]   基准位置: x={x_index[latest_index]}, y={label_y:.3f}")
-            print(f"[DEBUG]   图表右边界: {chart_right:.3f}")
-            print(f"[DEBUG]   框高度: {box_height:.3f}")
-            print(f"[DEBUG]   垂直偏移: {vertical_offset:.3f}")
-            print(f"[DEBUG]   框间距: {box_spacing:.3f}")
+            log.debug("分时窗口 - 绘制最新RSI信息信号:")
+            log.debug("基准位置: x=%s, y=%.3f", x_index[latest_index], label_y)
+            log.debug("图表右边界: %.3f", chart_right)
+            log.debug("框高度: %.3f", box_height)
+            log.debug("垂直偏移: %.3f", vertical_offset)
+            log.debug("框间距: %.3f", box_spacing)
             if latest_rsi6_1min is not None:
                 rsi6_1min_converted = int((latest_rsi6_1min - 50) * 2)
                 # 使用相同的固定宽度格式
@@ -6521,7 +6546,7 @@ class IntradayWindow:
                     rsi6_1min_debug_text = f"+{rsi6_1min_converted:02d}"
                 else:
                     rsi6_1min_debug_text = f"{rsi6_1min_converted:03d}"
-                print(f"[DEBUG]   RSI6(1min): 原始值={latest_rsi6_1min:.1f}, 转换值={rsi6_1min_debug_text}, 位置=({chart_right:.3f}, {upper_y:.3f}), 对齐=left,bottom, 字号=9")
+                log.debug("RSI6(1min): 原始值=%.1f, 转换值=%s, 位置=(%.3f, %.3f), 对齐=left,bottom, 字号=9", latest_rsi6_1min, rsi6_1min_debug_text, chart_right, upper_y)
             if latest_rsi6_5min is not None:
                 rsi6_5min_converted = int((latest_rsi6_5min - 50) * 2)
                 # 使用相同的固定宽度格式
@@ -6529,21 +6554,19 @@ class IntradayWindow:
                     rsi6_5min_debug_text = f"+{rsi6_5min_converted:02d}"
                 else:
                     rsi6_5min_debug_text = f"{rsi6_5min_converted:03d}"
-                print(f"[DEBUG]   RSI6(5min): 原始值={latest_rsi6_5min:.1f}, 转换值={rsi6_5min_debug_text}, 位置=({chart_right:.3f}, {lower_y:.3f}), 对齐=left,top, 字号=9")
+                log.debug("RSI6(5min): 原始值=%.1f, 转换值=%s, 位置=(%.3f, %.3f), 对齐=left,top, 字号=9", latest_rsi6_5min, rsi6_5min_debug_text, chart_right, lower_y)
             
         except Exception as e:
-            print(f"绘制最新RSI信息信号时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("绘制最新RSI信息信号时发生错误: %s", e)
         """
 
     def force_refresh_data(self):
         """强制刷新数据，忽略缓存"""
-        print("[DEBUG] 强制刷新数据")
+        log.debug("强制刷新数据")
         self._force_refresh = True
         # 立即触发数据更新
         if hasattr(self, 'window') and self.window and self.window.winfo_exists():
-            threading.Thread(target=self._update_data, daemon=True).start()
+            self._submit_update()
 
     def set_cache_duration(self, duration_seconds: int):
         """设置缓存有效时间
@@ -6551,11 +6574,10 @@ class IntradayWindow:
         :param duration_seconds: 缓存有效时间（秒）
         """
         self._cache_valid_duration = duration_seconds
-        print(f"[DEBUG] 缓存有效时间设置为: {duration_seconds}秒")
+        log.debug("缓存有效时间设置为: %s秒", duration_seconds)
 
     def get_cache_status(self):
         """获取缓存状态信息"""
-        from datetime import datetime
         now = datetime.now()
         
         if self._last_data_fetch_time is None:
@@ -6582,31 +6604,28 @@ class IntradayWindow:
             if self.price_df is None or self.price_df.empty:
                 return
             
-            # 调试：检查原始数据
-            print(f"[DEBUG] 原始price_df列名: {list(self.price_df.columns)}")
-            print(f"[DEBUG] 原始price_df前5行数据:")
-            print(self.price_df.head())
-            print(f"[DEBUG] 原始price_df数据类型:")
-            print(self.price_df.dtypes)
+            # 调试：检查原始数据（统计类参数计算有开销，仅在调试级别开启时执行）
+            debug_enabled = log.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
+                log.debug("原始price_df列名: %s", list(self.price_df.columns))
+                log.debug("原始price_df前5行数据:\n%s", self.price_df.head())
+                log.debug("原始price_df数据类型:\n%s", self.price_df.dtypes)
             
             # 检查必要的列是否存在
             required_columns = ['open', 'close', 'high', 'low', 'volume']
             missing_columns = [col for col in required_columns if col not in self.price_df.columns]
             if missing_columns:
-                print(f"[ERROR] 缺少必要的列: {missing_columns}")
+                log.error("缺少必要的列: %s", missing_columns)
                 return
             
             # 验证数据质量
-            print(f"[DEBUG] 重采样前数据验证:")
-            print(f"[DEBUG] open列非空值数量: {self.price_df['open'].notna().sum()}")
-            print(f"[DEBUG] close列非空值数量: {self.price_df['close'].notna().sum()}")
-            print(f"[DEBUG] high列非空值数量: {self.price_df['high'].notna().sum()}")
-            print(f"[DEBUG] low列非空值数量: {self.price_df['low'].notna().sum()}")
-            print(f"[DEBUG] volume列非空值数量: {self.price_df['volume'].notna().sum()}")
+            if debug_enabled:
+                log.debug("重采样前数据验证，各列非空值数量: %s",
+                          self.price_df[required_columns].notna().sum().to_dict())
             
             # 检查是否有足够的有效数据
             if self.price_df['close'].notna().sum() < 5:
-                print(f"[ERROR] 有效收盘价数据不足，无法进行5分钟重采样")
+                log.error("有效收盘价数据不足，无法进行5分钟重采样")
                 return
             
             # 将1分钟数据重采样为5分钟K线数据
@@ -6629,47 +6648,49 @@ class IntradayWindow:
             
             # 特殊处理：如果开盘价为0，使用前一根K线的收盘价作为开盘价
             if (price_5min['open'] == 0).any():
-                print(f"[INFO] 检测到5分钟K线开盘价为0，进行修复...")
+                log.info("检测到5分钟K线开盘价为0，进行修复...")
                 # 使用前向填充，但第一根K线使用收盘价
                 price_5min['open'] = price_5min['open'].replace(0, np.nan)
                 price_5min['open'] = price_5min['open'].fillna(method='ffill')
                 # 如果第一根K线的开盘价仍然为NaN，使用收盘价
                 price_5min['open'] = price_5min['open'].fillna(price_5min['close'])
-                print(f"[INFO] 5分钟K线开盘价修复完成")
+                log.info("5分钟K线开盘价修复完成")
             
             # 验证重采样后的数据
-            print(f"[DEBUG] 重采样后数据验证:")
-            print(f"[DEBUG] 5分钟数据行数: {len(price_5min)}")
+            log.debug("重采样后数据验证:")
+            log.debug("5分钟数据行数: %s", len(price_5min))
             if not price_5min.empty:
-                print(f"[DEBUG] 开盘价范围: {price_5min['open'].min():.4f} - {price_5min['open'].max():.4f}")
-                print(f"[DEBUG] 收盘价范围: {price_5min['close'].min():.4f} - {price_5min['close'].max():.4f}")
-                print(f"[DEBUG] 最高价范围: {price_5min['high'].min():.4f} - {price_5min['high'].max():.4f}")
-                print(f"[DEBUG] 最低价范围: {price_5min['low'].min():.4f} - {price_5min['low'].max():.4f}")
+                if debug_enabled:
+                    log.debug("开盘价范围: %.4f - %.4f", price_5min['open'].min(), price_5min['open'].max())
+                    log.debug("收盘价范围: %.4f - %.4f", price_5min['close'].min(), price_5min['close'].max())
+                    log.debug("最高价范围: %.4f - %.4f", price_5min['high'].min(), price_5min['high'].max())
+                    log.debug("最低价范围: %.4f - %.4f", price_5min['low'].min(), price_5min['low'].max())
                 
                 # 检查是否有异常的开盘价（为0或NaN）
                 zero_open_count = (price_5min['open'] == 0).sum()
                 nan_open_count = price_5min['open'].isna().sum()
-                print(f"[DEBUG] 开盘价为0的数量: {zero_open_count}")
-                print(f"[DEBUG] 开盘价为NaN的数量: {nan_open_count}")
+                log.debug("开盘价为0的数量: %s", zero_open_count)
+                log.debug("开盘价为NaN的数量: %s", nan_open_count)
                 
                 if zero_open_count > 0 or nan_open_count > 0:
-                    print(f"[WARNING] 发现异常的开盘价，尝试修复...")
+                    log.warning("发现异常的开盘价，尝试修复...")
                     # 使用前一根K线的收盘价作为开盘价
                     price_5min['open'] = price_5min['open'].replace(0, np.nan)
                     price_5min['open'] = price_5min['open'].fillna(method='ffill')
                     # 如果第一根K线的开盘价仍然为NaN，使用收盘价
                     price_5min['open'] = price_5min['open'].fillna(price_5min['close'])
-                    print(f"[DEBUG] 修复后开盘价范围: {price_5min['open'].min():.4f} - {price_5min['open'].max():.4f}")
+                    if debug_enabled:
+                        log.debug("修复后开盘价范围: %.4f - %.4f", price_5min['open'].min(), price_5min['open'].max())
             
             if price_5min.empty:
-                print("[DEBUG] 5分钟K线数据为空，跳过绘制")
+                log.debug("5分钟K线数据为空，跳过绘制")
                 return
             
-            print(f"[DEBUG] 开始绘制5分钟K线柱子，数据点: {len(price_5min)}")
-            print(f"[DEBUG] 5分钟K线数据前5行:")
-            print(price_5min.head())
-            print(f"[DEBUG] 5分钟K线开盘价范围: {price_5min['open'].min():.4f} - {price_5min['open'].max():.4f}")
-            print(f"[DEBUG] 5分钟K线收盘价范围: {price_5min['close'].min():.4f} - {price_5min['close'].max():.4f}")
+            log.debug("开始绘制5分钟K线柱子，数据点: %s", len(price_5min))
+            if debug_enabled:
+                log.debug("5分钟K线数据前5行:\n%s", price_5min.head())
+                log.debug("5分钟K线开盘价范围: %.4f - %.4f", price_5min['open'].min(), price_5min['open'].max())
+                log.debug("5分钟K线收盘价范围: %.4f - %.4f", price_5min['close'].min(), price_5min['close'].max())
             
             # 计算5分钟K线在1分钟时间轴上的位置和宽度
             # 将5分钟时间戳映射到1分钟时间轴的位置
@@ -6711,11 +6732,11 @@ class IntradayWindow:
                 
                 # 数据验证和修复
                 if pd.isna(open_price) or open_price == 0:
-                    print(f"[WARNING] 第{i}根K线开盘价异常: {open_price}，使用收盘价替代")
+                    log.warning("第%s根K线开盘价异常: %s，使用收盘价替代", i, open_price)
                     open_price = close_price
                 
                 if pd.isna(close_price) or close_price == 0:
-                    print(f"[WARNING] 第{i}根K线收盘价异常: {close_price}，跳过绘制")
+                    log.warning("第%s根K线收盘价异常: %s，跳过绘制", i, close_price)
                     continue
                 
                 if pd.isna(high_price) or high_price == 0:
@@ -6778,12 +6799,10 @@ class IntradayWindow:
                                      [min(open_price, close_price), low_price], 
                                      color=shadow_color, alpha=alpha, linewidth=1)
             
-            print(f"[DEBUG] 5分钟K线柱子绘制完成，共绘制{len(price_5min)}个柱子")
+            log.debug("5分钟K线柱子绘制完成，共绘制%s个柱子", len(price_5min))
             
         except Exception as e:
-            print(f"[ERROR] 绘制5分钟K线柱子失败: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            log.exception("绘制5分钟K线柱子失败: %s", e)
 
     def _find_recent_peak(self, data_series: pd.Series, peak_type: str = "high") -> float:
         """找到数据序列中的最近一个峰值点（增强版）
@@ -6797,13 +6816,12 @@ class IntradayWindow:
         :return: 最近峰值点的价格
         """
         try:
-            import numpy as np
             from scipy.signal import find_peaks
 
             # 移除NaN值
             clean_data = data_series.dropna()
             if clean_data.empty:
-                print(f"[DEBUG] 数据序列为空，无法找到峰值")
+                log.debug("数据序列为空，无法找到峰值")
                 return data_series.max() if peak_type == "high" else data_series.min()
             
             data_array = clean_data.values.astype(np.float64)
@@ -6817,7 +6835,7 @@ class IntradayWindow:
             else:
                 is_extreme = (last_value == data_array.min())
             
-            print(f"[DEBUG] 15:00收盘价 {last_value:.3f} 是否为全天{peak_type}极值: {is_extreme}")
+            log.debug("15:00收盘价 %.3f 是否为全天%s极值: %s", last_value, peak_type, is_extreme)
             
             if peak_type == "high":
                 # 寻找高点
@@ -6827,41 +6845,41 @@ class IntradayWindow:
                     distance=3  # 峰值之间至少间隔3个数据点（3分钟）
                 )
                 
-                print(f"[DEBUG] 标准peak检测找到 {len(peaks)} 个高点峰值")
+                log.debug("标准peak检测找到 %s 个高点峰值", len(peaks))
                 
                 # 特殊处理：如果15:00收盘价是全天最高点且未被检测为峰值
                 if is_extreme:
                     if len(peaks) == 0:
                         # 没有检测到峰值，直接使用15:00收盘价
-                        print(f"[DEBUG] 没有检测到峰值，使用15:00收盘价作为峰值")
+                        log.debug("没有检测到峰值，使用15:00收盘价作为峰值")
                         return float(last_value)
                     else:
                         # 检测到了峰值，比较15:00收盘价与最近峰值
                         recent_peak = data_array[peaks[-1]]
                         if last_value > recent_peak:
-                            print(f"[DEBUG] 15:00收盘价 {last_value:.3f} 高于最近峰值 {recent_peak:.3f}，使用15:00收盘价")
+                            log.debug("15:00收盘价 %.3f 高于最近峰值 %.3f，使用15:00收盘价", last_value, recent_peak)
                             return float(last_value)
                         else:
-                            print(f"[DEBUG] 使用最近峰值 {recent_peak:.3f}")
+                            log.debug("使用最近峰值 %.3f", recent_peak)
                             return float(recent_peak)
                 else:
                     # 正常情况，使用标准peak检测结果
                     if len(peaks) == 0:
-                        print(f"[DEBUG] 未找到明显的高点峰值，使用最高价")
+                        log.debug("未找到明显的高点峰值，使用最高价")
                         return float(data_array.max())
                     
                     # 获取峰值对应的价格和索引
                     peak_prices = data_array[peaks]
                     peak_indices = clean_data.index[peaks]
                     
-                    print(f"[DEBUG] 找到 {len(peaks)} 个高点峰值:")
+                    log.debug("找到 %s 个高点峰值:", len(peaks))
                     for i, (idx, price) in enumerate(zip(peak_indices, peak_prices)):
-                        print(f"[DEBUG]   高点{i+1}: {idx} - {price:.3f}")
+                        log.debug("高点%s: %s - %.3f", i + 1, idx, price)
                     
                     # 返回最近的一个高点（最后一个）
                     recent_peak_price = float(peak_prices[-1])
                     recent_peak_time = peak_indices[-1]
-                    print(f"[DEBUG] 最近高点: {recent_peak_time} - {recent_peak_price:.3f}")
+                    log.debug("最近高点: %s - %.3f", recent_peak_time, recent_peak_price)
                     
                     return recent_peak_price
                 
@@ -6873,52 +6891,52 @@ class IntradayWindow:
                     distance=3
                 )
                 
-                print(f"[DEBUG] 标准peak检测找到 {len(peaks)} 个低点峰值")
+                log.debug("标准peak检测找到 %s 个低点峰值", len(peaks))
                 
                 # 特殊处理：如果15:00收盘价是全天最低点且未被检测为峰值
                 if is_extreme:
                     if len(peaks) == 0:
                         # 没有检测到峰值，直接使用15:00收盘价
-                        print(f"[DEBUG] 没有检测到峰值，使用15:00收盘价作为峰值")
+                        log.debug("没有检测到峰值，使用15:00收盘价作为峰值")
                         return float(last_value)
                     else:
                         # 检测到了峰值，比较15:00收盘价与最近峰值
                         recent_peak = data_array[peaks[-1]]
                         if last_value < recent_peak:
-                            print(f"[DEBUG] 15:00收盘价 {last_value:.3f} 低于最近峰值 {recent_peak:.3f}，使用15:00收盘价")
+                            log.debug("15:00收盘价 %.3f 低于最近峰值 %.3f，使用15:00收盘价", last_value, recent_peak)
                             return float(last_value)
                         else:
-                            print(f"[DEBUG] 使用最近峰值 {recent_peak:.3f}")
+                            log.debug("使用最近峰值 %.3f", recent_peak)
                             return float(recent_peak)
                 else:
                     # 正常情况，使用标准peak检测结果
                     if len(peaks) == 0:
-                        print(f"[DEBUG] 未找到明显的低点峰值，使用最低价")
+                        log.debug("未找到明显的低点峰值，使用最低价")
                         return float(data_array.min())
                     
                     # 获取峰值对应的价格和索引
                     peak_prices = data_array[peaks]
                     peak_indices = clean_data.index[peaks]
                     
-                    print(f"[DEBUG] 找到 {len(peaks)} 个低点峰值:")
+                    log.debug("找到 %s 个低点峰值:", len(peaks))
                     for i, (idx, price) in enumerate(zip(peak_indices, peak_prices)):
-                        print(f"[DEBUG]   低点{i+1}: {idx} - {price:.3f}")
+                        log.debug("低点%s: %s - %.3f", i + 1, idx, price)
                     
                     # 返回最近的一个低点（最后一个）
                     recent_peak_price = float(peak_prices[-1])
                     recent_peak_time = peak_indices[-1]
-                    print(f"[DEBUG] 最近低点: {recent_peak_time} - {recent_peak_price:.3f}")
+                    log.debug("最近低点: %s - %.3f", recent_peak_time, recent_peak_price)
                     
                     return recent_peak_price
                 
         except ImportError:
-            print(f"[DEBUG] scipy未安装，使用简单方法找峰值")
+            log.debug("scipy未安装，使用简单方法找峰值")
             if peak_type == "high":
                 return float(data_series.max())
             else:
                 return float(data_series.min())
         except Exception as e:
-            print(f"[ERROR] 峰值检测失败: {str(e)}")
+            log.error("峰值检测失败: %s", e)
             # 备用方案
             if peak_type == "high":
                 return float(data_series.max())
@@ -6935,26 +6953,26 @@ class IntradayWindow:
             opening_time_925 = self._get_time_x_coordinate("09:25")
             if opening_time_925 is not None and opening_time_925 < len(self.price_df):
                 opening_price = self.price_df.iloc[int(opening_time_925)]['close']
-                print(f"[DEBUG] 获取9:25开盘价: {opening_price:.3f}")
+                log.debug("获取9:25开盘价: %.3f", opening_price)
                 return float(opening_price)
             
             # 如果9:25没有数据，尝试9:30
             opening_time_930 = self._get_time_x_coordinate("09:30")
             if opening_time_930 is not None and opening_time_930 < len(self.price_df):
                 opening_price = self.price_df.iloc[int(opening_time_930)]['close']
-                print(f"[DEBUG] 获取9:30开盘价: {opening_price:.3f}")
+                log.debug("获取9:30开盘价: %.3f", opening_price)
                 return float(opening_price)
             
             # 如果都没有，使用第一个数据点
             if len(self.price_df) > 0:
                 opening_price = self.price_df.iloc[0]['close']
-                print(f"[DEBUG] 使用第一个数据点作为开盘价: {opening_price:.3f}")
+                log.debug("使用第一个数据点作为开盘价: %.3f", opening_price)
                 return float(opening_price)
             
             return None
             
         except Exception as e:
-            print(f"[ERROR] 获取开盘价失败: {str(e)}")
+            log.exception("获取开盘价失败: %s", e)
             return None
 
     def _get_previous_day_change(self) -> Optional[str]:
@@ -6984,7 +7002,7 @@ class IntradayWindow:
                 return 'flat'
                 
         except Exception as e:
-            print(f"[ERROR] 获取上一个交易日涨跌情况失败: {str(e)}")
+            log.exception("获取上一个交易日涨跌情况失败: %s", e)
             return None
 
     def _determine_line_styles(self) -> tuple[str, str]:
@@ -7004,7 +7022,7 @@ class IntradayWindow:
             # 获取开盘价
             opening_price = self._get_opening_price()
             if opening_price is None:
-                print("[DEBUG] 无法获取开盘价，使用默认实线")
+                log.debug("无法获取开盘价，使用默认实线")
                 return 'solid', 'solid'
             
             # 获取看涨线和看跌线价格
@@ -7012,42 +7030,42 @@ class IntradayWindow:
             bearish_price = self.bearish_line_price
             
             if bullish_price is None or bearish_price is None:
-                print("[DEBUG] 看涨线或看跌线价格为空，使用默认实线")
+                log.debug("看涨线或看跌线价格为空，使用默认实线")
                 return 'solid', 'solid'
             
-            print(f"[DEBUG] 开盘价: {opening_price:.3f}, 看涨线: {bullish_price:.3f}, 看跌线: {bearish_price:.3f}")
+            log.debug("开盘价: %.3f, 看涨线: %.3f, 看跌线: %.3f", opening_price, bullish_price, bearish_price)
             
             # 判断开盘价位置
             if opening_price > bullish_price:
                 # 开盘价在看涨线上方，看涨趋势有效，看涨线实线，看跌线虚线
-                print("[DEBUG] 开盘价在看涨线上方，看涨趋势有效，看涨线实线，看跌线虚线")
+                log.debug("开盘价在看涨线上方，看涨趋势有效，看涨线实线，看跌线虚线")
                 return 'solid', 'dashed'
             elif opening_price < bearish_price:
                 # 开盘价在看跌线下方，看跌趋势有效，看涨线虚线，看跌线实线
-                print("[DEBUG] 开盘价在看跌线下方，看跌趋势有效，看涨线虚线，看跌线实线")
+                log.debug("开盘价在看跌线下方，看跌趋势有效，看涨线虚线，看跌线实线")
                 return 'dashed', 'solid'
             else:
                 # 开盘价在中间区域（在看涨线和看跌线之间），根据距离哪条线更近来判断
                 distance_to_bullish = abs(opening_price - bullish_price)
                 distance_to_bearish = abs(opening_price - bearish_price)
                 
-                print(f"[DEBUG] 开盘价在中间区域，距离看涨线: {distance_to_bullish:.3f}, 距离看跌线: {distance_to_bearish:.3f}")
+                log.debug("开盘价在中间区域，距离看涨线: %.3f, 距离看跌线: %.3f", distance_to_bullish, distance_to_bearish)
                 
                 if distance_to_bullish < distance_to_bearish:
                     # 距离看涨线更近，看涨趋势有效，看涨线实线，看跌线虚线
-                    print("[DEBUG] 距离看涨线更近，看涨趋势有效，看涨线实线，看跌线虚线")
+                    log.debug("距离看涨线更近，看涨趋势有效，看涨线实线，看跌线虚线")
                     return 'solid', 'dashed'
                 elif distance_to_bearish < distance_to_bullish:
                     # 距离看跌线更近，看跌趋势有效，看涨线虚线，看跌线实线
-                    print("[DEBUG] 距离看跌线更近，看跌趋势有效，看涨线虚线，看跌线实线")
+                    log.debug("距离看跌线更近，看跌趋势有效，看涨线虚线，看跌线实线")
                     return 'dashed', 'solid'
                 else:
                     # 距离相等，趋势不明，都是虚线
-                    print("[DEBUG] 距离看涨线和看跌线相等，趋势不明，都是虚线")
+                    log.debug("距离看涨线和看跌线相等，趋势不明，都是虚线")
                     return 'dashed', 'dashed'
                     
         except Exception as e:
-            print(f"[ERROR] 确定线型失败: {str(e)}")
+            log.exception("确定线型失败: %s", e)
             return 'solid', 'solid'
 
     def _get_time_x_coordinate(self, time_str: str) -> Optional[float]:
@@ -7061,7 +7079,6 @@ class IntradayWindow:
                 return None
             
             # 解析时间字符串
-            from datetime import datetime
             target_time = datetime.strptime(time_str, "%H:%M").time()
             
             # 获取当前交易日日期
@@ -7080,11 +7097,11 @@ class IntradayWindow:
             # x_index = np.arange(len(prices))，所以x坐标就是索引位置
             x_coordinate = float(closest_idx)
             
-            print(f"[DEBUG] 时间{time_str}对应的x坐标: {x_coordinate} (时间: {closest_time})")
+            log.debug("时间%s对应的x坐标: %s (时间: %s)", time_str, x_coordinate, closest_time)
             return x_coordinate
             
         except Exception as e:
-            print(f"[ERROR] 计算时间x坐标失败: {str(e)}")
+            log.exception("计算时间x坐标失败: %s", e)
             return None
     
     def _plot_volume_display_lines(self, x_index, x_times):
@@ -7158,8 +7175,8 @@ class IntradayWindow:
             # 计算0.25%涨幅在Y轴上的高度
             bin_height = bin_size_price / (y_max - y_min) * chart_height
             
-            print(f"[DEBUG] 成交量子图 - 图表高度: {chart_height:.2f}, 0.25%涨幅价格差: {bin_size_price:.4f}, bin高度: {bin_height:.2f}")
-            print(f"[DEBUG] 成交量子图 - X轴范围: 0 到 {max_volume * 1.1:.0f}")
+            log.debug("成交量子图 - 图表高度: %.2f, 0.25%%涨幅价格差: %.4f, bin高度: %.2f", chart_height, bin_size_price, bin_height)
+            log.debug("成交量子图 - X轴范围: 0 到 %.0f", max_volume * 1.1)
             
             # 为每个价格绘制总成交量横向柱子（右对齐向左延伸）
             for price, volume_data in volume_by_price.items():
@@ -7171,8 +7188,8 @@ class IntradayWindow:
                     bar_right = max_volume * 1.1  # 右边缘对齐成交量子图右边缘
                     bar_left = bar_right - bar_length  # 左边缘根据成交量计算
                     
-                    print(f"[DEBUG] 价格{price:.2f}: 成交量={volume_data['total_volume']:.0f}, 柱子长度={bar_length:.2f}")
-                    print(f"[DEBUG] 柱子位置: 左={bar_left:.2f}, 右={bar_right:.2f}")
+                    log.debug("价格%.2f: 成交量=%.0f, 柱子长度=%.2f", price, volume_data['total_volume'], bar_length)
+                    log.debug("柱子位置: 左=%.2f, 右=%.2f", bar_left, bar_right)
                     
                     # 确定柱子颜色（正差值红色，负差值绿色）
                     color = 'red' if volume_data['net_volume'] >= 0 else 'green'
@@ -7186,12 +7203,10 @@ class IntradayWindow:
                                             color=color, alpha=0.8, edgecolor='black', linewidth=0.5)
                     self.volume_display_lines.append(bar[0])
             
-            print(f"[DEBUG] 已绘制{len(self.volume_display_lines)}个总成交量柱子")
+            log.debug("已绘制%s个总成交量柱子", len(self.volume_display_lines))
             
         except Exception as e:
-            print(f"[ERROR] 绘制总成交量柱子失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("绘制总成交量柱子失败: %s", e)
     
     def _calculate_volume_by_price(self):
         """按0.25%涨幅一个bin计算各价格区间的总成交量
@@ -7210,7 +7225,7 @@ class IntradayWindow:
             # 获取前一交易日收盘价作为基准
             prev_close = self._get_previous_close()
             if prev_close is None or prev_close <= 0:
-                print("[WARNING] 无法获取前一交易日收盘价，使用当前价格范围计算")
+                log.warning("无法获取前一交易日收盘价，使用当前价格范围计算")
                 prev_close = np.mean(prices)
             
             # 计算价格范围
@@ -7225,9 +7240,9 @@ class IntradayWindow:
             min_bin = int((price_min - prev_close) / bin_size_price) - 1
             max_bin = int((price_max - prev_close) / bin_size_price) + 1
             
-            print(f"[DEBUG] 价格范围: {price_min:.2f} - {price_max:.2f}")
-            print(f"[DEBUG] 基准价格: {prev_close:.2f}, bin大小: {bin_size_price:.4f}")
-            print(f"[DEBUG] bin范围: {min_bin} - {max_bin}, 共{max_bin - min_bin + 1}个bin")
+            log.debug("价格范围: %.2f - %.2f", price_min, price_max)
+            log.debug("基准价格: %.2f, bin大小: %.4f", prev_close, bin_size_price)
+            log.debug("bin范围: %s - %s, 共%s个bin", min_bin, max_bin, max_bin - min_bin + 1)
             
             # 为每个bin计算成交量
             for bin_idx in range(min_bin, max_bin + 1):
@@ -7267,11 +7282,9 @@ class IntradayWindow:
                         'bin_range': (bin_lower, bin_upper)
                     }
             
-            print(f"[DEBUG] 生成了{len(volume_by_price)}个成交量bin")
+            log.debug("生成了%s个成交量bin", len(volume_by_price))
             return volume_by_price
             
         except Exception as e:
-            print(f"[ERROR] 计算各价格总成交量失败: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("计算各价格总成交量失败: %s", e)
             return {}
\ No newline at end of file
@@ -731,17 +731,17 @@ class ETFKLineWindow(BaseWindow):
                             security_type=security_type
                         )
                         
-                        if "error" not in dual_prices and dual_prices.get("resistance_band"):
-                            resistance_band = dual_prices["resistance_band"]
-                            self.resistance_band_upper = resistance_band["upper"]  # 上影线最高价
-                            self.resistance_band_lower = resistance_band["lower"]  # 实体最高价
+                        if dual_prices.error is None and dual_prices.resistance_band:
+                            resistance_band = dual_prices.resistance_band
+                            self.resistance_band_upper = resistance_band.upper  # 上影线最高价
+                            self.resistance_band_lower = resistance_band.lower  # 实体最高价
                             
                             print(f"[DEBUG] K线窗口 - 前高阻力带计算完成:")
                             print(f"[DEBUG]   上影线最高价: {self.resistance_band_upper:.3f}")
                             print(f"[DEBUG]   实体最高价: {self.resistance_band_lower:.3f}")
-                            print(f"[DEBUG]   阻力带日期: {resistance_band['date']}")
+                            print(f"[DEBUG]   阻力带日期: {resistance_band.date}")
                         else:
-                            print(f"[DEBUG] K线窗口 - 前高阻力带计算失败: {dual_prices.get('error', '未知错误')}")
+                            print(f"[DEBUG] K线窗口 - 前高阻力带计算失败: {dual_prices.error or '未知错误'}")
                             self.resistance_band_upper = None
                             self.resistance_band_lower = None
                     else:
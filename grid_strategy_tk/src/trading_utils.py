@@ -1,13 +1,16 @@
+import logging
 import time
 import tkinter as tk
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import akshare as ak
 import numpy as np
 import pandas as pd
 from pypinyin import lazy_pinyin
 
+log = logging.getLogger(__name__)
+
 
 def calculate_ma_price(symbol: str, start_date: datetime, ma_period: int, security_type: str = "ETF") -> tuple:
     """
@@ -920,37 +923,64 @@ def calculate_previous_high_price(symbol: str, current_date: str, months_back: i
         return None
 
 
-def get_previous_high_dual_prices(symbol: str, current_date: str, months_back: int = 12, security_type: str = "STOCK") -> Dict:
+class PriceBand(NamedTuple):
+    """价格带（前高阻力带/前低支撑带）"""
+    upper: float
+    lower: float
+    date: str
+
+
+class PreviousHighDualPrices(NamedTuple):
+    """前高双价格：上影线最高价与实体最高价，计算失败时 error 非空"""
+    current_price: Optional[float] = None
+    shadow_high_price: Optional[float] = None
+    entity_high_price: Optional[float] = None
+    resistance_band: Optional[PriceBand] = None
+    error: Optional[str] = None
+    message: Optional[str] = None
+
+
+class PreviousLowDualPrices(NamedTuple):
+    """前低双价格：下影线最低价与实体最低价，计算失败时 error 非空"""
+    current_price: Optional[float] = None
+    shadow_low_price: Optional[float] = None
+    entity_low_price: Optional[float] = None
+    support_band: Optional[PriceBand] = None
+    error: Optional[str] = None
+    message: Optional[str] = None
+
+
+def get_previous_high_dual_prices(symbol: str, current_date: str, months_back: int = 12, security_type: str = "STOCK") -> PreviousHighDualPrices:
     """获取前高价格的双价格信息（实体最高价和上影线最高价）
     
     :param symbol: 股票代码
     :param current_date: 当前日期 (格式: YYYY-MM-DD)
     :param months_back: 回溯月数，默认12个月（1年）
     :param security_type: 证券类型 ("STOCK", "ETF", "BOARD")
-    :return: 包含双价格信息的字典
+    :return: PreviousHighDualPrices，失败时 error 字段为错误信息
     """
     try:
         # 获取历史数据
         df = get_historical_data(symbol, current_date, months_back, security_type)
         if df is None or df.empty:
-            return {"error": "无法获取历史数据"}
+            return PreviousHighDualPrices(error="无法获取历史数据")
         
         # 获取当前价格
         current_price = get_current_price(symbol, current_date, security_type)
         if current_price is None:
-            return {"error": "无法获取当前价格"}
+            return PreviousHighDualPrices(error="无法获取当前价格")
         
         # 筛选比当前价格高的数据
         higher_prices = df[df['最高'] > current_price]
         
         if higher_prices.empty:
-            return {
-                "error": f"在 {months_back} 个月内未找到比当前价格更高的价格点",
-                "current_price": current_price,
-                "shadow_high_price": None,
-                "entity_high_price": None,
-                "resistance_band": None
-            }
+            return PreviousHighDualPrices(
+                error=f"在 {months_back} 个月内未找到比当前价格更高的价格点",
+                current_price=current_price,
+                shadow_high_price=None,
+                entity_high_price=None,
+                resistance_band=None
+            )
         
         # 使用scipy找到局部高点
         try:
@@ -994,47 +1024,47 @@ def get_previous_high_dual_prices(symbol: str, current_date: str, months_back: i
                             # 使用上一个更高的前高
                             latest_date, latest_shadow_price, latest_entity_price = higher_peaks[-2]
                         else:
-                            return {
-                                "error": "最近的高点是当前交易日，但没有更早的前高",
-                                "current_price": current_price,
-                                "shadow_high_price": None,
-                                "entity_high_price": None,
-                                "resistance_band": None
-                            }
+                            return PreviousHighDualPrices(
+                                error="最近的高点是当前交易日，但没有更早的前高",
+                                current_price=current_price,
+                                shadow_high_price=None,
+                                entity_high_price=None,
+                                resistance_band=None
+                            )
                     
                     # 计算阻力带
-                    resistance_band = {
-                        "upper": float(latest_shadow_price),  # 上影线最高价
-                        "lower": float(latest_entity_price),  # 实体最高价
-                        "date": latest_date.strftime('%Y-%m-%d')
-                    }
+                    resistance_band = PriceBand(
+                        upper=float(latest_shadow_price),  # 上影线最高价
+                        lower=float(latest_entity_price),  # 实体最高价
+                        date=latest_date.strftime('%Y-%m-%d')
+                    )
                     
-                    return {
-                        "current_price": current_price,
-                        "shadow_high_price": float(latest_shadow_price),
-                        "entity_high_price": float(latest_entity_price),
-                        "resistance_band": resistance_band,
-                        "message": f"找到前高双价格: 上影线={latest_shadow_price:.3f}, 实体={latest_entity_price:.3f}"
-                    }
+                    return PreviousHighDualPrices(
+                        current_price=current_price,
+                        shadow_high_price=float(latest_shadow_price),
+                        entity_high_price=float(latest_entity_price),
+                        resistance_band=resistance_band,
+                        message=f"找到前高双价格: 上影线={latest_shadow_price:.3f}, 实体={latest_entity_price:.3f}"
+                    )
             
             # 如果没有找到明显的峰值，使用最高价
             max_shadow_price = df['最高'].max()
             max_entity_price = max(df['开盘'].max(), df['收盘'].max())
             max_date = df[df['最高'] == max_shadow_price].index[0]
             
-            resistance_band = {
-                "upper": float(max_shadow_price),
-                "lower": float(max_entity_price),
-                "date": max_date.strftime('%Y-%m-%d')
-            }
+            resistance_band = PriceBand(
+                upper=float(max_shadow_price),
+                lower=float(max_entity_price),
+                date=max_date.strftime('%Y-%m-%d')
+            )
             
-            return {
-                "current_price": current_price,
-                "shadow_high_price": float(max_shadow_price),
-                "entity_high_price": float(max_entity_price),
-                "resistance_band": resistance_band,
-                "message": f"使用最高价作为前高双价格: 上影线={max_shadow_price:.3f}, 实体={max_entity_price:.3f}"
-            }
+            return PreviousHighDualPrices(
+                current_price=current_price,
+                shadow_high_price=float(max_shadow_price),
+                entity_high_price=float(max_entity_price),
+                resistance_band=resistance_band,
+                message=f"使用最高价作为前高双价格: 上影线={max_shadow_price:.3f}, 实体={max_entity_price:.3f}"
+            )
             
         except ImportError:
             # 简化算法
@@ -1043,22 +1073,22 @@ def get_previous_high_dual_prices(symbol: str, current_date: str, months_back: i
             highest_entity_price = max(higher_prices_sorted['开盘'].iloc[0], higher_prices_sorted['收盘'].iloc[0])
             highest_date = higher_prices_sorted.index[0]
             
-            resistance_band = {
-                "upper": float(highest_shadow_price),
-                "lower": float(highest_entity_price),
-                "date": highest_date.strftime('%Y-%m-%d')
-            }
+            resistance_band = PriceBand(
+                upper=float(highest_shadow_price),
+                lower=float(highest_entity_price),
+                date=highest_date.strftime('%Y-%m-%d')
+            )
             
-            return {
-                "current_price": current_price,
-                "shadow_high_price": float(highest_shadow_price),
-                "entity_high_price": float(highest_entity_price),
-                "resistance_band": resistance_band,
-                "message": f"简化算法找到的前高双价格: 上影线={highest_shadow_price:.3f}, 实体={highest_entity_price:.3f}"
-            }
+            return PreviousHighDualPrices(
+                current_price=current_price,
+                shadow_high_price=float(highest_shadow_price),
+                entity_high_price=float(highest_entity_price),
+                resistance_band=resistance_band,
+                message=f"简化算法找到的前高双价格: 上影线={highest_shadow_price:.3f}, 实体={highest_entity_price:.3f}"
+            )
         
     except Exception as e:
-        return {"error": f"计算前高双价格时发生错误: {e}"}
+        return PreviousHighDualPrices(error=f"计算前高双价格时发生错误: {e}")
 
 def get_previous_high_analysis(symbol: str, current_date: str, months_back: int = 12, security_type: str = "STOCK") -> Dict:
     """
@@ -1220,37 +1250,37 @@ def get_previous_high_analysis(symbol: str, current_date: str, months_back: int
         return {"error": f"分析过程中发生错误: {str(e)}"}
 
 
-def get_previous_low_dual_prices(symbol: str, current_date: str, months_back: int = 12, security_type: str = "STOCK") -> Dict:
+def get_previous_low_dual_prices(symbol: str, current_date: str, months_back: int = 12, security_type: str = "STOCK") -> PreviousLowDualPrices:
     """获取前低价格的双价格信息（实体最低价和下影线最低价）
     
     :param symbol: 股票代码
     :param current_date: 当前日期 (格式: YYYY-MM-DD)
     :param months_back: 回溯月数，默认12个月（1年）
     :param security_type: 证券类型 ("STOCK", "ETF", "BOARD")
-    :return: 包含双价格信息的字典
+    :return: PreviousLowDualPrices，失败时 error 字段为错误信息
     """
     try:
         # 获取历史数据
         df = get_historical_data(symbol, current_date, months_back, security_type)
         if df is None or df.empty:
-            return {"error": "无法获取历史数据"}
+            return PreviousLowDualPrices(error="无法获取历史数据")
         
         # 获取当前价格
         current_price = get_current_price(symbol, current_date, security_type)
         if current_price is None:
-            return {"error": "无法获取当前价格"}
+            return PreviousLowDualPrices(error="无法获取当前价格")
         
         # 筛选比当前价格低的数据
         lower_prices = df[df['最低'] < current_price]
         
         if lower_prices.empty:
-            return {
-                "error": f"在 {months_back} 个月内未找到比当前价格更低的价格点",
-                "current_price": current_price,
-                "shadow_low_price": None,
-                "entity_low_price": None,
-                "support_band": None
-            }
+            return PreviousLowDualPrices(
+                error=f"在 {months_back} 个月内未找到比当前价格更低的价格点",
+                current_price=current_price,
+                shadow_low_price=None,
+                entity_low_price=None,
+                support_band=None
+            )
         
         # 使用scipy找到局部低点
         try:
@@ -1294,47 +1324,47 @@ def get_previous_low_dual_prices(symbol: str, current_date: str, months_back: in
                             # 使用上一个更低的前低
                             latest_date, latest_shadow_price, latest_entity_price = lower_peaks[-2]
                         else:
-                            return {
-                                "error": "最近的低点是当前交易日，但没有更早的前低",
-                                "current_price": current_price,
-                                "shadow_low_price": None,
-                                "entity_low_price": None,
-                                "support_band": None
-                            }
+                            return PreviousLowDualPrices(
+                                error="最近的低点是当前交易日，但没有更早的前低",
+                                current_price=current_price,
+                                shadow_low_price=None,
+                                entity_low_price=None,
+                                support_band=None
+                            )
                     
                     # 计算支撑带
-                    support_band = {
-                        "upper": float(latest_entity_price),  # 实体最低价
-                        "lower": float(latest_shadow_price),  # 下影线最低价
-                        "date": latest_date.strftime('%Y-%m-%d')
-                    }
+                    support_band = PriceBand(
+                        upper=float(latest_entity_price),  # 实体最低价
+                        lower=float(latest_shadow_price),  # 下影线最低价
+                        date=latest_date.strftime('%Y-%m-%d')
+                    )
                     
-                    return {
-                        "current_price": current_price,
-                        "shadow_low_price": float(latest_shadow_price),
-                        "entity_low_price": float(latest_entity_price),
-                        "support_band": support_band,
-                        "message": f"找到前低双价格: 下影线={latest_shadow_price:.3f}, 实体={latest_entity_price:.3f}"
-                    }
+                    return PreviousLowDualPrices(
+                        current_price=current_price,
+                        shadow_low_price=float(latest_shadow_price),
+                        entity_low_price=float(latest_entity_price),
+                        support_band=support_band,
+                        message=f"找到前低双价格: 下影线={latest_shadow_price:.3f}, 实体={latest_entity_price:.3f}"
+                    )
             
             # 如果没有找到明显的峰值，使用最低价
             min_shadow_price = df['最低'].min()
             min_entity_price = min(df['开盘'].min(), df['收盘'].min())
             min_date = df[df['最低'] == min_shadow_price].index[0]
             
-            support_band = {
-                "upper": float(min_entity_price),
-                "lower": float(min_shadow_price),
-                "date": min_date.strftime('%Y-%m-%d')
-            }
+            support_band = PriceBand(
+                upper=float(min_entity_price),
+                lower=float(min_shadow_price),
+                date=min_date.strftime('%Y-%m-%d')
+            )
             
-            return {
-                "current_price": current_price,
-                "shadow_low_price": float(min_shadow_price),
-                "entity_low_price": float(min_entity_price),
-                "support_band": support_band,
-                "message": f"使用最低价作为前低双价格: 下影线={min_shadow_price:.3f}, 实体={min_entity_price:.3f}"
-            }
+            return PreviousLowDualPrices(
+                current_price=current_price,
+                shadow_low_price=float(min_shadow_price),
+                entity_low_price=float(min_entity_price),
+                support_band=support_band,
+                message=f"使用最低价作为前低双价格: 下影线={min_shadow_price:.3f}, 实体={min_entity_price:.3f}"
+            )
             
         except ImportError:
             # 如果没有scipy，使用简化算法
@@ -1345,20 +1375,19 @@ def get_previous_low_dual_prices(symbol: str, current_date: str, months_back: in
             min_entity_price = min(df['开盘'].min(), df['收盘'].min())
             min_date = df[df['最低'] == min_shadow_price].index[0]
             
-            support_band = {
-                "upper": float(min_entity_price),
-                "lower": float(min_shadow_price),
-                "date": min_date.strftime('%Y-%m-%d')
-            }
-            
-            result = {
-                "current_price": current_price,
-                "shadow_low_price": float(min_shadow_price),
-                "entity_low_price": float(min_entity_price),
-                "support_band": support_band
-            }
+            support_band = PriceBand(
+                upper=float(min_entity_price),
+                lower=float(min_shadow_price),
+                date=min_date.strftime('%Y-%m-%d')
+            )
             
-            result["message"] = f"简化算法找到的实体最低价: {min_entity_price:.3f} (日期: {min_date.strftime('%Y-%m-%d')}, 下影线: {min_shadow_price:.3f})"
+            result = PreviousLowDualPrices(
+                current_price=current_price,
+                shadow_low_price=float(min_shadow_price),
+                entity_low_price=float(min_entity_price),
+                support_band=support_band,
+                message=f"简化算法找到的实体最低价: {min_entity_price:.3f} (日期: {min_date.strftime('%Y-%m-%d')}, 下影线: {min_shadow_price:.3f})"
+            )
         
         return result
         
@@ -1366,7 +1395,7 @@ def get_previous_low_dual_prices(symbol: str, current_date: str, months_back: in
         print(f"[DEBUG] 获取前低双价格失败: {e}")
         import traceback
         traceback.print_exc()
-        return {"error": f"计算前低双价格时发生错误: {e}"}
+        return PreviousLowDualPrices(error=f"计算前低双价格时发生错误: {e}")
 
 
 def detect_uptrend_patterns(data: pd.DataFrame, cache_key: str = None, cache_data: dict = None, period_mode: str = 'day') -> List[Dict[str, Any]]:
@@ -1779,12 +1808,12 @@ def detect_bollinger_breakthrough_breakdown(price_data: pd.DataFrame,
     """
     try:
         if price_data is None or price_data.empty:
-            print("[DEBUG] 价格数据为空，无法计算突破跌破次数")
+            log.debug("价格数据为空，无法计算突破跌破次数")
             return {'breakthrough_count': 0, 'breakdown_count': 0, 'breakthrough_signals': [], 'breakdown_signals': []}
             
         if (bollinger_upper is None or bollinger_lower is None or 
             bollinger_upper.empty or bollinger_lower.empty):
-            print("[DEBUG] 布林带数据为空，无法计算突破跌破次数")
+            log.debug("布林带数据为空，无法计算突破跌破次数")
             return {'breakthrough_count': 0, 'breakdown_count': 0, 'breakthrough_signals': [], 'breakdown_signals': []}
             
         # 将1分钟数据重采样为指定频率K线数据
@@ -1797,99 +1826,75 @@ def detect_bollinger_breakthrough_breakdown(price_data: pd.DataFrame,
         }).dropna()
         
         if price_resampled.empty:
-            print(f"[DEBUG] {resample_freq}K线数据为空，无法计算突破跌破次数")
+            log.debug("%sK线数据为空，无法计算突破跌破次数", resample_freq)
             return {'breakthrough_count': 0, 'breakdown_count': 0, 'breakthrough_signals': [], 'breakdown_signals': []}
             
         # 调整时间戳以匹配布林带数据的时间轴
-        adjusted_timestamps = []
-        for ts in price_resampled.index:
-            adjusted_ts = ts + pd.Timedelta(minutes=4)
-            adjusted_timestamps.append(adjusted_ts)
-        price_resampled.index = adjusted_timestamps
-        
-        # 初始化计数器和信号列表
-        breakthrough_count = 0
-        breakdown_count = 0
+        price_resampled.index = price_resampled.index + pd.Timedelta(minutes=4)
+        
+        # 每根K线对应的布林带位置：与(时间戳+4分钟)最接近的布林带时间点（并列时取靠前者）
+        target_ns = (price_resampled.index + pd.Timedelta(minutes=4)).values.astype('datetime64[ns]').view('i8')
+        band_ns = bollinger_upper.index.values.astype('datetime64[ns]').view('i8')
+        closest_idx = np.abs(band_ns[np.newaxis, :] - target_ns[:, np.newaxis]).argmin(axis=1)
+        in_range = closest_idx < len(bollinger_lower)
+        closest_idx = np.where(in_range, closest_idx, 0)
+        
+        upper = bollinger_upper.to_numpy(dtype=np.float64)[closest_idx]
+        lower = bollinger_lower.to_numpy(dtype=np.float64)[closest_idx]
+        open_arr = price_resampled['open'].to_numpy(dtype=np.float64)
+        close_arr = price_resampled['close'].to_numpy(dtype=np.float64)
+        high_arr = price_resampled['high'].to_numpy(dtype=np.float64)
+        low_arr = price_resampled['low'].to_numpy(dtype=np.float64)
+        
+        # 数据有效性：布林带与OHLC均非NaN，开盘价与收盘价非0
+        valid = (in_range & ~np.isnan(upper) & ~np.isnan(lower)
+                 & ~np.isnan(open_arr) & ~np.isnan(close_arr) & ~np.isnan(high_arr) & ~np.isnan(low_arr)
+                 & (open_arr != 0) & (close_arr != 0))
+        
+        # K线实体的最高价和最低价
+        entity_high_arr = np.maximum(open_arr, close_arr)
+        entity_low_arr = np.minimum(open_arr, close_arr)
+        
+        # 突破：实体最高价在布林上轨之上，或跳空高开（开盘价直接超过上轨）
+        breakthrough_mask = valid & ((entity_high_arr > upper) | (open_arr > upper))
+        # 跌破：实体最低价在布林下轨之下，或跳空低开（开盘价直接低于下轨）
+        breakdown_mask = valid & ((entity_low_arr < lower) | (open_arr < lower))
+        
+        breakthrough_count = int(breakthrough_mask.sum())
+        breakdown_count = int(breakdown_mask.sum())
         breakthrough_signals = []
         breakdown_signals = []
         
-        # 遍历每个K线，检查突破和跌破
-        for i, (ts, row) in enumerate(price_resampled.iterrows()):
-            try:
-                # 获取对应的布林带数据
-                # 由于布林带数据已经插值到1分钟级别，我们需要找到对应的1分钟时间点
-                adjusted_ts = ts + pd.Timedelta(minutes=4)  # 调整时间戳
-                
-                # 找到最接近的1分钟时间点
-                time_diff = np.abs((bollinger_upper.index - adjusted_ts).total_seconds())
-                closest_idx = np.argmin(time_diff)
-                
-                if closest_idx < len(bollinger_upper) and closest_idx < len(bollinger_lower):
-                    upper_band = bollinger_upper.iloc[closest_idx]
-                    lower_band = bollinger_lower.iloc[closest_idx]
-                    
-                    # 检查数据有效性
-                    if pd.isna(upper_band) or pd.isna(lower_band):
-                        continue
-                        
-                    open_price = row['open']
-                    close_price = row['close']
-                    high_price = row['high']
-                    low_price = row['low']
-                    
-                    # 数据验证
-                    if (pd.isna(open_price) or pd.isna(close_price) or 
-                        pd.isna(high_price) or pd.isna(low_price) or
-                        open_price == 0 or close_price == 0):
-                        continue
-                        
-                    # 计算K线实体的最高价和最低价
-                    entity_high = max(open_price, close_price)  # 实体最高价
-                    entity_low = min(open_price, close_price)   # 实体最低价
-                    
-                    # 检查突破：实体最高价在布林上轨之上，或跳空高开（开盘价直接超过上轨）
-                    is_breakthrough = (entity_high > upper_band) or (open_price > upper_band)
-                    if is_breakthrough:
-                        breakthrough_count += 1
-                        if entity_high > upper_band:
-                            print(f"[DEBUG] 突破检测: 时间={ts}, 实体最高价={entity_high:.3f}, 上轨={upper_band:.3f}")
-                        else:
-                            print(f"[DEBUG] 跳空高开突破检测: 时间={ts}, 开盘价={open_price:.3f}, 上轨={upper_band:.3f}")
-                        
-                        # 添加突破信号到列表
-                        breakthrough_signal = {
-                            'timestamp': ts,
-                            'price': entity_high if entity_high > upper_band else open_price,
-                            'upper_band': upper_band,
-                            'type': 'breakthrough',
-                            'is_gap_up': open_price > upper_band and entity_high <= upper_band
-                        }
-                        breakthrough_signals.append(breakthrough_signal)
-                        
-                    # 检查跌破：实体最低价在布林下轨之下，或跳空低开（开盘价直接低于下轨）
-                    is_breakdown = (entity_low < lower_band) or (open_price < lower_band)
-                    if is_breakdown:
-                        breakdown_count += 1
-                        if entity_low < lower_band:
-                            print(f"[DEBUG] 跌破检测: 时间={ts}, 实体最低价={entity_low:.3f}, 下轨={lower_band:.3f}")
-                        else:
-                            print(f"[DEBUG] 跳空低开跌破检测: 时间={ts}, 开盘价={open_price:.3f}, 下轨={lower_band:.3f}")
-                        
-                        # 添加跌破信号到列表
-                        breakdown_signal = {
-                            'timestamp': ts,
-                            'price': entity_low if entity_low < lower_band else open_price,
-                            'lower_band': lower_band,
-                            'type': 'breakdown',
-                            'is_gap_down': open_price < lower_band and entity_low >= lower_band
-                        }
-                        breakdown_signals.append(breakdown_signal)
-                        
-            except Exception as e:
-                print(f"[WARNING] 处理K线数据时出错: {e}")
-                continue
-                
-        print(f"[DEBUG] 突破跌破次数计算完成: 突破={breakthrough_count}次, 跌破={breakdown_count}次")
+        # 只对命中的K线构造信号
+        for i in np.flatnonzero(breakthrough_mask):
+            ts = price_resampled.index[i]
+            open_price, entity_high, upper_band = open_arr[i], entity_high_arr[i], upper[i]
+            if entity_high > upper_band:
+                log.debug("突破检测: 时间=%s, 实体最高价=%.3f, 上轨=%.3f", ts, entity_high, upper_band)
+            else:
+                log.debug("跳空高开突破检测: 时间=%s, 开盘价=%.3f, 上轨=%.3f", ts, open_price, upper_band)
+            breakthrough_signals.append({
+                'timestamp': ts,
+                'price': entity_high if entity_high > upper_band else open_price,
+                'upper_band': upper_band,
+                'type': 'breakthrough',
+                'is_gap_up': open_price > upper_band and entity_high <= upper_band
+            })
+        
+        for i in np.flatnonzero(breakdown_mask):
+            ts = price_resampled.index[i]
+            open_price, entity_low, lower_band = open_arr[i], entity_low_arr[i], lower[i]
+            if entity_low < lower_band:
+                log.debug("跌破检测: 时间=%s, 实体最低价=%.3f, 下轨=%.3f", ts, entity_low, lower_band)
+            else:
+                log.debug("跳空低开跌破检测: 时间=%s, 开盘价=%.3f, 下轨=%.3f", ts, open_price, lower_band)
+            breakdown_signals.append({
+                'timestamp': ts,
+                'price': entity_low if entity_low < lower_band else open_price,
+                'lower_band': lower_band,
+                'type': 'breakdown',
+                'is_gap_down': open_price < lower_band and entity_low >= lower_band
+            })
         
         return {
             'breakthrough_count': breakthrough_count,
@@ -1899,7 +1904,7 @@ def detect_bollinger_breakthrough_breakdown(price_data: pd.DataFrame,
         }
         
     except Exception as e:
-        print(f"[ERROR] 计算突破跌破次数失败: {e}")
+        log.exception("计算突破跌破次数失败: %s", e)
         return {'breakthrough_count': 0, 'breakdown_count': 0, 'breakthrough_signals': [], 'breakdown_signals': []}
 
 
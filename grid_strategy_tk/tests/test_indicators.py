@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from indicators import rolling_mean_std
+
+
+class TestRollingMeanStd(unittest.TestCase):
+    """滚动均值/标准差测试类"""
+
+    def setUp(self):
+        """生成带缺失值的模拟价格序列"""
+        rng = np.random.default_rng(0)
+        self.prices = 100 + np.cumsum(rng.normal(0, 0.5, 500))
+        self.prices[[3, 50, 51]] = np.nan
+
+    def test_matches_pandas_rolling(self):
+        """测试与pandas rolling结果一致"""
+        series = pd.Series(self.prices)
+        for window, min_periods in [(20, 1), (25, 1), (1250, 1), (20, 20)]:
+            mean, std = rolling_mean_std(self.prices, window, min_periods)
+            rolling = series.rolling(window=window, min_periods=min_periods)
+            np.testing.assert_allclose(mean, rolling.mean().to_numpy(), rtol=1e-9, equal_nan=True)
+            np.testing.assert_allclose(std, rolling.std().to_numpy(), rtol=1e-6, atol=1e-8, equal_nan=True)
+
+    def test_without_std(self):
+        """测试仅计算均值"""
+        mean, std = rolling_mean_std([1.0, 2.0, 3.0], 2, with_std=False)
+        self.assertIsNone(std)
+        np.testing.assert_allclose(mean, [1.0, 1.5, 2.5])
+
+    def test_empty_input(self):
+        """测试空输入"""
+        mean, std = rolling_mean_std([], 5)
+        self.assertEqual(len(mean), 0)
+        self.assertEqual(len(std), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
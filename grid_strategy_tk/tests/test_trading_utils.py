@@ -5,6 +5,7 @@ from unittest.mock import Mock, patch
 import pandas as pd
 from akshare_wrapper import akshare
 from trading_utils import (calculate_ma_price, calculate_price_range,
+                           detect_bollinger_breakthrough_breakdown,
                            get_symbol_info, is_valid_symbol)
 
 
@@ -206,5 +207,35 @@ class TestMAUtils(unittest.TestCase):
         mock_etf_data.side_effect = Exception("API错误")
         self.assertFalse(is_valid_symbol("159300"))
 
+
+class TestBollingerBreakthroughBreakdown(unittest.TestCase):
+    """布林带突破/跌破检测测试类"""
+
+    def test_detect_breakthrough_and_breakdown(self):
+        """实体突破上轨、实体跌破下轨及布林带缺失的K线"""
+        index = pd.date_range("2024-01-02 09:31", periods=15, freq="1min")
+        opens = [10.0] * 5 + [9.0] * 5 + [10.0] * 5
+        closes = [10.6] * 5 + [9.5] * 5 + [10.6] * 5
+        price_data = pd.DataFrame({
+            'open': opens, 'close': closes,
+            'high': [max(o, c) for o, c in zip(opens, closes)],
+            'low': [min(o, c) for o, c in zip(opens, closes)],
+            'volume': [100] * 15,
+        }, index=index)
+        band_index = pd.date_range("2024-01-02 09:30", periods=30, freq="1min")
+        upper = pd.Series(10.5, index=band_index)
+        lower = pd.Series(9.2, index=band_index)
+        # 第三根5分钟K线对应的布林带缺失，应被跳过
+        upper.loc["2024-01-02 09:49":] = float('nan')
+
+        result = detect_bollinger_breakthrough_breakdown(price_data, upper, lower, resample_freq='5min')
+
+        self.assertEqual(result['breakthrough_count'], 1)
+        self.assertEqual(result['breakdown_count'], 1)
+        self.assertEqual(result['breakthrough_signals'][0]['price'], 10.6)
+        self.assertFalse(result['breakthrough_signals'][0]['is_gap_up'])
+        self.assertEqual(result['breakdown_signals'][0]['price'], 9.0)
+        self.assertFalse(result['breakdown_signals'][0]['is_gap_down'])
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file